@@ -3,29 +3,103 @@ Flask API for Career Decision Tree
 Serves program data from SQLite database
 """
 
-from flask import Flask, jsonify, request
+from flask import Flask, g, jsonify, request
 from flask_cors import CORS
 import json
-
-from config import get_db, setup_logging, get_logger
+import os
+import threading
+from functools import lru_cache
+
+from datetime import datetime, timedelta
+
+from career_networth_calculator import (
+    calculate_all_career_paths,
+    calculate_career_baseline,
+    calculate_career_node_report,
+    clear_cache as clear_career_networth_cache,
+    get_career_node as _get_career_node,
+)
+from config import (
+    dataset_version,
+    fetch_dicts,
+    fetch_one,
+    fetch_rows,
+    get_db,
+    get_logger,
+    setup_logging,
+)
+from location_ecosystem import get_ecosystem, get_ecosystem_by_country, list_ecosystems
+from market_mapping import get_market_info
+from networth_calculator import (
+    AID_SCENARIOS,
+    calculate_all_programs,
+    calculate_baseline_networth,
+    calculate_program_networth,
+    calculate_program_networth_batch,
+    clear_cache as clear_networth_cache,
+    ranked_initial_capitals,
+    ranked_programs,
+)
+from postmasters_calculator import (
+    calculate_expected_networth,
+    calculate_postmasters_path_networth,
+    clear_cache as clear_postmasters_cache,
+    compare_program_ecosystems,
+)
+from profile_calibrator import (
+    calibrate_postmasters_edges,
+    clear_cache as clear_calibration_cache,
+    get_cached_calibrated_edges,
+    get_calibration_summary as _get_summary,
+    get_profile as _get_profile,
+    save_profile,
+)
+from query_builder import QueryBuilder
+from responses import (
+    clear_response_cache,
+    compress_response,
+    dumps,
+    dumps_spliced,
+    etag_cached,
+    json_response,
+    msgpack_response,
+    OrjsonProvider,
+    raw_json_response,
+    response_cached,
+    stream_json_object,
+    stream_ndjson,
+    wants_msgpack,
+    wants_ndjson,
+)
 from validators import (
     validate_params,
     validate_optional_int,
-    validate_optional_float,
+    optional_param,
     LIFESTYLE,
     AID_SCENARIO,
+    AID_SCENARIO_EXPECTED,
+    EMPLOYER_TIER,
     FAMILY_YEAR_MASTERS,
     FAMILY_YEAR_CAREER,
     NODE_TYPE,
     NETWORTH_SORT,
     CAREER_SORT,
+    SEARCH_LIMIT,
+    RESULT_LIMIT,
+    COMPACT,
+    LEAF_ONLY,
+    SUMMARY_ONLY,
+    HAS_ENTREPRENEUR_VISA,
+    MIN_STARTUP_STRENGTH,
 )
 
 setup_logging()
 logger = get_logger(__name__)
 
 app = Flask(__name__)
+app.json = OrjsonProvider(app)  # jsonify() encodes with orjson when installed
 CORS(app)  # Enable CORS for React frontend
+app.after_request(compress_response)  # gzip JSON >= COMPRESS_MIN_SIZE bytes
 
 
 # ─── Global Error Handlers ───────────────────────────────────────────────────
@@ -57,7 +131,51 @@ def health():
     return jsonify({"status": "ok", "message": "Career Tree API is running"})
 
 
+def _clear_caches():
+    """Drop this worker's memoized calculator results and cached responses."""
+    clear_networth_cache()
+    clear_career_networth_cache()
+    clear_calibration_cache()
+    clear_postmasters_cache()
+    clear_response_cache()
+    _has_table.cache_clear()
+    logger.info("Calculator caches cleared")
+
+
+_seen_dataset_version = None
+_seen_dataset_version_lock = threading.Lock()
+
+
+@app.before_request
+def sync_dataset_version():
+    """
+    Drop memoized results when an import has bumped the dataset version.
+
+    Each gunicorn worker checks on its own requests, so the caches are in
+    effect keyed on the version without a restart or a broadcast.
+    """
+    global _seen_dataset_version
+    version = dataset_version()
+    if version == _seen_dataset_version:
+        return
+    with _seen_dataset_version_lock:
+        if version != _seen_dataset_version:
+            if _seen_dataset_version is not None:
+                _clear_caches()
+            _seen_dataset_version = version
+
+
+# Validated in one pass per request; see validators.validate_params
+PROGRAMS_PARAMS = [
+    optional_param("max_tuition", int),
+    optional_param("min_y10_salary", int),
+    optional_param("ielts_max", float),
+    optional_param("toefl_max", int),
+]
+
+
 @app.route("/api/programs", methods=["GET"])
+@response_cached
 def get_programs():
     """
     Get all programs with optional filters
@@ -71,19 +189,11 @@ def get_programs():
       - ielts_max: Max IELTS score required (e.g., 7.0)
       - toefl_max: Max TOEFL score required (e.g., 100)
     """
-    from query_builder import QueryBuilder
+
+    args = request.args
 
     # Validate params before opening connection
-    max_tuition, error = validate_optional_int(request.args, "max_tuition")
-    if error:
-        return error
-    min_salary, error = validate_optional_int(request.args, "min_y10_salary")
-    if error:
-        return error
-    ielts_max, error = validate_optional_float(request.args, "ielts_max")
-    if error:
-        return error
-    toefl_max, error = validate_optional_int(request.args, "toefl_max")
+    filters, error = validate_params(args, PROGRAMS_PARAMS)
     if error:
         return error
 
@@ -99,16 +209,16 @@ def get_programs():
         FROM programs p
         JOIN universities u ON p.university_id = u.id
     """)
-    qb.add_filter("p.field = ?", request.args.get("field"))
-    qb.add_filter("p.funding_tier = ?", request.args.get("funding_tier"))
-    qb.add_filter("u.country = ?", request.args.get("country"))
-    qb.add_filter("p.tuition_usd <= ?", max_tuition)
-    qb.add_filter("p.y10_salary_usd >= ?", min_salary)
-    qb.add_filter("p.ielts_min_score <= ?", ielts_max)
-    qb.add_filter("p.toefl_min_score <= ?", toefl_max)
+    qb.add_filter("p.field = ?", args.get("field"))
+    qb.add_filter("p.funding_tier = ?", args.get("funding_tier"))
+    qb.add_filter("u.country = ?", args.get("country"))
+    qb.add_filter("p.tuition_usd <= ?", filters["max_tuition"])
+    qb.add_filter("p.y10_salary_usd >= ?", filters["min_y10_salary"])
+    qb.add_filter("p.ielts_min_score <= ?", filters["ielts_max"])
+    qb.add_filter("p.toefl_min_score <= ?", filters["toefl_max"])
 
     # Handle comma-separated gre_required filter
-    gre_filter = request.args.get("gre_required")
+    gre_filter = args.get("gre_required")
     if gre_filter:
         gre_values = [v.strip() for v in gre_filter.split(",") if v.strip()]
         if gre_values:
@@ -117,46 +227,39 @@ def get_programs():
     query, params = qb.build()
 
     with get_db() as conn:
-        cursor = conn.cursor()
-        cursor.execute(query, params)
-        rows = cursor.fetchall()
-        programs = [dict(row) for row in rows]
+        programs = fetch_dicts(conn.execute(query, params))
+
+    return json_response({"count": len(programs), "programs": programs})
+
 
-    return jsonify({"count": len(programs), "programs": programs})
+# Single-program lookups (fetch_one); shared by /api/programs/<id> and /full
+PROGRAM_DETAIL_QUERY = """
+    SELECT
+        p.*, u.name as university_name, u.country, u.region, u.tier as university_tier
+    FROM programs p
+    JOIN universities u ON p.university_id = u.id
+    WHERE p.id = ?
+"""
 
 
 @app.route("/api/programs/<int:program_id>", methods=["GET"])
 def get_program(program_id):
     """Get a specific program by ID"""
     with get_db() as conn:
-        cursor = conn.cursor()
-
-        cursor.execute(
-            """
-            SELECT
-                p.*, u.name as university_name, u.country, u.region, u.tier as university_tier
-            FROM programs p
-            JOIN universities u ON p.university_id = u.id
-            WHERE p.id = ?
-        """,
-            (program_id,),
-        )
+        program = fetch_one(conn, PROGRAM_DETAIL_QUERY, (program_id,))
 
-        row = cursor.fetchone()
-
-    if row:
-        return jsonify(dict(row))
+    if program:
+        return json_response(program)
     else:
         return jsonify({"error": "Program not found"}), 404
 
 
 @app.route("/api/universities", methods=["GET"])
+@response_cached
 def get_universities():
     """Get all universities with program counts"""
     with get_db() as conn:
-        cursor = conn.cursor()
-
-        cursor.execute("""
+        universities = fetch_dicts(conn.execute("""
             SELECT
                 u.id, u.name, u.country, u.region, u.tier,
                 COUNT(p.id) as program_count
@@ -164,131 +267,191 @@ def get_universities():
             LEFT JOIN programs p ON u.id = p.university_id
             GROUP BY u.id
             ORDER BY program_count DESC, u.name
-        """)
+        """))
+
+    return json_response({"count": len(universities), "universities": universities})
+
+
+# Single-pass summary for /api/stats. Counts and groupings come back as JSON
+# text; salary aggregates stay as native columns to keep full float precision.
+STATS_QUERY = """
+    WITH salaried AS (
+        SELECT y1_salary_usd, y10_salary_usd
+        FROM programs
+        WHERE y1_salary_usd IS NOT NULL AND y10_salary_usd IS NOT NULL
+    ),
+    tiers AS (
+        SELECT funding_tier, COUNT(*) AS count
+        FROM programs
+        GROUP BY funding_tier
+    ),
+    fields AS (
+        SELECT field, COUNT(*) AS count
+        FROM programs
+        GROUP BY field
+        ORDER BY count DESC
+    ),
+    countries AS (
+        SELECT u.country, COUNT(p.id) AS count
+        FROM universities u
+        JOIN programs p ON u.id = p.university_id
+        GROUP BY u.country
+        ORDER BY count DESC
+        LIMIT 10
+    )
+    SELECT
+        (SELECT COUNT(*) FROM programs) AS total_programs,
+        (SELECT COUNT(*) FROM universities) AS total_universities,
+        (SELECT json_group_array(json_array(funding_tier, count)) FROM tiers) AS by_tier,
+        (SELECT json_group_array(json_object('count', count, 'field', field))
+         FROM fields) AS by_field,
+        (SELECT json_group_array(json_object('count', count, 'country', country))
+         FROM countries) AS by_country,
+        s.*
+    FROM (
+        SELECT
+            MIN(y1_salary_usd) AS min_y1,
+            MAX(y1_salary_usd) AS max_y1,
+            AVG(y1_salary_usd) AS avg_y1,
+            MIN(y10_salary_usd) AS min_y10,
+            MAX(y10_salary_usd) AS max_y10,
+            AVG(y10_salary_usd) AS avg_y10
+        FROM salaried
+    ) AS s
+"""
 
-        rows = cursor.fetchall()
-        universities = [dict(row) for row in rows]
 
-    return jsonify({"count": len(universities), "universities": universities})
+@lru_cache(maxsize=None)
+def _has_table(name):
+    """Whether a table exists; checked once per dataset version."""
+    with get_db() as conn:
+        row = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (name,)
+        ).fetchone()
+    return row is not None
 
 
 @app.route("/api/stats", methods=["GET"])
+@response_cached
 def get_stats():
-    """Get summary statistics"""
+    """
+    Get summary statistics.
+
+    One aggregate query (STATS_QUERY); @response_cached keeps the encoded
+    body, so the tables are only aggregated once per process and query
+    string.
+    """
     with get_db() as conn:
-        cursor = conn.cursor()
+        body = _build_stats_body(conn)
 
-        # Total counts
-        cursor.execute("SELECT COUNT(*) FROM programs")
-        total_programs = cursor.fetchone()[0]
+    return raw_json_response(body)
 
-        cursor.execute("SELECT COUNT(*) FROM universities")
-        total_universities = cursor.fetchone()[0]
 
-        # By funding tier
-        cursor.execute("""
-            SELECT funding_tier, COUNT(*) as count
-            FROM programs
-            GROUP BY funding_tier
-        """)
-        by_tier = {row["funding_tier"]: row["count"] for row in cursor.fetchall()}
+def _build_stats_body(conn):
+    """Run STATS_QUERY and encode the /api/stats body."""
+    row = conn.execute(STATS_QUERY).fetchone()
 
-        # By field
-        cursor.execute("""
-            SELECT field, COUNT(*) as count
-            FROM programs
-            GROUP BY field
-            ORDER BY count DESC
-        """)
-        by_field = [dict(row) for row in cursor.fetchall()]
-
-        # By country (top 10)
-        cursor.execute("""
-            SELECT u.country, COUNT(p.id) as count
-            FROM universities u
-            JOIN programs p ON u.id = p.university_id
-            GROUP BY u.country
-            ORDER BY count DESC
-            LIMIT 10
-        """)
-        by_country = [dict(row) for row in cursor.fetchall()]
-
-        # Salary stats
-        cursor.execute("""
-            SELECT
-                MIN(y1_salary_usd) as min_y1,
-                MAX(y1_salary_usd) as max_y1,
-                AVG(y1_salary_usd) as avg_y1,
-                MIN(y10_salary_usd) as min_y10,
-                MAX(y10_salary_usd) as max_y10,
-                AVG(y10_salary_usd) as avg_y10
-            FROM programs
-            WHERE y1_salary_usd IS NOT NULL AND y10_salary_usd IS NOT NULL
-        """)
-        salary_stats = dict(cursor.fetchone())
-
-    return jsonify(
-        {
-            "total_programs": total_programs,
-            "total_universities": total_universities,
-            "by_tier": by_tier,
-            "by_field": by_field,
-            "by_country": by_country,
-            "salary_stats": salary_stats,
-        }
+    # by_field and by_country arrive as JSON text (keys already in sorted
+    # order) and are spliced in verbatim. by_tier stays a pair list in SQL
+    # since funding_tier may be NULL.
+    stats = {
+        "by_tier": {tier: count for tier, count in json.loads(row["by_tier"])},
+        "salary_stats": {
+            key: row[key]
+            for key in ("min_y1", "max_y1", "avg_y1", "min_y10", "max_y10", "avg_y10")
+        },
+        "total_programs": row["total_programs"],
+        "total_universities": row["total_universities"],
+    }
+    return dumps_spliced(
+        stats,
+        {"by_country": row["by_country"].encode(), "by_field": row["by_field"].encode()},
     )
 
 
+# ─── Career Node Serialization ───────────────────────────────────────────────
+
+# children is stored as JSON text. SQLite validates and minifies it so it can be
+# emitted as-is instead of being decoded and re-encoded in Python per row.
+NODE_CHILDREN_SQL = (
+    "CASE WHEN json_valid(children) THEN json(children) ELSE '[]' END AS children_json"
+)
+
+
+def _node_to_json(node, rename_probability=False):
+    """
+    Serialize a node row selected with NODE_CHILDREN_SQL to JSON object bytes.
+
+    Dicts from fetch_dicts/fetch_one are fresh per call, so they are modified
+    in place (children columns popped) instead of copied; a sqlite3.Row is
+    converted first.
+    """
+    if not isinstance(node, dict):
+        node = dict(node)
+    children = node.pop("children_json")
+    node.pop("children", None)
+    if rename_probability:
+        node["prob"] = node.pop("probability", None)
+    return b'{"children":' + children.encode() + b"," + dumps(node)[1:]
+
+
+def _nodes_response(rows, rename_probability=False):
+    """Build the {"count", "nodes"} payload from node dicts without a decode pass."""
+    nodes = b",".join(_node_to_json(row, rename_probability) for row in rows)
+    return raw_json_response(b'{"count":%d,"nodes":[%s]}' % (len(rows), nodes))
+
+
 @app.route("/api/career-nodes", methods=["GET"])
+@response_cached
 def get_career_nodes():
     """
     Get all career nodes with optional filter
     Query params:
       - node_type: Filter by type (career, trading, startup, freelance)
     """
-    from query_builder import QueryBuilder
 
-    qb = QueryBuilder("SELECT * FROM career_nodes")
+    qb = QueryBuilder(f"SELECT *, {NODE_CHILDREN_SQL} FROM career_nodes")
     qb.add_filter("node_type = ?", request.args.get("node_type"))
     qb.order_by("phase, id")
     query, params = qb.build()
 
     with get_db() as conn:
-        cursor = conn.cursor()
-        cursor.execute(query, params)
-        rows = cursor.fetchall()
+        rows = fetch_dicts(conn.execute(query, params))
+
+    # Stored children JSON is spliced in verbatim; probability -> prob for the frontend
+    return _nodes_response(rows, rename_probability=True)
 
-        # Convert to list of dicts, parse children JSON, map probability -> prob
-        nodes = []
-        for row in rows:
-            node = dict(row)
-            # Parse children from JSON string to array
-            node["children"] = json.loads(node.get("children") or "[]")
-            # Map probability -> prob for frontend compatibility
-            node["prob"] = node.pop("probability", None)
-            nodes.append(node)
 
-    return jsonify({"count": len(nodes), "nodes": nodes})
+CAREER_NODE_QUERY = f"SELECT *, {NODE_CHILDREN_SQL} FROM career_nodes WHERE id = ?"
 
 
 @app.route("/api/career-nodes/<string:node_id>", methods=["GET"])
 def get_career_node(node_id):
     """Get a specific career node by ID"""
     with get_db() as conn:
-        cursor = conn.cursor()
-
-        cursor.execute("SELECT * FROM career_nodes WHERE id = ?", (node_id,))
-        row = cursor.fetchone()
+        row = fetch_one(conn, CAREER_NODE_QUERY, (node_id,))
 
     if row:
-        node = dict(row)
-        node["children"] = json.loads(node.get("children") or "[]")
-        node["prob"] = node.pop("probability", None)
-        return jsonify(node)
+        return raw_json_response(_node_to_json(row, rename_probability=True))
     else:
         return jsonify({"error": "Career node not found"}), 404
 
 
+# ─── Per-request Profile Cache ───────────────────────────────────────────────
+
+
+def _cached_profile(conn):
+    """
+    Load the user profile once per request and memoize it in flask.g.
+
+    Returns a copy so callers can merge updates without touching the cache.
+    The PUT /api/profile handler drops the cached entry after saving.
+    """
+    if "profile" not in g:
+        g.profile = _get_profile(conn)
+    return dict(g.profile)
+
+
 @app.route("/api/edges", methods=["GET"])
 def get_edges():
     """
@@ -300,69 +463,38 @@ def get_edges():
       - node_type: Filter edges where source node matches this node_type
       - calibrated: If "true", apply profile-based probability calibration
     """
-    with get_db() as conn:
-        cursor = conn.cursor()
-
-        # Check if calibrated edges requested
-        if request.args.get("calibrated", "").lower() == "true":
-            from profile_calibrator import calibrate_edges, get_profile
-
-            profile = get_profile(conn)
-            all_edges = calibrate_edges(profile=profile, conn=conn)
-
-            # Apply filters
-            edges = all_edges
-            if request.args.get("source_id"):
-                edges = [
-                    e for e in edges if e["source_id"] == request.args.get("source_id")
-                ]
-            if request.args.get("target_id"):
-                edges = [
-                    e for e in edges if e["target_id"] == request.args.get("target_id")
-                ]
-            if request.args.get("link_type"):
-                edges = [
-                    e for e in edges if e["link_type"] == request.args.get("link_type")
-                ]
-            if request.args.get("node_type"):
-                # Need to look up which nodes match the node_type
-                cursor.execute(
-                    "SELECT id FROM career_nodes WHERE node_type = ?",
-                    (request.args.get("node_type"),),
-                )
-                valid_sources = {row["id"] for row in cursor.fetchall()}
-                edges = [e for e in edges if e["source_id"] in valid_sources]
 
-            return jsonify({"count": len(edges), "edges": edges, "calibrated": True})
+    args = request.args
 
-        query = "SELECT e.* FROM edges e WHERE 1=1"
-        params = []
-
-        if request.args.get("source_id"):
-            query += " AND e.source_id = ?"
-            params.append(request.args.get("source_id"))
-
-        if request.args.get("target_id"):
-            query += " AND e.target_id = ?"
-            params.append(request.args.get("target_id"))
-
-        if request.args.get("link_type"):
-            query += " AND e.link_type = ?"
-            params.append(request.args.get("link_type"))
-
-        if request.args.get("node_type"):
-            query += (
-                " AND e.source_id IN (SELECT id FROM career_nodes WHERE node_type = ?)"
+    with get_db() as conn:
+        # Check if calibrated edges requested
+        if args.get("calibrated", "").lower() == "true":
+            profile = _cached_profile(conn)
+            edges = get_cached_calibrated_edges(
+                profile,
+                source_id=args.get("source_id"),
+                target_id=args.get("target_id"),
+                link_type=args.get("link_type"),
+                node_type=args.get("node_type"),
             )
-            params.append(request.args.get("node_type"))
 
-        query += " ORDER BY e.source_id, e.target_id"
-        cursor.execute(query, params)
-        rows = cursor.fetchall()
+            return json_response({"count": len(edges), "edges": edges, "calibrated": True})
 
-        edges = [dict(row) for row in rows]
+        qb = QueryBuilder("SELECT e.* FROM edges e")
+        qb.add_filter("e.source_id = ?", args.get("source_id"))
+        qb.add_filter("e.target_id = ?", args.get("target_id"))
+        qb.add_filter("e.link_type = ?", args.get("link_type"))
+        qb.add_filter(
+            "e.source_id IN (SELECT id FROM career_nodes WHERE node_type = ?)",
+            args.get("node_type"),
+        )
+        qb.order_by("e.source_id, e.target_id")
+        query, params = qb.build()
+        columns, rows = fetch_rows(conn.execute(query, params))
 
-    return jsonify({"count": len(edges), "edges": edges})
+    # Each row becomes a dict only while it is being encoded
+    edges = (dict(zip(columns, row)) for row in rows)
+    return stream_json_object({"count": len(rows)}, {"edges": edges})
 
 
 @app.route("/api/profile", methods=["GET"])
@@ -371,12 +503,10 @@ def get_profile():
     Get the current user profile used for probability calibration.
     Returns all 13 profile factors with their current values.
     """
-    from profile_calibrator import get_profile as _get_profile
-
     with get_db() as conn:
-        profile = _get_profile(conn)
+        profile = _cached_profile(conn)
 
-    return jsonify({"profile": profile})
+    return json_response({"profile": profile})
 
 
 @app.route("/api/profile", methods=["PUT"])
@@ -400,7 +530,6 @@ def update_profile():
       - quant_aptitude: "strong" | "moderate" | "weak"
       - current_salary_pkr: int (>= 0)
     """
-    from profile_calibrator import save_profile, get_profile as _get_profile
 
     data = request.get_json()
     if not data:
@@ -409,9 +538,10 @@ def update_profile():
     try:
         with get_db() as conn:
             # Load current profile, merge with updates
-            current = _get_profile(conn)
+            current = _cached_profile(conn)
             current.update(data)
             saved = save_profile(current, conn)
+            g.pop("profile", None)
     except ValueError as e:
         return jsonify({"error": str(e)}), 400
 
@@ -424,12 +554,11 @@ def get_calibration_summary():
     Get a summary of how the current profile affects edge probabilities.
     Shows which edges changed and by how much.
     """
-    from profile_calibrator import get_calibration_summary as _get_summary
 
     with get_db() as conn:
         summary = _get_summary(conn=conn)
 
-    return jsonify(summary)
+    return json_response(summary)
 
 
 # ═══════════════════════════════════════════════════════════════════════════
@@ -444,12 +573,10 @@ def get_city_qol(city):
     Returns safety, climate, halal food, Muslim community, transit, healthcare data.
     """
     with get_db() as conn:
-        cursor = conn.cursor()
-        cursor.execute("SELECT * FROM qol_metrics WHERE city = ?", (city,))
-        row = cursor.fetchone()
+        row = fetch_one(conn, "SELECT * FROM qol_metrics WHERE city = ?", (city,))
 
     if row:
-        return jsonify(dict(row))
+        return json_response(row)
     else:
         return jsonify({"error": f"QoL metrics not found for city: {city}"}), 404
 
@@ -464,24 +591,22 @@ def get_all_qol():
       - halal: Filter by halal_food_availability ('excellent', 'good', 'limited', 'poor')
       - muslim_community: Filter by muslim_community_size ('large', 'medium', 'small', 'minimal')
     """
-    from query_builder import QueryBuilder
+
+    args = request.args
 
     qb = QueryBuilder("SELECT * FROM qol_metrics")
-    qb.add_filter("country = ?", request.args.get("country"))
-    qb.add_filter("safety_index >= ?", request.args.get("min_safety"))
-    qb.add_filter("halal_food_availability = ?", request.args.get("halal"))
-    qb.add_filter("muslim_community_size = ?", request.args.get("muslim_community"))
+    qb.add_filter("country = ?", args.get("country"))
+    qb.add_filter("safety_index >= ?", args.get("min_safety"))
+    qb.add_filter("halal_food_availability = ?", args.get("halal"))
+    qb.add_filter("muslim_community_size = ?", args.get("muslim_community"))
     qb.order_by("safety_index DESC")
 
     query, params = qb.build()
 
     with get_db() as conn:
-        cursor = conn.cursor()
-        cursor.execute(query, params)
-        rows = cursor.fetchall()
-        metrics = [dict(row) for row in rows]
+        metrics = fetch_dicts(conn.execute(query, params))
 
-    return jsonify({"count": len(metrics), "qol_metrics": metrics})
+    return json_response({"count": len(metrics), "qol_metrics": metrics})
 
 
 @app.route("/api/visa-rates", methods=["GET"])
@@ -493,23 +618,21 @@ def get_visa_rates():
       - nationality: Filter by nationality (default: all, typically 'Pakistan')
       - visa_type: Filter by visa type (e.g., 'H-1B', 'PGWP')
     """
-    from query_builder import QueryBuilder
+
+    args = request.args
 
     qb = QueryBuilder("SELECT * FROM visa_approval_by_nationality")
-    qb.add_filter("country = ?", request.args.get("country"))
-    qb.add_filter("nationality = ?", request.args.get("nationality"))
-    qb.add_filter("visa_type = ?", request.args.get("visa_type"))
+    qb.add_filter("country = ?", args.get("country"))
+    qb.add_filter("nationality = ?", args.get("nationality"))
+    qb.add_filter("visa_type = ?", args.get("visa_type"))
     qb.order_by("country, visa_type")
 
     query, params = qb.build()
 
     with get_db() as conn:
-        cursor = conn.cursor()
-        cursor.execute(query, params)
-        rows = cursor.fetchall()
-        rates = [dict(row) for row in rows]
+        rates = fetch_dicts(conn.execute(query, params))
 
-    return jsonify({"count": len(rates), "visa_rates": rates})
+    return json_response({"count": len(rates), "visa_rates": rates})
 
 
 @app.route("/api/visa-rates/<country>/<nationality>", methods=["GET"])
@@ -519,19 +642,16 @@ def get_country_visa_rates(country, nationality):
     Includes student visas, work visas, and PR pathways.
     """
     with get_db() as conn:
-        cursor = conn.cursor()
-        cursor.execute("""
+        rates = fetch_dicts(conn.execute("""
             SELECT * FROM visa_approval_by_nationality
             WHERE country = ? AND nationality = ?
             ORDER BY visa_type
-        """, (country, nationality))
-        rows = cursor.fetchall()
-        rates = [dict(row) for row in rows]
+        """, (country, nationality)))
 
     if not rates:
         return jsonify({"error": f"No visa data for {nationality} in {country}"}), 404
 
-    return jsonify({
+    return json_response({
         "country": country,
         "nationality": nationality,
         "count": len(rates),
@@ -546,12 +666,10 @@ def get_immigration_policy(country):
     Returns student visa, post-study work, PR pathway, spouse rights, etc.
     """
     with get_db() as conn:
-        cursor = conn.cursor()
-        cursor.execute("SELECT * FROM immigration_policy WHERE country = ?", (country,))
-        row = cursor.fetchone()
+        row = fetch_one(conn, "SELECT * FROM immigration_policy WHERE country = ?", (country,))
 
     if row:
-        return jsonify(dict(row))
+        return json_response(row)
     else:
         return jsonify({"error": f"Immigration policy not found for country: {country}"}), 404
 
@@ -565,24 +683,22 @@ def get_all_immigration():
       - pr_difficulty: Filter by PR pathway difficulty ('easy', 'moderate', 'difficult', 'very_difficult')
       - min_post_study_months: Minimum post-study work duration in months
     """
-    from query_builder import QueryBuilder
+
+    args = request.args
 
     qb = QueryBuilder("SELECT * FROM immigration_policy")
-    if request.args.get("spouse_work", "").lower() == "true":
+    if args.get("spouse_work", "").lower() == "true":
         qb.add_filter("spouse_open_work_permit = ?", 1)
-    qb.add_filter("pr_pathway_difficulty = ?", request.args.get("pr_difficulty"))
-    qb.add_filter("post_study_work_duration_months >= ?", request.args.get("min_post_study_months"))
+    qb.add_filter("pr_pathway_difficulty = ?", args.get("pr_difficulty"))
+    qb.add_filter("post_study_work_duration_months >= ?", args.get("min_post_study_months"))
     qb.order_by("post_study_work_duration_months DESC")
 
     query, params = qb.build()
 
     with get_db() as conn:
-        cursor = conn.cursor()
-        cursor.execute(query, params)
-        rows = cursor.fetchall()
-        policies = [dict(row) for row in rows]
+        policies = fetch_dicts(conn.execute(query, params))
 
-    return jsonify({"count": len(policies), "immigration_policies": policies})
+    return json_response({"count": len(policies), "immigration_policies": policies})
 
 
 @app.route("/api/industry-hubs/<city>", methods=["GET"])
@@ -592,13 +708,10 @@ def get_city_industry_hubs(city):
     Returns all industries present in the city with strength, employers, salaries.
     """
     with get_db() as conn:
-        cursor = conn.cursor()
-        cursor.execute("SELECT * FROM industry_hubs WHERE city = ?", (city,))
-        rows = cursor.fetchall()
-        hubs = [dict(row) for row in rows]
+        hubs = fetch_dicts(conn.execute("SELECT * FROM industry_hubs WHERE city = ?", (city,)))
 
     if hubs:
-        return jsonify({"city": city, "count": len(hubs), "hubs": hubs})
+        return json_response({"city": city, "count": len(hubs), "hubs": hubs})
     else:
         return jsonify({"error": f"Industry hubs not found for city: {city}"}), 404
 
@@ -611,7 +724,6 @@ def get_all_industry_hubs():
       - industry: Filter by industry ('AI/ML', 'Finance', etc.)
       - hub_strength: Filter by strength ('global_leader', 'major', 'growing', 'emerging')
     """
-    from query_builder import QueryBuilder
 
     qb = QueryBuilder("SELECT * FROM industry_hubs")
     qb.add_filter("industry = ?", request.args.get("industry"))
@@ -621,12 +733,9 @@ def get_all_industry_hubs():
     query, params = qb.build()
 
     with get_db() as conn:
-        cursor = conn.cursor()
-        cursor.execute(query, params)
-        rows = cursor.fetchall()
-        hubs = [dict(row) for row in rows]
+        hubs = fetch_dicts(conn.execute(query, params))
 
-    return jsonify({"count": len(hubs), "industry_hubs": hubs})
+    return json_response({"count": len(hubs), "industry_hubs": hubs})
 
 
 @app.route("/api/programs/<int:program_id>/full", methods=["GET"])
@@ -636,46 +745,36 @@ def get_program_full_details(program_id):
     Returns comprehensive data for decision-making.
     """
     with get_db() as conn:
-        cursor = conn.cursor()
-
         # Get program with university info
-        cursor.execute("""
-            SELECT
-                p.*, u.name as university_name, u.country, u.region, u.tier as university_tier
-            FROM programs p
-            JOIN universities u ON p.university_id = u.id
-            WHERE p.id = ?
-        """, (program_id,))
-        program_row = cursor.fetchone()
+        program = fetch_one(conn, PROGRAM_DETAIL_QUERY, (program_id,))
 
-        if not program_row:
+        if program is None:
             return jsonify({"error": "Program not found"}), 404
 
-        program = dict(program_row)
         country = program["country"]
 
         # Get immigration policy for this country
-        cursor.execute("SELECT * FROM immigration_policy WHERE country = ?", (country,))
-        immigration_row = cursor.fetchone()
-        immigration = dict(immigration_row) if immigration_row else None
+        immigration = fetch_one(
+            conn, "SELECT * FROM immigration_policy WHERE country = ?", (country,)
+        )
 
         # Get QoL metrics for the primary market city (if exists)
         primary_market = program.get("primary_market", "")
         qol = None
         if primary_market:
             # Extract city from primary_market (e.g., "Bay Area, CA" -> try "San Francisco")
-            from market_mapping import get_market_info
             market_info = get_market_info(primary_market, country)
             if market_info.work_city:
-                cursor.execute("SELECT * FROM qol_metrics WHERE city = ?", (market_info.work_city,))
-                qol_row = cursor.fetchone()
-                qol = dict(qol_row) if qol_row else None
+                qol = fetch_one(
+                    conn, "SELECT * FROM qol_metrics WHERE city = ?", (market_info.work_city,)
+                )
 
         # Get industry hubs for the work city
         industry_hubs = []
         if qol:
-            cursor.execute("SELECT * FROM industry_hubs WHERE city = ?", (qol["city"],))
-            industry_hubs = [dict(row) for row in cursor.fetchall()]
+            industry_hubs = fetch_dicts(
+                conn.execute("SELECT * FROM industry_hubs WHERE city = ?", (qol["city"],))
+            )
 
     # Build visa info summary
     visa_info = {
@@ -708,7 +807,7 @@ def get_program_full_details(program_id):
         "online_hybrid_option": bool(program.get("online_hybrid_option")),
     }
 
-    return jsonify({
+    return json_response({
         "program": program,
         "visa_info": visa_info,
         "placement_info": placement_info,
@@ -720,78 +819,123 @@ def get_program_full_details(program_id):
     })
 
 
-@app.route("/api/search", methods=["GET"])
-def search():
+# Trigram FTS needs at least 3 characters to match anything
+FTS_MIN_QUERY_LENGTH = 3
+
+SEARCH_COLUMNS = """
+    p.id, p.program_name, p.field, p.tuition_usd,
+    p.y1_salary_usd, p.y10_salary_usd, p.funding_tier,
+    u.name as university_name, u.country
+"""
+
+
+def _search_programs_fts(cursor, query_text, limit):
     """
-    Search programs by keyword
-    Query param: q (search query)
+    Search via the programs_fts trigram index (top `limit` by Y10 salary).
+    Returns None if the index hasn't been created yet (un-migrated DB).
     """
-    query_text = request.args.get("q", "")
+    if not _has_table("programs_fts"):
+        return None
+    # Quote as a single FTS5 phrase so user input is never parsed as syntax
+    match_expr = '"' + query_text.replace('"', '""') + '"'
+    cursor.execute(
+        f"""
+        SELECT {SEARCH_COLUMNS}
+        FROM programs_fts f
+        JOIN programs p ON p.id = f.rowid
+        JOIN universities u ON p.university_id = u.id
+        WHERE programs_fts MATCH ?
+        ORDER BY p.y10_salary_usd DESC, p.id
+        LIMIT ?
+    """,
+        (match_expr, limit),
+    )
+    return fetch_dicts(cursor)
 
-    if not query_text:
-        return jsonify({"error": "Query parameter 'q' is required"}), 400
 
-    with get_db() as conn:
-        cursor = conn.cursor()
+def _like_escape(text):
+    """Escape LIKE wildcards so user input is matched literally (ESCAPE '\\')."""
+    return text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
 
-        cursor.execute(
-            """
-            SELECT
-                p.id, p.program_name, p.field, p.tuition_usd,
-                p.y1_salary_usd, p.y10_salary_usd, p.funding_tier,
-                u.name as university_name, u.country
-            FROM programs p
-            JOIN universities u ON p.university_id = u.id
-            WHERE
-                p.program_name LIKE ? OR
-                u.name LIKE ? OR
-                p.field LIKE ? OR
-                u.country LIKE ?
-            ORDER BY p.y10_salary_usd DESC
-        """,
-            (
-                f"%{query_text}%",
-                f"%{query_text}%",
-                f"%{query_text}%",
-                f"%{query_text}%",
-            ),
-        )
 
-        rows = cursor.fetchall()
-        results = [dict(row) for row in rows]
+@app.route("/api/search", methods=["GET"])
+def search():
+    """
+    Search programs by keyword
+    Query params:
+      - q: search query (required)
+      - mode: "prefix" to match short (1-2 char) queries only at the start
+          of a column (default: substring match anywhere, at any length)
+      - limit: Max results, highest Y10 salary first (default: 50)
+    """
 
-    return jsonify({"query": query_text, "count": len(results), "results": results})
+    args = request.args
 
+    query_text = args.get("q", "")
 
-# ─── Networth Endpoint Helpers ──────────────────────────────────────────────
+    if not query_text:
+        return jsonify({"error": "Query parameter 'q' is required"}), 400
 
+    params, error = validate_params(args, [SEARCH_LIMIT])
+    if error:
+        return error
+    limit = params["limit"]
 
-def _filter_programs(programs: list, args: dict, max_capital: int = None) -> list:
-    """Apply filters to program list based on request args."""
-    if args.get("field"):
-        programs = [p for p in programs if p["field"] == args.get("field")]
-    if args.get("funding_tier"):
-        programs = [p for p in programs if p["funding_tier"] == args.get("funding_tier")]
-    if args.get("work_country"):
-        programs = [p for p in programs if p["work_country"] == args.get("work_country")]
-    if max_capital is not None:
-        programs = [p for p in programs if p.get("initial_capital_usd", 0) <= max_capital]
-    return programs
+    with get_db() as conn:
+        cursor = conn.cursor()
 
+        results = None
+        if len(query_text) >= FTS_MIN_QUERY_LENGTH:
+            results = _search_programs_fts(cursor, query_text, limit)
+
+        if results is None:
+            # Short queries ("UK", "DS") are usually a country/field prefix;
+            # clients can opt into prefix matching, which hits far fewer rows
+            if (
+                len(query_text) < FTS_MIN_QUERY_LENGTH
+                and args.get("mode") == "prefix"
+            ):
+                pattern = f"{_like_escape(query_text)}%"
+            else:
+                pattern = f"%{_like_escape(query_text)}%"
+
+            # One numbered parameter shared by all four columns; the
+            # idx_programs_y10 walk stops once `limit` rows have matched
+            cursor.execute(
+                f"""
+                SELECT {SEARCH_COLUMNS}
+                FROM programs p
+                JOIN universities u ON p.university_id = u.id
+                WHERE
+                    p.program_name LIKE ?1 ESCAPE '\\' OR
+                    u.name LIKE ?1 ESCAPE '\\' OR
+                    p.field LIKE ?1 ESCAPE '\\' OR
+                    u.country LIKE ?1 ESCAPE '\\'
+                ORDER BY p.y10_salary_usd DESC, p.id
+                LIMIT ?2
+            """,
+                (pattern, limit),
+            )
+            results = fetch_dicts(cursor)
 
-def _sort_programs(programs: list, sort_by: str, sort_map: dict) -> None:
-    """Sort programs in place by the specified field."""
-    key = sort_map.get(sort_by, "net_benefit_k")
-    # For initial_capital and cost, lower is better
-    reverse = sort_by not in ("cost", "initial_capital")
-    programs.sort(key=lambda x: x.get(key, 0), reverse=reverse)
+    return json_response({"query": query_text, "count": len(results), "results": results})
 
 
-def _apply_compact_mode(programs: list, compact: bool) -> None:
-    """Strip yearly breakdowns from programs if compact mode is enabled."""
-    if compact:
-        for p in programs:
-            p.pop("yearly_breakdown", None)
+NETWORTH_PARAMS = [
+    LIFESTYLE,
+    AID_SCENARIO,
+    FAMILY_YEAR_MASTERS,
+    COMPACT,
+    optional_param("baseline_salary", float),
+    optional_param("baseline_growth", float),
+    optional_param("max_initial_capital", int),
+    RESULT_LIMIT,
+    # Unknown sort names fall back to net_benefit in calculate_all_programs
+    optional_param("sort_by", str),
+    optional_param("field", str),
+    optional_param("funding_tier", str),
+    optional_param("work_country", str),
+]
 
 
 @app.route("/api/networth", methods=["GET"])
@@ -812,61 +956,59 @@ def get_networth():
       - work_country: Filter by work country
       - max_initial_capital: Max initial capital requirement in USD (filters programs you can afford)
       - limit: Max results (default: all)
-      - compact: If "true", omit yearly breakdowns (default: false)
+      - compact: If true, omit yearly breakdowns (true/1/yes/on; default: false)
     """
-    from networth_calculator import calculate_all_programs
 
     # Validate parameters
-    params, error = validate_params(request.args, [LIFESTYLE, AID_SCENARIO, FAMILY_YEAR_MASTERS])
-    if error:
-        return error
-
-    baseline_salary, error = validate_optional_float(request.args, "baseline_salary")
-    if error:
-        return error
-    baseline_growth, error = validate_optional_float(request.args, "baseline_growth")
-    if error:
-        return error
-    max_capital, error = validate_optional_int(request.args, "max_initial_capital")
-    if error:
-        return error
-    limit, error = validate_optional_int(request.args, "limit")
+    params, error = validate_params(request.args, NETWORTH_PARAMS)
     if error:
         return error
 
+    # Compact mode skips building yearly breakdowns rather than stripping them;
+    # filters and limit run over a memoized ranking, copying only the matches
     data = calculate_all_programs(
-        baseline_salary=baseline_salary,
-        baseline_growth=baseline_growth,
+        baseline_salary=params["baseline_salary"],
+        baseline_growth=params["baseline_growth"],
         lifestyle=params["lifestyle"],
         family_transition_year=params["family_year"],
         aid_scenario=params["aid_scenario"],
+        include_breakdown=not params["compact"],
+        sort_by=params["sort_by"],
+        field=params["field"],
+        funding_tier=params["funding_tier"],
+        work_country=params["work_country"],
+        max_initial_capital=params["max_initial_capital"],
+        limit=params["limit"],
     )
+    programs = data["programs"]
 
-    # Filter, sort, limit, compact
-    programs = _filter_programs(data["programs"], request.args, max_capital)
-
-    sort_map = {
-        "net_benefit": "net_benefit_k",
-        "cost": "total_study_cost_k",
-        "y1": "y1_salary_k",
-        "y10": "y10_salary_k",
-        "networth": "masters_networth_k",
-        "initial_capital": "initial_capital_usd",
-    }
-    _sort_programs(programs, request.args.get("sort_by", "net_benefit"), sort_map)
-
-    if limit is not None:
-        programs = programs[:limit]
-
-    _apply_compact_mode(programs, request.args.get("compact", "").lower() == "true")
-
-    data["programs"] = programs
     data["summary"]["total_filtered"] = len(programs)
 
-    return jsonify(data)
+    # Programs (with yearly breakdowns unless compact) are encoded one at a time
+    head = {k: v for k, v in data.items() if k != "programs"}
+    return stream_json_object(head, {"programs": programs})
+
+
+# Program columns needed by calculate_program_networth(); shared with /compare
+PROGRAM_NETWORTH_QUERY = """
+    SELECT
+        p.id, p.program_name, p.field, p.tuition_usd,
+        p.y1_salary_usd, p.y5_salary_usd, p.y10_salary_usd,
+        p.net_10yr_usd, p.funding_tier, p.duration_years,
+        p.primary_market, p.notes,
+        p.expected_aid_pct, p.expected_aid_usd,
+        p.best_case_aid_pct, p.best_case_aid_usd,
+        p.aid_type, p.coop_earnings_usd,
+        p.initial_capital_usd,
+        u.name as university_name, u.country, u.region
+    FROM programs p
+    JOIN universities u ON p.university_id = u.id
+    WHERE p.id = ?
+"""
 
 
 @app.route("/api/networth/<int:program_id>", methods=["GET"])
+@etag_cached(dataset_version)
 def get_program_networth(program_id):
     """
     Calculate 12-year net worth for a specific program by ID (V2).
@@ -876,10 +1018,6 @@ def get_program_networth(program_id):
       - family_year: Calendar year for single→family transition, 1-13 (default: 5, 13=never)
       - aid_scenario: Financial aid scenario — "no_aid", "expected", or "best_case" (default: no_aid)
     """
-    from networth_calculator import (
-        calculate_program_networth,
-        calculate_baseline_networth,
-    )
 
     # Validate parameters
     params, error = validate_params(request.args, [LIFESTYLE, AID_SCENARIO, FAMILY_YEAR_MASTERS])
@@ -887,32 +1025,11 @@ def get_program_networth(program_id):
         return error
 
     with get_db() as conn:
-        cursor = conn.cursor()
-        cursor.execute(
-            """
-            SELECT
-                p.id, p.program_name, p.field, p.tuition_usd,
-                p.y1_salary_usd, p.y5_salary_usd, p.y10_salary_usd,
-                p.net_10yr_usd, p.funding_tier, p.duration_years,
-                p.primary_market, p.notes,
-                p.expected_aid_pct, p.expected_aid_usd,
-                p.best_case_aid_pct, p.best_case_aid_usd,
-                p.aid_type, p.coop_earnings_usd,
-                p.initial_capital_usd,
-                u.name as university_name, u.country, u.region
-            FROM programs p
-            JOIN universities u ON p.university_id = u.id
-            WHERE p.id = ?
-        """,
-            (program_id,),
-        )
+        program = fetch_one(conn, PROGRAM_NETWORTH_QUERY, (program_id,))
 
-        row = cursor.fetchone()
-
-    if not row:
+    if program is None:
         return jsonify({"error": "Program not found"}), 404
 
-    program = dict(row)
     baseline = calculate_baseline_networth(
         lifestyle=params["lifestyle"],
         family_transition_year=params["family_year"],
@@ -926,10 +1043,11 @@ def get_program_networth(program_id):
     )
     result["baseline"] = baseline
 
-    return jsonify(result)
+    return json_response(result)
 
 
 @app.route("/api/networth/<int:program_id>/compare", methods=["GET"])
+@etag_cached(dataset_version)
 def get_program_networth_comparison(program_id):
     """
     Calculate 12-year net worth for a specific program with ALL THREE aid scenarios.
@@ -939,10 +1057,6 @@ def get_program_networth_comparison(program_id):
       - lifestyle: Living cost tier — "frugal" or "comfortable" (default: frugal)
       - family_year: Calendar year for single→family transition, 1-13 (default: 5, 13=never)
     """
-    from networth_calculator import (
-        calculate_program_networth,
-        calculate_baseline_networth,
-    )
 
     # Validate parameters
     params, error = validate_params(request.args, [LIFESTYLE, FAMILY_YEAR_MASTERS])
@@ -950,56 +1064,31 @@ def get_program_networth_comparison(program_id):
         return error
 
     with get_db() as conn:
-        cursor = conn.cursor()
-        cursor.execute(
-            """
-            SELECT
-                p.id, p.program_name, p.field, p.tuition_usd,
-                p.y1_salary_usd, p.y5_salary_usd, p.y10_salary_usd,
-                p.net_10yr_usd, p.funding_tier, p.duration_years,
-                p.primary_market, p.notes,
-                p.expected_aid_pct, p.expected_aid_usd,
-                p.best_case_aid_pct, p.best_case_aid_usd,
-                p.aid_type, p.coop_earnings_usd,
-                p.initial_capital_usd,
-                u.name as university_name, u.country, u.region
-            FROM programs p
-            JOIN universities u ON p.university_id = u.id
-            WHERE p.id = ?
-        """,
-            (program_id,),
-        )
+        program = fetch_one(conn, PROGRAM_NETWORTH_QUERY, (program_id,))
 
-        row = cursor.fetchone()
-
-    if not row:
+    if program is None:
         return jsonify({"error": "Program not found"}), 404
 
-    program = dict(row)
     baseline = calculate_baseline_networth(
         lifestyle=params["lifestyle"],
         family_transition_year=params["family_year"],
     )
 
-    # Calculate all three scenarios
-    scenarios = {}
-    for scenario in ["no_aid", "expected", "best_case"]:
-        result = calculate_program_networth(
-            program,
-            baseline["total_networth_k"],
-            lifestyle=params["lifestyle"],
-            family_transition_year=params["family_year"],
-            aid_scenario=scenario,
-        )
-        # Remove yearly breakdown for compactness
-        result.pop("yearly_breakdown", None)
-        scenarios[scenario] = result
+    # Calculate all three scenarios in one pass (shared work period)
+    scenarios = calculate_program_networth_batch(
+        program,
+        baseline["total_networth_k"],
+        scenarios=AID_SCENARIOS,
+        lifestyle=params["lifestyle"],
+        family_transition_year=params["family_year"],
+        include_breakdown=False,
+    )
 
     # Calculate aid impact
     aid_impact_expected = scenarios["expected"]["net_benefit_k"] - scenarios["no_aid"]["net_benefit_k"]
     aid_impact_best_case = scenarios["best_case"]["net_benefit_k"] - scenarios["no_aid"]["net_benefit_k"]
 
-    return jsonify({
+    return json_response({
         "program_id": program_id,
         "university": program["university_name"],
         "program_name": program["program_name"],
@@ -1023,6 +1112,15 @@ def get_program_networth_comparison(program_id):
     })
 
 
+AFFORDABILITY_PARAMS = [
+    AID_SCENARIO_EXPECTED,
+    SUMMARY_ONLY,
+    optional_param("available_savings", int),
+    optional_param("monthly_side_income", int),
+    optional_param("prep_months", int),
+]
+
+
 @app.route("/api/affordability", methods=["GET"])
 def get_affordability():
     """
@@ -1034,104 +1132,114 @@ def get_affordability():
       - monthly_side_income: Expected monthly side income during prep period in USD (default: 0)
       - prep_months: Months until program start to save more (default: 6)
       - aid_scenario: Financial aid scenario — "no_aid", "expected", or "best_case" (default: expected)
+      - summary_only: If true, return only the funds and tier counts (true/1/yes/on; default: false)
 
     Returns programs grouped by affordability tier:
       - affordable: Initial capital <= available funds
       - stretch: Initial capital <= available + (monthly_income * prep_months)
       - needs_funding: Requires external loans or family support
+
+    With Accept: application/x-ndjson the same data is streamed as one
+    {"meta": ...} line followed by one line per program.
     """
-    from networth_calculator import calculate_all_programs
-    from profile_calibrator import get_profile as _get_profile
-    from validators import ParamValidator
-
-    # Create aid_scenario validator with "expected" as default for affordability
-    aid_scenario_expected = ParamValidator(
-        name="aid_scenario",
-        param_type=str,
-        default="expected",
-        valid_values={"no_aid", "expected", "best_case"},
-        error_msg="aid_scenario must be 'no_aid', 'expected', or 'best_case'",
-    )
-    params, error = validate_params(request.args, [aid_scenario_expected])
-    if error:
-        return error
 
-    # Get optional integer params
-    available_savings, error = validate_optional_int(request.args, "available_savings")
-    if error:
-        return error
-    monthly_side_income, error = validate_optional_int(request.args, "monthly_side_income")
-    if error:
-        return error
-    prep_months, error = validate_optional_int(request.args, "prep_months")
+    params, error = validate_params(request.args, AFFORDABILITY_PARAMS)
     if error:
         return error
+    available_savings = params["available_savings"]
 
     # Get available savings from profile if not specified
     if available_savings is None:
         with get_db() as conn:
-            profile = _get_profile(conn)
+            profile = _cached_profile(conn)
             available_savings = profile.get("available_savings_usd", 5000)
 
-    monthly_side_income = monthly_side_income or 0
-    prep_months = prep_months or 6
+    monthly_side_income = params["monthly_side_income"] or 0
+    prep_months = params["prep_months"] or 6
     aid_scenario = params["aid_scenario"]
 
     # Calculate total available funds
     total_available = available_savings + (monthly_side_income * prep_months)
 
-    # Get all programs
-    data = calculate_all_programs(aid_scenario=aid_scenario)
-    programs = data["programs"]
+    # All programs (memoized and shared, so read-only), ranked by net benefit
+    programs = ranked_programs(aid_scenario=aid_scenario, sort_by="net_benefit")
+    capitals = ranked_initial_capitals(aid_scenario=aid_scenario, sort_by="net_benefit")
 
-    # Group by affordability
+    funds = {
+        "available_savings_usd": available_savings,
+        "monthly_side_income_usd": monthly_side_income,
+        "prep_months": prep_months,
+        "total_available_usd": total_available,
+        "aid_scenario": aid_scenario,
+    }
+
+    if params["summary_only"]:
+        # Counts straight from the capital column; no program is copied or encoded
+        affordable_count = sum(1 for c in capitals if c <= available_savings)
+        covered_count = sum(1 for c in capitals if c <= available_savings or c <= total_available)
+        return json_response({
+            **funds,
+            "summary": {
+                "affordable_count": affordable_count,
+                "stretch_count": covered_count - affordable_count,
+                "needs_funding_count": len(capitals) - covered_count,
+                "total_programs": len(capitals),
+            },
+        })
+
+    # Annotate and bucket in a single pass; buckets keep the ranking order.
+    # Only the top 20 programs needing funding are returned, so the rest
+    # are counted but never copied.
     affordable = []
     stretch = []
     needs_funding = []
+    needs_funding_count = 0
 
-    for p in programs:
-        initial_capital = p.get("initial_capital_usd", 0)
-        shortfall = initial_capital - total_available
-
-        p["initial_capital_usd"] = initial_capital
-        p["shortfall_usd"] = max(0, shortfall)
-        p["affordability_pct"] = round(min(100, (total_available / max(initial_capital, 1)) * 100), 1)
-
+    for p, initial_capital in zip(programs, capitals):
         if initial_capital <= available_savings:
-            p["affordability_tier"] = "affordable"
-            affordable.append(p)
+            tier, bucket = "affordable", affordable
         elif initial_capital <= total_available:
-            p["affordability_tier"] = "stretch"
-            stretch.append(p)
+            tier, bucket = "stretch", stretch
         else:
-            p["affordability_tier"] = "needs_funding"
-            needs_funding.append(p)
-
-    # Sort each group by net benefit
-    for group in [affordable, stretch, needs_funding]:
-        group.sort(key=lambda x: x.get("net_benefit_k", 0), reverse=True)
-
-    # Remove yearly breakdown for compactness
-    for group in [affordable, stretch, needs_funding]:
-        for p in group:
-            p.pop("yearly_breakdown", None)
-
-    return jsonify({
-        "available_savings_usd": available_savings,
-        "monthly_side_income_usd": monthly_side_income,
-        "prep_months": prep_months,
-        "total_available_usd": total_available,
-        "aid_scenario": aid_scenario,
+            needs_funding_count += 1
+            if needs_funding_count > 20:
+                continue
+            tier, bucket = "needs_funding", needs_funding
+
+        if 1 <= initial_capital <= total_available:
+            # Fully covered: no shortfall and the percentage caps at 100
+            shortfall, pct = 0, 100
+        else:
+            shortfall = max(0, initial_capital - total_available)
+            pct = round(min(100, (total_available / max(initial_capital, 1)) * 100), 1)
+
+        bucket.append({
+            **p,
+            "initial_capital_usd": initial_capital,
+            "shortfall_usd": shortfall,
+            "affordability_pct": pct,
+            "affordability_tier": tier,
+        })
+
+    head = {
+        **funds,
         "summary": {
             "affordable_count": len(affordable),
             "stretch_count": len(stretch),
-            "needs_funding_count": len(needs_funding),
+            "needs_funding_count": needs_funding_count,
             "total_programs": len(programs),
         },
+    }
+    tiers = {
         "affordable": affordable,
         "stretch": stretch,
-        "needs_funding": needs_funding[:20],  # Limit needs_funding to top 20
-    })
+        "needs_funding": needs_funding,
+    }
+    # NDJSON: one program per line, each carrying its affordability_tier
+    stream = stream_ndjson if wants_ndjson() else stream_json_object
+    response = stream(head, tiers)
+    response.vary.add("Accept")
+    return response
 
 
 # ═══════════════════════════════════════════════════════════════════════════
@@ -1157,32 +1265,31 @@ def get_scholarships():
       - deadline_before: Filter by deadline before date (YYYY-MM-DD)
       - min_amount: Minimum scholarship amount in USD
     """
-    from query_builder import QueryBuilder
-    from datetime import datetime
 
-    min_amount, error = validate_optional_int(request.args, "min_amount")
+    args = request.args
+
+    min_amount, error = validate_optional_int(args, "min_amount")
     if error:
         return error
 
     qb = QueryBuilder("SELECT * FROM scholarships")
-    qb.add_filter("country = ?", request.args.get("country"))
-    qb.add_filter("coverage_type = ?", request.args.get("coverage_type"))
-    qb.add_filter("eligibility_nationality = ?", request.args.get("eligibility_nationality"))
-    qb.add_filter("eligibility_gre_required = ?", request.args.get("gre_required"))
-    qb.add_filter("competitiveness = ?", request.args.get("competitiveness"))
-    qb.add_filter("deadline_date <= ?", request.args.get("deadline_before"))
+    qb.add_filter("country = ?", args.get("country"))
+    qb.add_filter("coverage_type = ?", args.get("coverage_type"))
+    qb.add_filter("eligibility_nationality = ?", args.get("eligibility_nationality"))
+    qb.add_filter("eligibility_gre_required = ?", args.get("gre_required"))
+    qb.add_filter("competitiveness = ?", args.get("competitiveness"))
+    qb.add_filter("deadline_date <= ?", args.get("deadline_before"))
     qb.add_filter("amount_usd >= ?", min_amount)
     qb.order_by("deadline_date ASC, relevance_score DESC")
 
     query, params = qb.build()
 
     with get_db() as conn:
-        cursor = conn.cursor()
-        cursor.execute(query, params)
-        rows = cursor.fetchall()
-        scholarships = [dict(row) for row in rows]
+        columns, rows = fetch_rows(conn.execute(query, params))
 
-    return jsonify({"count": len(scholarships), "scholarships": scholarships})
+    # Each row becomes a dict only while it is being encoded
+    scholarships = (dict(zip(columns, row)) for row in rows)
+    return stream_json_object({"count": len(rows)}, {"scholarships": scholarships})
 
 
 @app.route("/api/scholarships/urgent", methods=["GET"])
@@ -1192,7 +1299,6 @@ def get_urgent_scholarships():
     Query params:
       - days: Number of days ahead to look (default: 60)
     """
-    from datetime import datetime, timedelta
 
     days, error = validate_optional_int(request.args, "days")
     if error:
@@ -1201,31 +1307,27 @@ def get_urgent_scholarships():
 
     deadline_cutoff = (datetime.now() + timedelta(days=days)).strftime("%Y-%m-%d")
 
+    # Urgency labels are assigned in SQL alongside days_remaining
     with get_db() as conn:
-        cursor = conn.cursor()
-        cursor.execute("""
+        scholarships = fetch_dicts(conn.execute("""
             SELECT *,
-                   julianday(deadline_date) - julianday('now') as days_remaining
-            FROM scholarships
-            WHERE deadline_date IS NOT NULL
-              AND deadline_date >= date('now')
-              AND deadline_date <= ?
+                   CASE
+                       WHEN days_remaining <= 7 THEN 'critical'
+                       WHEN days_remaining <= 30 THEN 'urgent'
+                       ELSE 'upcoming'
+                   END as urgency
+            FROM (
+                SELECT *,
+                       julianday(deadline_date) - julianday('now') as days_remaining
+                FROM scholarships
+                WHERE deadline_date IS NOT NULL
+                  AND deadline_date >= date('now')
+                  AND deadline_date <= ?
+            )
             ORDER BY deadline_date ASC
-        """, (deadline_cutoff,))
-        rows = cursor.fetchall()
-        scholarships = [dict(row) for row in rows]
-
-    # Add urgency labels
-    for s in scholarships:
-        days_left = s.get("days_remaining", 999)
-        if days_left <= 7:
-            s["urgency"] = "critical"
-        elif days_left <= 30:
-            s["urgency"] = "urgent"
-        else:
-            s["urgency"] = "upcoming"
+        """, (deadline_cutoff,)))
 
-    return jsonify({
+    return json_response({
         "count": len(scholarships),
         "deadline_cutoff": deadline_cutoff,
         "days_ahead": days,
@@ -1265,7 +1367,7 @@ def get_program_scholarships(program_id):
             JOIN scholarship_program_links spl ON s.id = spl.scholarship_id
             WHERE spl.program_id = ? OR spl.university_id = ?
         """, (program_id, uni_id))
-        linked = [dict(row) for row in cursor.fetchall()]
+        linked = fetch_dicts(cursor)
 
         # Get country-wide scholarships
         cursor.execute("""
@@ -1273,20 +1375,23 @@ def get_program_scholarships(program_id):
             FROM scholarships
             WHERE country = ? OR country = 'any' OR country = 'Europe'
         """, (country,))
-        country_wide = [dict(row) for row in cursor.fetchall()]
+        columns, country_wide = fetch_rows(cursor)
 
-        # Merge and deduplicate
+        # Merge and deduplicate; only rows that are kept become dicts
+        id_index = columns.index("id")
         seen_ids = {s["id"] for s in linked}
-        for s in country_wide:
-            if s["id"] not in seen_ids:
+        for row in country_wide:
+            if row[id_index] not in seen_ids:
+                s = dict(zip(columns, row))
                 s["applicability_notes"] = f"Country-wide: {s['country']}"
                 linked.append(s)
                 seen_ids.add(s["id"])
 
-        # Sort by relevance and deadline
-        linked.sort(key=lambda x: (-x.get("relevance_score", 0), x.get("deadline_date", "9999")))
+        # Sort by relevance, then deadline (both columns are always present;
+        # NULLs rank as no relevance / no deadline)
+        linked.sort(key=lambda x: (-(x["relevance_score"] or 0), x["deadline_date"] or "9999"))
 
-    return jsonify({
+    return json_response({
         "program_id": program_id,
         "country": country,
         "count": len(linked),
@@ -1294,7 +1399,19 @@ def get_program_scholarships(program_id):
     })
 
 
+CAREER_NETWORTH_PARAMS = [
+    LIFESTYLE,
+    FAMILY_YEAR_CAREER,
+    NODE_TYPE,
+    CAREER_SORT,
+    LEAF_ONLY,
+    COMPACT,
+    RESULT_LIMIT,
+]
+
+
 @app.route("/api/networth/career", methods=["GET"])
+@etag_cached(dataset_version)
 def get_career_networth():
     """
     Calculate 10-year net worth for all career path nodes.
@@ -1303,62 +1420,44 @@ def get_career_networth():
 
     Query params (all optional):
       - node_type: Filter by type — "career", "trading", "startup", "freelance"
-      - leaf_only: If "true" (default), only calculate for leaf nodes
+      - leaf_only: If true (default), only calculate for leaf nodes (false/0/no/off to include all)
       - lifestyle: Living cost tier — "frugal" or "comfortable" (default: frugal)
       - family_year: Calendar year for single→family transition, 1-10
           (default: 3, 11=never)
       - sort_by: Sort field — net_benefit, y1, y10, networth (default: net_benefit)
       - limit: Max results (default: all)
-      - compact: If "true", omit yearly breakdowns (default: false)
+      - compact: If true, omit yearly breakdowns (true/1/yes/on; default: false)
     """
-    from career_networth_calculator import calculate_all_career_paths
-
-    # Validate parameters
-    params, error = validate_params(request.args, [LIFESTYLE, FAMILY_YEAR_CAREER, NODE_TYPE, CAREER_SORT])
-    if error:
-        return error
 
-    limit, error = validate_optional_int(request.args, "limit")
+    params, error = validate_params(request.args, CAREER_NETWORTH_PARAMS)
     if error:
         return error
 
-    # Parse leaf_only
-    leaf_only = request.args.get("leaf_only", "true").lower() != "false"
-
+    # Compact mode skips building yearly breakdowns rather than stripping them;
+    # with a limit only the top results are selected and copied
     data = calculate_all_career_paths(
         node_type=params["node_type"],
-        leaf_only=leaf_only,
+        leaf_only=params["leaf_only"],
         lifestyle=params["lifestyle"],
         family_transition_year=params["family_year"],
+        include_breakdown=not params["compact"],
+        sort_by=params["sort_by"],
+        limit=params["limit"],
     )
+    data["summary"]["total_filtered"] = len(data["results"])
 
-    # Sort
-    results = data["results"]
-    sort_map = {
-        "net_benefit": "net_benefit_k",
-        "y1": "y1_income_k",
-        "y10": "y10_income_k",
-        "networth": "path_networth_k",
-    }
-    key = sort_map.get(params["sort_by"], "net_benefit_k")
-    results.sort(key=lambda x: x.get(key, 0), reverse=True)
-
-    # Limit
-    if limit is not None:
-        results = results[:limit]
-
-    # Compact mode — strip yearly breakdowns
-    if request.args.get("compact", "").lower() == "true":
-        for r in results:
-            r.pop("yearly_breakdown", None)
+    if wants_msgpack():
+        return msgpack_response(data)
 
-    data["results"] = results
-    data["summary"]["total_filtered"] = len(results)
-
-    return jsonify(data)
+    # Results (with yearly breakdowns unless compact) are encoded one at a time
+    head = {k: v for k, v in data.items() if k != "results"}
+    response = stream_json_object(head, {"results": data["results"]})
+    response.vary.add("Accept")
+    return response
 
 
 @app.route("/api/networth/career/<string:node_id>", methods=["GET"])
+@etag_cached(dataset_version)
 def get_career_node_networth(node_id):
     """
     Calculate 10-year net worth for a specific career node by ID.
@@ -1368,26 +1467,16 @@ def get_career_node_networth(node_id):
       - family_year: Calendar year for single→family transition, 1-10
           (default: 3, 11=never)
     """
-    from career_networth_calculator import (
-        calculate_career_node_networth,
-        calculate_career_baseline,
-    )
 
     # Validate parameters
     params, error = validate_params(request.args, [LIFESTYLE, FAMILY_YEAR_CAREER])
     if error:
         return error
 
-    with get_db() as conn:
-        cursor = conn.cursor()
-        cursor.execute("SELECT * FROM career_nodes WHERE id = ?", (node_id,))
-        row = cursor.fetchone()
-
-    if not row:
+    node = _get_career_node(node_id)
+    if node is None:
         return jsonify({"error": f"Career node '{node_id}' not found"}), 404
 
-    node = dict(row)
-
     # Check node has income data
     if not node.get("y1_income_usd") and not node.get("y10_income_usd"):
         return jsonify(
@@ -1396,19 +1485,70 @@ def get_career_node_networth(node_id):
             }
         ), 400
 
-    baseline = calculate_career_baseline(
-        lifestyle=params["lifestyle"],
-        family_transition_year=params["family_year"],
-    )
-    result = calculate_career_node_networth(
+    result = calculate_career_node_report(
         node,
-        baseline["total_networth_k"],
         lifestyle=params["lifestyle"],
         family_transition_year=params["family_year"],
     )
-    result["baseline"] = baseline
 
-    return jsonify(result)
+    return json_response(result)
+
+
+CAREER_BATCH_MAX_IDS = 100
+
+
+@app.route("/api/networth/career/batch", methods=["POST"])
+def get_career_nodes_networth_batch():
+    """
+    Net worth for several career nodes in one request.
+
+    Body (JSON): {"ids": ["node_a", "node_b", ...]} (at most CAREER_BATCH_MAX_IDS)
+    Query params: same as /api/networth/career/<node_id>
+
+    Returns one result per known node with income data, in request order,
+    and the baseline once rather than per node. Unknown ids are listed in
+    "not_found" and nodes without income data in "no_income_data".
+    """
+
+    params, error = validate_params(request.args, [LIFESTYLE, FAMILY_YEAR_CAREER])
+    if error:
+        return error
+
+    data = request.get_json(silent=True)
+    ids = data.get("ids") if isinstance(data, dict) else None
+    if not isinstance(ids, list) or not all(isinstance(i, str) for i in ids):
+        return jsonify({"error": 'Request body must be JSON: {"ids": [node ids]}'}), 400
+    if len(ids) > CAREER_BATCH_MAX_IDS:
+        return jsonify({"error": f"At most {CAREER_BATCH_MAX_IDS} ids per request"}), 400
+
+    results = []
+    not_found = []
+    no_income_data = []
+    for node_id in ids:
+        node = _get_career_node(node_id)
+        if node is None:
+            not_found.append(node_id)
+        elif not node.get("y1_income_usd") and not node.get("y10_income_usd"):
+            no_income_data.append(node_id)
+        else:
+            result = calculate_career_node_report(
+                node,
+                lifestyle=params["lifestyle"],
+                family_transition_year=params["family_year"],
+            )
+            result.pop("baseline")
+            results.append(result)
+
+    baseline = calculate_career_baseline(
+        lifestyle=params["lifestyle"], family_transition_year=params["family_year"]
+    )
+    return json_response({
+        "count": len(results),
+        "baseline": baseline,
+        "results": results,
+        "not_found": not_found,
+        "no_income_data": no_income_data,
+    })
 
 
 # ═══════════════════════════════════════════════════════════════════════════
@@ -1416,6 +1556,19 @@ def get_career_node_networth(node_id):
 # ═══════════════════════════════════════════════════════════════════════════
 
 
+# Program columns for the Pakistan return calculators
+PROGRAM_RETURN_QUERY = """
+    SELECT
+        p.id, p.program_name, p.field, p.tuition_usd,
+        p.y1_salary_usd, p.y5_salary_usd, p.y10_salary_usd,
+        p.funding_tier, p.duration_years, p.primary_market,
+        u.name as university_name, u.country
+    FROM programs p
+    JOIN universities u ON p.university_id = u.id
+    WHERE p.id = ?
+"""
+
+
 @app.route("/api/pakistan/salary-tiers", methods=["GET"])
 def get_pakistan_salary_tiers():
     """
@@ -1426,28 +1579,26 @@ def get_pakistan_salary_tiers():
       - degree_level: Filter by degree (bachelors, masters_local, masters_abroad, masters_abroad_exp)
       - city: Filter by city (Karachi, Lahore, Islamabad)
     """
-    from query_builder import QueryBuilder
+
+    args = request.args
 
     qb = QueryBuilder("SELECT * FROM pakistan_job_market")
-    qb.add_filter("employer_tier = ?", request.args.get("employer_tier"))
-    qb.add_filter("field = ?", request.args.get("field"))
-    qb.add_filter("degree_level = ?", request.args.get("degree_level"))
-    qb.add_filter("city = ?", request.args.get("city"))
+    qb.add_filter("employer_tier = ?", args.get("employer_tier"))
+    qb.add_filter("field = ?", args.get("field"))
+    qb.add_filter("degree_level = ?", args.get("degree_level"))
+    qb.add_filter("city = ?", args.get("city"))
     qb.order_by("employer_tier, field, degree_level")
 
     query, params = qb.build()
 
     with get_db() as conn:
-        cursor = conn.cursor()
-        cursor.execute(query, params)
-        rows = cursor.fetchall()
-        salaries = [dict(row) for row in rows]
+        salaries = fetch_dicts(conn.execute(query, params))
 
     # Also return tier descriptions
     from pakistan_return_calculator import get_all_employer_tiers
     tiers = get_all_employer_tiers()
 
-    return jsonify({
+    return json_response({
         "count": len(salaries),
         "salaries": salaries,
         "employer_tiers": tiers,
@@ -1466,19 +1617,8 @@ def get_pakistan_return_networth(program_id):
       - family_year: Family transition year 1-13 (default: 5)
     """
     from pakistan_return_calculator import calculate_pakistan_return_networth
-    from validators import ParamValidator
-
-    # Validate employer_tier
-    tier_validator = ParamValidator(
-        name="employer_tier",
-        param_type=str,
-        default="tier2_tech_company",
-        valid_values={
-            "tier1_multinational", "tier2_tech_company", "tier3_startup_scale",
-            "tier4_local_sme", "consulting_finance", "remote_foreign"
-        },
-    )
-    params, error = validate_params(request.args, [LIFESTYLE, FAMILY_YEAR_MASTERS, tier_validator])
+
+    params, error = validate_params(request.args, [LIFESTYLE, FAMILY_YEAR_MASTERS, EMPLOYER_TIER])
     if error:
         return error
 
@@ -1493,23 +1633,11 @@ def get_pakistan_return_networth(program_id):
 
     # Get program
     with get_db() as conn:
-        cursor = conn.cursor()
-        cursor.execute("""
-            SELECT
-                p.id, p.program_name, p.field, p.tuition_usd,
-                p.y1_salary_usd, p.y5_salary_usd, p.y10_salary_usd,
-                p.funding_tier, p.duration_years, p.primary_market,
-                u.name as university_name, u.country
-            FROM programs p
-            JOIN universities u ON p.university_id = u.id
-            WHERE p.id = ?
-        """, (program_id,))
-        row = cursor.fetchone()
+        program = fetch_one(conn, PROGRAM_RETURN_QUERY, (program_id,))
 
-    if not row:
+    if program is None:
         return jsonify({"error": "Program not found"}), 404
 
-    program = dict(row)
     result = calculate_pakistan_return_networth(
         program,
         employer_tier=params["employer_tier"],
@@ -1518,7 +1646,7 @@ def get_pakistan_return_networth(program_id):
         family_transition_year=params["family_year"] or 5,
     )
 
-    return jsonify(result)
+    return json_response(result)
 
 
 @app.route("/api/compare/abroad-vs-return/<int:program_id>", methods=["GET"])
@@ -1533,40 +1661,18 @@ def compare_abroad_vs_return(program_id):
       - family_year: Family transition year 1-13 (default: 5)
     """
     from pakistan_return_calculator import compare_abroad_vs_return as _compare
-    from validators import ParamValidator
-
-    tier_validator = ParamValidator(
-        name="employer_tier",
-        param_type=str,
-        default="tier2_tech_company",
-        valid_values={
-            "tier1_multinational", "tier2_tech_company", "tier3_startup_scale",
-            "tier4_local_sme", "consulting_finance", "remote_foreign"
-        },
-    )
-    params, error = validate_params(request.args, [LIFESTYLE, FAMILY_YEAR_MASTERS, tier_validator])
+
+    params, error = validate_params(request.args, [LIFESTYLE, FAMILY_YEAR_MASTERS, EMPLOYER_TIER])
     if error:
         return error
 
     # Get program
     with get_db() as conn:
-        cursor = conn.cursor()
-        cursor.execute("""
-            SELECT
-                p.id, p.program_name, p.field, p.tuition_usd,
-                p.y1_salary_usd, p.y5_salary_usd, p.y10_salary_usd,
-                p.funding_tier, p.duration_years, p.primary_market,
-                u.name as university_name, u.country
-            FROM programs p
-            JOIN universities u ON p.university_id = u.id
-            WHERE p.id = ?
-        """, (program_id,))
-        row = cursor.fetchone()
+        program = fetch_one(conn, PROGRAM_RETURN_QUERY, (program_id,))
 
-    if not row:
+    if program is None:
         return jsonify({"error": "Program not found"}), 404
 
-    program = dict(row)
     result = _compare(
         program,
         employer_tier=params["employer_tier"],
@@ -1574,7 +1680,7 @@ def compare_abroad_vs_return(program_id):
         family_transition_year=params["family_year"] or 5,
     )
 
-    return jsonify(result)
+    return json_response(result)
 
 
 # ═══════════════════════════════════════════════════════════════════════════
@@ -1582,6 +1688,9 @@ def compare_abroad_vs_return(program_id):
 # ═══════════════════════════════════════════════════════════════════════════
 
 
+ECOSYSTEM_PARAMS = [MIN_STARTUP_STRENGTH, HAS_ENTREPRENEUR_VISA]
+
+
 @app.route("/api/ecosystems", methods=["GET"])
 def get_ecosystems():
     """
@@ -1589,28 +1698,20 @@ def get_ecosystems():
     Query params (all optional):
       - country: Filter by country
       - min_startup_strength: Minimum startup ecosystem strength (e.g., 1.0)
-      - has_entrepreneur_visa: If "true", only cities with entrepreneur visa paths
+      - has_entrepreneur_visa: true/false to keep only cities with/without an entrepreneur visa path
     """
-    from location_ecosystem import list_ecosystems
-
-    min_strength = None
-    if request.args.get("min_startup_strength"):
-        try:
-            min_strength = float(request.args.get("min_startup_strength"))
-        except ValueError:
-            return jsonify({"error": "min_startup_strength must be a number"}), 400
 
-    has_visa = None
-    if request.args.get("has_entrepreneur_visa"):
-        has_visa = request.args.get("has_entrepreneur_visa").lower() == "true"
+    params, error = validate_params(request.args, ECOSYSTEM_PARAMS)
+    if error:
+        return error
 
     ecosystems = list_ecosystems(
         country=request.args.get("country"),
-        min_startup_strength=min_strength,
-        has_entrepreneur_visa=has_visa,
+        min_startup_strength=params["min_startup_strength"],
+        has_entrepreneur_visa=params["has_entrepreneur_visa"],
     )
 
-    return jsonify({
+    return json_response({
         "count": len(ecosystems),
         "ecosystems": [
             {
@@ -1640,7 +1741,6 @@ def get_ecosystem_by_city(city):
     Query param:
       - country: Optional country to disambiguate (e.g., Sydney in Australia vs Canada)
     """
-    from location_ecosystem import get_ecosystem
 
     country = request.args.get("country")
     ecosystem = get_ecosystem(city, country)
@@ -1648,7 +1748,7 @@ def get_ecosystem_by_city(city):
     if ecosystem.city == "Unknown":
         return jsonify({"error": f"Ecosystem not found for city: {city}"}), 404
 
-    return jsonify({
+    return json_response({
         "city": ecosystem.city,
         "country": ecosystem.country,
         "startup_ecosystem_strength": ecosystem.startup_ecosystem_strength,
@@ -1673,33 +1773,18 @@ def get_postmasters_nodes():
       - node_type: Filter by type (employment, startup, remote, return, terminal)
       - phase: Filter by phase (0-3)
     """
-    import json as json_module
-
-    with get_db() as conn:
-        cursor = conn.cursor()
-
-        query = "SELECT * FROM postmasters_nodes WHERE 1=1"
-        params = []
-
-        if request.args.get("node_type"):
-            query += " AND node_type = ?"
-            params.append(request.args.get("node_type"))
+    phase = request.args.get("phase")
 
-        if request.args.get("phase"):
-            query += " AND phase = ?"
-            params.append(int(request.args.get("phase")))
-
-        query += " ORDER BY phase, id"
-        cursor.execute(query, params)
-        rows = cursor.fetchall()
+    qb = QueryBuilder(f"SELECT *, {NODE_CHILDREN_SQL} FROM postmasters_nodes")
+    qb.add_filter("node_type = ?", request.args.get("node_type"))
+    qb.add_filter("phase = ?", int(phase) if phase else None)
+    qb.order_by("phase, id")
+    query, params = qb.build()
 
-        nodes = []
-        for row in rows:
-            node = dict(row)
-            node["children"] = json_module.loads(node.get("children") or "[]")
-            nodes.append(node)
+    with get_db() as conn:
+        rows = fetch_dicts(conn.execute(query, params))
 
-    return jsonify({"count": len(nodes), "nodes": nodes})
+    return _nodes_response(rows)
 
 
 @app.route("/api/postmasters/edges", methods=["GET"])
@@ -1711,44 +1796,36 @@ def get_postmasters_edges():
       - calibrated: If "true", apply profile + ecosystem calibration
       - city: City for ecosystem-based calibration (required if calibrated=true)
     """
-    with get_db() as conn:
-        cursor = conn.cursor()
 
-        if request.args.get("calibrated", "").lower() == "true":
-            from profile_calibrator import calibrate_postmasters_edges, get_profile
-            from location_ecosystem import get_ecosystem
+    args = request.args
 
-            city = request.args.get("city")
+    with get_db() as conn:
+        if args.get("calibrated", "").lower() == "true":
+            city = args.get("city")
             ecosystem = get_ecosystem(city) if city else None
 
-            profile = get_profile(conn)
+            profile = _cached_profile(conn)
             edges = calibrate_postmasters_edges(
-                profile=profile, ecosystem=ecosystem, conn=conn
+                profile=profile,
+                ecosystem=ecosystem,
+                conn=conn,
+                source_id=args.get("source_id"),
             )
 
-            if request.args.get("source_id"):
-                edges = [e for e in edges if e["source_id"] == request.args.get("source_id")]
-
-            return jsonify({
+            return json_response({
                 "count": len(edges),
                 "edges": edges,
                 "calibrated": True,
                 "ecosystem_city": city,
             })
 
-        query = "SELECT * FROM postmasters_edges WHERE 1=1"
-        params = []
-
-        if request.args.get("source_id"):
-            query += " AND source_id = ?"
-            params.append(request.args.get("source_id"))
-
-        query += " ORDER BY source_id, target_id"
-        cursor.execute(query, params)
-        rows = cursor.fetchall()
-        edges = [dict(row) for row in rows]
+        qb = QueryBuilder("SELECT * FROM postmasters_edges")
+        qb.add_filter("source_id = ?", args.get("source_id"))
+        qb.order_by("source_id, target_id")
+        query, params = qb.build()
+        edges = fetch_dicts(conn.execute(query, params))
 
-    return jsonify({"count": len(edges), "edges": edges})
+    return json_response({"count": len(edges), "edges": edges})
 
 
 @app.route("/api/programs/<int:program_id>/postmasters", methods=["GET"])
@@ -1762,30 +1839,27 @@ def get_program_postmasters_paths(program_id):
     Query params:
       - calibrated: If "true", apply profile + location calibration (default: true)
     """
-    import json as json_module
-    from location_ecosystem import get_ecosystem, get_ecosystem_by_country
-    from market_mapping import get_market_info
-    from profile_calibrator import calibrate_postmasters_edges, get_profile
 
     with get_db() as conn:
         cursor = conn.cursor()
 
         # Get program
-        cursor.execute("""
+        program = fetch_one(
+            conn,
+            """
             SELECT
                 p.id, p.program_name, p.primary_market,
                 u.name as university_name, u.country
             FROM programs p
             JOIN universities u ON p.university_id = u.id
             WHERE p.id = ?
-        """, (program_id,))
-        row = cursor.fetchone()
+        """,
+            (program_id,),
+        )
 
-        if not row:
+        if program is None:
             return jsonify({"error": "Program not found"}), 404
 
-        program = dict(row)
-
         # Determine ecosystem
         primary_market = program.get("primary_market") or ""
         uni_country = program.get("country") or "USA"
@@ -1795,30 +1869,26 @@ def get_program_postmasters_paths(program_id):
         if ecosystem is None or ecosystem.city == "Unknown":
             ecosystem = get_ecosystem_by_country(market_info.work_country)
 
-        # Get all nodes
-        cursor.execute("SELECT * FROM postmasters_nodes ORDER BY phase, id")
-        node_rows = cursor.fetchall()
-        nodes = []
-        for nr in node_rows:
-            node = dict(nr)
-            node["children"] = json_module.loads(node.get("children") or "[]")
-            nodes.append(node)
+        # Get all nodes; stored children JSON is spliced in verbatim
+        cursor.execute(
+            f"SELECT *, {NODE_CHILDREN_SQL} FROM postmasters_nodes ORDER BY phase, id"
+        )
+        nodes = b"[" + b",".join(_node_to_json(row) for row in fetch_dicts(cursor)) + b"]"
 
         # Get calibrated edges if requested
         calibrated = request.args.get("calibrated", "true").lower() != "false"
         if calibrated:
-            profile = get_profile(conn)
+            profile = _cached_profile(conn)
             edges = calibrate_postmasters_edges(
                 profile=profile, ecosystem=ecosystem, conn=conn
             )
         else:
             cursor.execute("SELECT * FROM postmasters_edges ORDER BY source_id, target_id")
-            edge_rows = cursor.fetchall()
-            edges = [dict(er) for er in edge_rows]
+            edges = fetch_dicts(cursor)
             for e in edges:
                 e["calibrated_probability"] = e["base_probability"]
 
-    return jsonify({
+    return raw_json_response(dumps_spliced({
         "program_id": program_id,
         "program_name": program["program_name"],
         "university": program["university_name"],
@@ -1832,9 +1902,23 @@ def get_program_postmasters_paths(program_id):
             "entrepreneur_visa_available": ecosystem.entrepreneur_visa_available if ecosystem else False,
         },
         "calibrated": calibrated,
-        "nodes": nodes,
         "edges": edges,
-    })
+    }, {"nodes": nodes}))
+
+
+# Program columns for the per-program post-masters endpoints
+PROGRAM_POSTMASTERS_QUERY = """
+    SELECT
+        p.id, p.program_name, p.tuition_usd,
+        p.y1_salary_usd, p.y5_salary_usd, p.y10_salary_usd,
+        p.duration_years, p.primary_market,
+        p.expected_aid_usd, p.best_case_aid_usd, p.coop_earnings_usd,
+        p.aid_type,
+        u.name as university_name, u.country
+    FROM programs p
+    JOIN universities u ON p.university_id = u.id
+    WHERE p.id = ?
+"""
 
 
 @app.route("/api/networth/<int:program_id>/path/<path:path_id>", methods=["GET"])
@@ -1850,9 +1934,6 @@ def get_path_networth(program_id, path_id):
       - family_year: Calendar year for family transition (default: 5)
       - aid_scenario: "no_aid", "expected", or "best_case" (default: no_aid)
     """
-    from postmasters_calculator import calculate_postmasters_path_networth
-    from location_ecosystem import get_ecosystem, get_ecosystem_by_country
-    from market_mapping import get_market_info
 
     # Parse path from URL
     path = [p.strip() for p in path_id.split(",") if p.strip()]
@@ -1869,26 +1950,11 @@ def get_path_networth(program_id, path_id):
 
     # Get program
     with get_db() as conn:
-        cursor = conn.cursor()
-        cursor.execute("""
-            SELECT
-                p.id, p.program_name, p.tuition_usd,
-                p.y1_salary_usd, p.y5_salary_usd, p.y10_salary_usd,
-                p.duration_years, p.primary_market,
-                p.expected_aid_usd, p.best_case_aid_usd, p.coop_earnings_usd,
-                p.aid_type,
-                u.name as university_name, u.country
-            FROM programs p
-            JOIN universities u ON p.university_id = u.id
-            WHERE p.id = ?
-        """, (program_id,))
-        row = cursor.fetchone()
+        program = fetch_one(conn, PROGRAM_POSTMASTERS_QUERY, (program_id,))
 
-    if not row:
+    if program is None:
         return jsonify({"error": "Program not found"}), 404
 
-    program = dict(row)
-
     # Get ecosystem
     primary_market = program.get("primary_market") or ""
     uni_country = program.get("country") or "USA"
@@ -1911,7 +1977,7 @@ def get_path_networth(program_id, path_id):
     result["program_name"] = program["program_name"]
     result["university"] = program["university_name"]
 
-    return jsonify(result)
+    return json_response(result)
 
 
 @app.route("/api/networth/<int:program_id>/expected", methods=["GET"])
@@ -1927,9 +1993,6 @@ def get_expected_networth(program_id):
       - family_year: Calendar year for family transition (default: 5)
       - aid_scenario: "no_aid", "expected", or "best_case" (default: no_aid)
     """
-    from postmasters_calculator import calculate_expected_networth
-    from location_ecosystem import get_ecosystem, get_ecosystem_by_country
-    from market_mapping import get_market_info
 
     # Validate params
     params, error = validate_params(
@@ -1941,26 +2004,11 @@ def get_expected_networth(program_id):
 
     # Get program
     with get_db() as conn:
-        cursor = conn.cursor()
-        cursor.execute("""
-            SELECT
-                p.id, p.program_name, p.tuition_usd,
-                p.y1_salary_usd, p.y5_salary_usd, p.y10_salary_usd,
-                p.duration_years, p.primary_market,
-                p.expected_aid_usd, p.best_case_aid_usd, p.coop_earnings_usd,
-                p.aid_type,
-                u.name as university_name, u.country
-            FROM programs p
-            JOIN universities u ON p.university_id = u.id
-            WHERE p.id = ?
-        """, (program_id,))
-        row = cursor.fetchone()
+        program = fetch_one(conn, PROGRAM_POSTMASTERS_QUERY, (program_id,))
 
-    if not row:
+    if program is None:
         return jsonify({"error": "Program not found"}), 404
 
-    program = dict(row)
-
     # Get ecosystem
     primary_market = program.get("primary_market") or ""
     uni_country = program.get("country") or "USA"
@@ -1981,7 +2029,7 @@ def get_expected_networth(program_id):
     result["program_name"] = program["program_name"]
     result["university"] = program["university_name"]
 
-    return jsonify(result)
+    return json_response(result)
 
 
 @app.route("/api/programs/<int:program_id>/ecosystem-comparison", methods=["GET"])
@@ -1996,37 +2044,27 @@ def get_program_ecosystem_comparison(program_id):
       - lifestyle: "frugal" or "comfortable" (default: frugal)
       - cities: Comma-separated list of cities to compare (optional, uses defaults)
     """
-    from postmasters_calculator import compare_program_ecosystems
+
+    args = request.args
+
+    # Validate before touching the database
+    params, error = validate_params(args, [LIFESTYLE])
+    if error:
+        return error
+    lifestyle = params["lifestyle"]
 
     # Get program
     with get_db() as conn:
-        cursor = conn.cursor()
-        cursor.execute("""
-            SELECT
-                p.id, p.program_name, p.tuition_usd,
-                p.y1_salary_usd, p.y5_salary_usd, p.y10_salary_usd,
-                p.duration_years, p.primary_market,
-                p.expected_aid_usd, p.best_case_aid_usd, p.coop_earnings_usd,
-                p.aid_type,
-                u.name as university_name, u.country
-            FROM programs p
-            JOIN universities u ON p.university_id = u.id
-            WHERE p.id = ?
-        """, (program_id,))
-        row = cursor.fetchone()
+        program = fetch_one(conn, PROGRAM_POSTMASTERS_QUERY, (program_id,))
 
-    if not row:
+    if program is None:
         return jsonify({"error": "Program not found"}), 404
 
-    program = dict(row)
-
-    lifestyle = request.args.get("lifestyle", "frugal")
-    if lifestyle not in ("frugal", "comfortable"):
-        return jsonify({"error": "lifestyle must be 'frugal' or 'comfortable'"}), 400
-
-    cities = None
-    if request.args.get("cities"):
-        cities = [c.strip() for c in request.args.get("cities").split(",") if c.strip()]
+    cities = args.get("cities")
+    if cities:
+        cities = [c.strip() for c in cities.split(",") if c.strip()]
+    else:
+        cities = None
 
     results = compare_program_ecosystems(
         program=program,
@@ -2034,7 +2072,7 @@ def get_program_ecosystem_comparison(program_id):
         lifestyle=lifestyle,
     )
 
-    return jsonify({
+    return json_response({
         "program_id": program_id,
         "program_name": program["program_name"],
         "university": program["university_name"],
@@ -2044,50 +2082,61 @@ def get_program_ecosystem_comparison(program_id):
 
 
 if __name__ == "__main__":
-    print("🚀 Starting Career Tree API...")
-    print("📍 API will be available at: http://localhost:5000")
-    print("\n📚 Core Endpoints:")
-    print("   GET  /api/health")
-    print("   GET  /api/programs")
-    print("   GET  /api/programs?gre_required=not_required,waivable&ielts_max=7.0")
-    print("   GET  /api/programs/<id>")
-    print("   GET  /api/programs/<id>/full  (with visa, QoL, immigration data)")
-    print("   GET  /api/programs/<id>/scholarships  (applicable scholarships)")
-    print("   GET  /api/universities")
-    print("   GET  /api/stats")
-    print("   GET  /api/search?q=<query>")
-    print("\n💰 Net Worth & Financial:")
-    print("   GET  /api/networth")
-    print("   GET  /api/networth?aid_scenario=expected&field=AI/ML&compact=true")
-    print("   GET  /api/networth/<program_id>")
-    print("   GET  /api/networth/<program_id>/compare  (all 3 aid scenarios)")
-    print("   GET  /api/networth/<program_id>/pakistan-return?return_after_years=2")
-    print("   GET  /api/compare/abroad-vs-return/<program_id>")
-    print("   GET  /api/affordability")
-    print("   GET  /api/networth/career")
-    print("   GET  /api/networth/career/<node_id>")
-    print("\n🎓 Scholarships:")
-    print("   GET  /api/scholarships")
-    print("   GET  /api/scholarships?coverage_type=full_funding&gre_required=not_required")
-    print("   GET  /api/scholarships/urgent  (deadlines in next 60 days)")
-    print("\n🇵🇰 Pakistan Return Model:")
-    print("   GET  /api/pakistan/salary-tiers")
-    print("   GET  /api/pakistan/salary-tiers?employer_tier=tier1_multinational")
-    print("\n🛂 Visa & Immigration:")
-    print("   GET  /api/visa-rates")
-    print("   GET  /api/visa-rates/<country>/<nationality>")
-    print("   GET  /api/immigration/<country>")
-    print("   GET  /api/immigration")
-    print("\n🌍 Quality of Life:")
-    print("   GET  /api/qol/<city>")
-    print("   GET  /api/qol")
-    print("   GET  /api/industry-hubs/<city>")
-    print("   GET  /api/industry-hubs")
-    print("\n👤 Profile & Calibration:")
-    print("   GET  /api/profile")
-    print("   PUT  /api/profile")
-    print("   GET  /api/calibration-summary")
-    print("   GET  /api/edges?calibrated=true")
-    print("\n🔗 Test: http://localhost:5000/api/scholarships/urgent\n")
-
-    app.run(debug=True, host="0.0.0.0", port=5000)
+    # One write for the whole banner
+    print("\n".join([
+        "🚀 Starting Career Tree API...",
+        "📍 API will be available at: http://localhost:5000",
+        "\n📚 Core Endpoints:",
+        "   GET  /api/health",
+        "   GET  /api/programs",
+        "   GET  /api/programs?gre_required=not_required,waivable&ielts_max=7.0",
+        "   GET  /api/programs/<id>",
+        "   GET  /api/programs/<id>/full  (with visa, QoL, immigration data)",
+        "   GET  /api/programs/<id>/scholarships  (applicable scholarships)",
+        "   GET  /api/universities",
+        "   GET  /api/stats",
+        "   GET  /api/search?q=<query>",
+        "\n💰 Net Worth & Financial:",
+        "   GET  /api/networth",
+        "   GET  /api/networth?aid_scenario=expected&field=AI/ML&compact=true",
+        "   GET  /api/networth/<program_id>",
+        "   GET  /api/networth/<program_id>/compare  (all 3 aid scenarios)",
+        "   GET  /api/networth/<program_id>/pakistan-return?return_after_years=2",
+        "   GET  /api/compare/abroad-vs-return/<program_id>",
+        "   GET  /api/affordability",
+        "   GET  /api/networth/career",
+        "   GET  /api/networth/career/<node_id>",
+        "   POST /api/networth/career/batch",
+        "\n🎓 Scholarships:",
+        "   GET  /api/scholarships",
+        "   GET  /api/scholarships?coverage_type=full_funding&gre_required=not_required",
+        "   GET  /api/scholarships/urgent  (deadlines in next 60 days)",
+        "\n🇵🇰 Pakistan Return Model:",
+        "   GET  /api/pakistan/salary-tiers",
+        "   GET  /api/pakistan/salary-tiers?employer_tier=tier1_multinational",
+        "\n🛂 Visa & Immigration:",
+        "   GET  /api/visa-rates",
+        "   GET  /api/visa-rates/<country>/<nationality>",
+        "   GET  /api/immigration/<country>",
+        "   GET  /api/immigration",
+        "\n🌍 Quality of Life:",
+        "   GET  /api/qol/<city>",
+        "   GET  /api/qol",
+        "   GET  /api/industry-hubs/<city>",
+        "   GET  /api/industry-hubs",
+        "\n👤 Profile & Calibration:",
+        "   GET  /api/profile",
+        "   PUT  /api/profile",
+        "   GET  /api/calibration-summary",
+        "   GET  /api/edges?calibrated=true",
+        "\n🔗 Test: http://localhost:5000/api/scholarships/urgent\n",
+    ]))
+
+    # Development server only; see README "Production" for gunicorn.
+    # The debugger allows code execution, so it is opt-in via FLASK_DEBUG=1.
+    app.run(
+        debug=os.environ.get("FLASK_DEBUG") == "1",
+        host="0.0.0.0",
+        port=5000,
+        threaded=True,
+    )
@@ -6,6 +6,7 @@ Common functions used by both the masters program calculator
 (career_networth_calculator.py).
 """
 
+from functools import lru_cache
 from typing import Optional
 
 from config import BASELINE_ANNUAL_SALARY_USD_K, BASELINE_ANNUAL_GROWTH
@@ -85,7 +86,8 @@ def calculate_pakistan_baseline(
             Defaults to default_family_year if not provided.
 
     Returns:
-        Dict with total_networth_k and yearly_breakdown.
+        Dict with total_networth_k and yearly_breakdown. Results are memoized
+        per resolved argument tuple; each call returns fresh dicts.
     """
     if baseline_salary is None:
         baseline_salary = BASELINE_ANNUAL_SALARY_USD_K
@@ -94,10 +96,40 @@ def calculate_pakistan_baseline(
     if family_transition_year is None:
         family_transition_year = default_family_year
 
+    total, yearly = _pakistan_baseline_cached(
+        total_years,
+        year_key,
+        baseline_salary,
+        baseline_growth,
+        lifestyle,
+        family_transition_year,
+    )
+    return {
+        "total_networth_k": total,
+        "yearly_breakdown": [dict(entry) for entry in yearly],
+    }
+
+
+@lru_cache(maxsize=256)
+def _pakistan_baseline_cached(
+    total_years: int,
+    year_key: str,
+    baseline_salary: float,
+    baseline_growth: float,
+    lifestyle: str,
+    family_transition_year: int,
+):
+    """Memoized body of calculate_pakistan_baseline(); returns (total, yearly)."""
     yearly = []
     total = 0.0
     salary = baseline_salary
 
+    # Living cost only varies by household type, so look each up once
+    living_costs = {
+        household: get_pakistan_living_cost(household, lifestyle=lifestyle)
+        for household in ("single", "family")
+    }
+
     for yr in range(1, total_years + 1):
         household = "single" if yr < family_transition_year else "family"
 
@@ -105,7 +137,7 @@ def calculate_pakistan_baseline(
         after_tax = calculate_annual_tax(salary, "Pakistan")
 
         # Pakistan living costs
-        living_cost = get_pakistan_living_cost(household, lifestyle=lifestyle)
+        living_cost = living_costs[household]
 
         annual_savings = after_tax - living_cost
         total += annual_savings
@@ -124,7 +156,4 @@ def calculate_pakistan_baseline(
 
         salary *= 1 + baseline_growth
 
-    return {
-        "total_networth_k": round(total, 2),
-        "yearly_breakdown": yearly,
-    }
+    return round(total, 2), tuple(yearly)
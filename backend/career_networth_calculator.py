@@ -24,10 +24,14 @@ All values in $K USD unless otherwise noted.
 """
 
 import sqlite3
+from collections import defaultdict
+from functools import lru_cache
+from operator import itemgetter
 from typing import Optional
 
 from config import (
     DB_PATH,
+    fetch_dicts,
     get_db,
     BASELINE_ANNUAL_SALARY_USD_K,
     BASELINE_ANNUAL_GROWTH,
@@ -41,6 +45,7 @@ from calculator_common import (
 )
 from tax_data import calculate_annual_tax
 from living_costs import get_pakistan_living_cost
+from query_builder import QueryBuilder
 
 # ─── Configuration ───────────────────────────────────────────────────────────
 # Constants imported from config.py for consistency:
@@ -51,6 +56,21 @@ from living_costs import get_pakistan_living_cost
 FAMILY_TRANSITION_YEAR = CAREER_DEFAULT_FAMILY_YEAR
 TOTAL_YEARS = CAREER_TOTAL_YEARS
 
+# career_nodes columns read by calculate_career_node_networth; selecting only
+# these skips the children JSON and display-only columns
+NODE_NETWORTH_COLUMNS = (
+    "id, phase, label, note, node_type, income_floor_usd, income_ceiling_usd, "
+    "initial_capital_usd, ongoing_cost_usd, y1_income_usd, y5_income_usd, y10_income_usd"
+)
+
+# sort_by values accepted by calculate_all_career_paths -> result field
+CAREER_SORT_KEYS = {
+    "net_benefit": "net_benefit_k",
+    "y1": "y1_income_k",
+    "y10": "y10_income_k",
+    "networth": "path_networth_k",
+}
+
 
 # ─── Core Calculation Functions ──────────────────────────────────────────────
 
@@ -93,6 +113,7 @@ def calculate_career_node_networth(
     baseline_growth: Optional[float] = None,
     lifestyle: str = "frugal",
     family_transition_year: Optional[int] = None,
+    include_breakdown: bool = True,
 ) -> dict:
     """
     Calculate 10-year net worth for a specific career node.
@@ -111,6 +132,7 @@ def calculate_career_node_networth(
         lifestyle: "frugal" or "comfortable" living cost tier.
         family_transition_year: Calendar year when household transitions to family
             (1-10, or 11 for never). Default: FAMILY_TRANSITION_YEAR (3).
+        include_breakdown: If False, omit "yearly_breakdown" and skip building it.
 
     Returns:
         Dict with net worth breakdown, comparison to baseline, and yearly details.
@@ -135,6 +157,12 @@ def calculate_career_node_networth(
     yearly = []
     total_work_savings = 0.0
 
+    # Living cost only varies by household type, so look each up once
+    living_costs = {
+        household: get_pakistan_living_cost(household, lifestyle=lifestyle)
+        for household in ("single", "family")
+    }
+
     for work_yr in range(1, TOTAL_YEARS + 1):
         # Interpolate income for this year
         gross = interpolate_salary(y1_income, y5_income, y10_income, work_yr)
@@ -144,23 +172,24 @@ def calculate_career_node_networth(
 
         # Household type and living cost
         household = "single" if work_yr < family_transition_year else "family"
-        living_cost = get_pakistan_living_cost(household, lifestyle=lifestyle)
+        living_cost = living_costs[household]
 
         # Annual savings = after-tax income - living costs - ongoing costs
         annual_savings = after_tax - living_cost - ongoing_annual_k
         total_work_savings += annual_savings
 
-        yearly.append(
-            {
-                "year": work_yr,
-                "gross_income_k": round(gross, 2),
-                "after_tax_k": round(after_tax, 2),
-                "living_cost_k": round(living_cost, 2),
-                "ongoing_cost_k": round(ongoing_annual_k, 2),
-                "household": household,
-                "annual_savings_k": round(annual_savings, 2),
-            }
-        )
+        if include_breakdown:
+            yearly.append(
+                {
+                    "year": work_yr,
+                    "gross_income_k": round(gross, 2),
+                    "after_tax_k": round(after_tax, 2),
+                    "living_cost_k": round(living_cost, 2),
+                    "ongoing_cost_k": round(ongoing_annual_k, 2),
+                    "household": household,
+                    "annual_savings_k": round(annual_savings, 2),
+                }
+            )
 
     # ── Net worth calculation ────────────────────────────────────────────
     path_networth = total_work_savings - initial_capital
@@ -196,7 +225,7 @@ def calculate_career_node_networth(
         else 0
     )
 
-    return {
+    result = {
         "node_id": node.get("id"),
         "label": node.get("label", ""),
         "node_type": node.get("node_type", ""),
@@ -220,9 +249,71 @@ def calculate_career_node_networth(
         # Tax info
         "effective_tax_rate_y1": round(eff_tax_y1, 4),
         "effective_tax_rate_y10": round(eff_tax_y10, 4),
-        # Yearly breakdown
-        "yearly_breakdown": yearly,
     }
+    if include_breakdown:
+        result["yearly_breakdown"] = yearly
+    return result
+
+
+def get_career_node(node_id: str) -> Optional[dict]:
+    """
+    Look up a career node's NODE_NETWORTH_COLUMNS by id, or None if absent.
+
+    Served from an in-memory index loaded on first use (career_nodes only
+    changes on re-import; clear_cache() drops it). Returns a copy.
+    """
+    node = _career_nodes_by_id().get(node_id)
+    return dict(node) if node is not None else None
+
+
+@lru_cache(maxsize=1)
+def _career_nodes_by_id() -> dict:
+    """All career nodes keyed by id (net worth columns only)."""
+    with get_db() as conn:
+        cursor = conn.cursor()
+        cursor.execute(f"SELECT {NODE_NETWORTH_COLUMNS} FROM career_nodes")
+        return {node["id"]: node for node in fetch_dicts(cursor)}
+
+
+def calculate_career_node_report(
+    node: dict,
+    lifestyle: str = "frugal",
+    family_transition_year: Optional[int] = None,
+) -> dict:
+    """
+    Net worth for one career node with its "baseline" attached, as served by
+    /api/networth/career/<node_id>.
+
+    Memoized per (node contents, lifestyle, family_transition_year); there
+    are a few hundred nodes and a couple of dozen parameter combinations.
+    Returns a fresh top-level dict; nested values are shared and must not
+    be mutated.
+    """
+    if family_transition_year is None:
+        family_transition_year = FAMILY_TRANSITION_YEAR
+    return dict(
+        _career_node_report_cached(
+            tuple(node.items()), lifestyle, family_transition_year
+        )
+    )
+
+
+@lru_cache(maxsize=4096)
+def _career_node_report_cached(
+    node_items: tuple, lifestyle: str, family_transition_year: int
+) -> dict:
+    """Memoized body of calculate_career_node_report(); node as an items tuple."""
+    baseline = calculate_career_baseline(
+        lifestyle=lifestyle, family_transition_year=family_transition_year
+    )
+    result = calculate_career_node_networth(
+        dict(node_items),
+        baseline["total_networth_k"],
+        lifestyle=lifestyle,
+        family_transition_year=family_transition_year,
+    )
+    result["baseline"] = baseline
+    return result
 
 
 def calculate_all_career_paths(
@@ -232,10 +323,18 @@ def calculate_all_career_paths(
     baseline_growth: Optional[float] = None,
     lifestyle: str = "frugal",
     family_transition_year: Optional[int] = None,
+    include_breakdown: bool = True,
+    sort_by: str = "net_benefit",
+    limit: Optional[int] = None,
 ) -> dict:
     """
     Calculate net worth for all career path nodes (or filtered subset).
 
+    Results are memoized per parameter tuple, as in
+    networth_calculator.calculate_all_programs(). Each call returns fresh
+    top-level, summary and per-result dicts; nested lists such as
+    yearly_breakdown are shared and must not be mutated.
+
     Args:
         node_type: Filter by node_type ("career", "trading", "startup", "freelance").
             None = all non-masters paths.
@@ -245,6 +344,11 @@ def calculate_all_career_paths(
         baseline_growth: Override for baseline annual growth rate.
         lifestyle: "frugal" or "comfortable" living cost tier.
         family_transition_year: Calendar year for single→family transition.
+        include_breakdown: If False, results carry no "yearly_breakdown".
+        sort_by: Descending sort key for results, one of CAREER_SORT_KEYS
+            (default: "net_benefit").
+        limit: Keep only the top `limit` results; only those are copied.
+            Summary statistics always cover every result.
 
     Returns:
         Dict with baseline, assumptions, results list, and summary statistics.
@@ -256,20 +360,60 @@ def calculate_all_career_paths(
     if family_transition_year is None:
         family_transition_year = FAMILY_TRANSITION_YEAR
 
-    with get_db() as conn:
-        cursor = conn.cursor()
+    data, rankings = _calculate_all_career_paths_cached(
+        node_type,
+        leaf_only,
+        baseline_salary,
+        baseline_growth,
+        lifestyle,
+        family_transition_year,
+        include_breakdown,
+    )
+    results = rankings.get(sort_by, rankings["net_benefit"])
+    if limit is not None:
+        results = results[: max(limit, 0)]
+
+    return {
+        **data,
+        "assumptions": dict(data["assumptions"]),
+        "results": [dict(r) for r in results],
+        "summary": dict(data["summary"]),
+    }
 
-        # Get all career nodes (non-masters)
-        query = "SELECT * FROM career_nodes WHERE 1=1"
-        params = []
 
-        if node_type:
-            query += " AND node_type = ?"
-            params.append(node_type)
+def clear_cache():
+    """Drop memoized career path and node results (e.g. after a data re-import)."""
+    _calculate_all_career_paths_cached.cache_clear()
+    _career_node_report_cached.cache_clear()
+    _career_nodes_by_id.cache_clear()
 
-        query += " ORDER BY node_type, phase, id"
+
+@lru_cache(maxsize=256)
+def _calculate_all_career_paths_cached(
+    node_type: Optional[str],
+    leaf_only: bool,
+    baseline_salary: float,
+    baseline_growth: float,
+    lifestyle: str,
+    family_transition_year: int,
+    include_breakdown: bool,
+):
+    """
+    Memoized body of calculate_all_career_paths(); arguments fully resolved.
+
+    Returns (data, rankings) where rankings maps each CAREER_SORT_KEYS name
+    to the results ordered by that field, best first.
+    """
+    # Get all career nodes (non-masters)
+    qb = QueryBuilder(f"SELECT {NODE_NETWORTH_COLUMNS} FROM career_nodes")
+    qb.add_filter("node_type = ?", node_type)
+    qb.order_by("node_type, phase, id")
+    query, params = qb.build()
+
+    with get_db() as conn:
+        cursor = conn.cursor()
         cursor.execute(query, params)
-        all_nodes = [dict(row) for row in cursor.fetchall()]
+        all_nodes = fetch_dicts(cursor)
 
         # If leaf_only, find nodes that are NOT parents in any child edge
         if leaf_only:
@@ -310,6 +454,7 @@ def calculate_all_career_paths(
             baseline_total,
             lifestyle=lifestyle,
             family_transition_year=family_transition_year,
+            include_breakdown=include_breakdown,
         )
 
         # Add probability info: find this node's cumulative path probability
@@ -326,11 +471,9 @@ def calculate_all_career_paths(
         results.append(result)
 
     # Sort by net benefit descending
-    results.sort(key=lambda x: x["net_benefit_k"], reverse=True)
+    results.sort(key=itemgetter("net_benefit_k"), reverse=True)
 
     # ── Summary statistics ───────────────────────────────────────────────
-    from collections import defaultdict
-
     type_benefits = defaultdict(list)
     phase_benefits = defaultdict(list)
 
@@ -340,7 +483,7 @@ def calculate_all_career_paths(
 
     positive = sum(1 for r in results if r["net_benefit_k"] > 0)
 
-    return {
+    data = {
         "baseline": baseline,
         "assumptions": {
             "baseline_annual_salary_usd_k": baseline_salary,
@@ -382,6 +525,13 @@ def calculate_all_career_paths(
         },
     }
 
+    # Precomputed descending orderings: a request ranks by slicing, not sorting
+    rankings = {
+        sort_by: tuple(sorted(results, key=itemgetter(field), reverse=True))
+        for sort_by, field in CAREER_SORT_KEYS.items()
+    }
+    return data, rankings
+
 
 # ─── CLI Report ──────────────────────────────────────────────────────────────
 
@@ -7,15 +7,94 @@ Single source of truth for:
   - Logging configuration
 """
 
+import atexit
+import hashlib
 import logging
+import queue
 import sqlite3
 from contextlib import contextmanager
 from pathlib import Path
+from typing import Optional
 
 # ─── Database ────────────────────────────────────────────────────────────────
 
 DB_PATH = Path(__file__).parent / "career_tree.db"
 
+# Per-connection tuning. journal_mode is persistent in the DB file, so it is
+# set once by enable_wal() rather than on every connect.
+CONNECTION_PRAGMAS = (
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-65536",  # 64 MB page cache
+    "PRAGMA mmap_size=268435456",  # 256 MB memory-mapped reads
+)
+
+
+# Prepared statements kept per connection. QueryBuilder emits identical SQL for
+# identical filter combinations, so with pooled connections each combination is
+# parsed and planned once rather than once per request.
+STATEMENT_CACHE_SIZE = 256
+
+
+def configure_connection(conn: sqlite3.Connection) -> sqlite3.Connection:
+    """Apply row factory and performance pragmas to a fresh connection."""
+    conn.row_factory = sqlite3.Row
+    for pragma in CONNECTION_PRAGMAS:
+        conn.execute(pragma)
+    return conn
+
+
+def enable_wal(db_path=None) -> str:
+    """
+    Switch the database to write-ahead logging (one-time, persistent).
+
+    WAL lets readers proceed while a writer is active. Run as part of the
+    migrate step (database.migrate_database), not at server startup, since
+    it rewrites the database header. db_path defaults to DB_PATH as set at
+    call time; returns the resulting journal mode.
+    """
+    if db_path is None:
+        db_path = DB_PATH
+    conn = sqlite3.connect(db_path)
+    try:
+        return conn.execute("PRAGMA journal_mode=WAL").fetchone()[0]
+    finally:
+        conn.close()
+
+
+# Idle connections kept for reuse. Connections are shared across threads
+# rather than bound to one, so servers that start a thread per request
+# (the threaded dev server) still reuse them; more than POOL_SIZE
+# concurrent checkouts open extra connections that are closed on return.
+POOL_SIZE = 8
+
+_idle_connections = queue.LifoQueue(maxsize=POOL_SIZE)
+
+
+def _open_connection() -> sqlite3.Connection:
+    """Open a configured connection for the pool."""
+    # check_same_thread=False because a connection may be checked out by a
+    # different thread each time; only one thread uses it at a time.
+    return configure_connection(
+        sqlite3.connect(
+            DB_PATH,
+            check_same_thread=False,
+            cached_statements=STATEMENT_CACHE_SIZE,
+        )
+    )
+
+
+def close_pool():
+    """Close every idle pooled connection (registered with atexit)."""
+    while True:
+        try:
+            _idle_connections.get_nowait().close()
+        except queue.Empty:
+            return
+
+
+atexit.register(close_pool)
+
 
 @contextmanager
 def get_db():
@@ -27,15 +106,114 @@ def get_db():
             cursor = conn.cursor()
             cursor.execute("SELECT ...")
 
-    The connection is automatically closed when the block exits,
-    even if an exception occurs.
+    Yields a pooled connection, most recently used first so its page cache
+    is warm, and puts it back afterwards instead of closing it. Any
+    transaction left open when the block exits (normally or via an
+    exception) is rolled back first, matching the old close-per-request
+    semantics.
     """
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
+    try:
+        conn = _idle_connections.get_nowait()
+    except queue.Empty:
+        conn = _open_connection()
     try:
         yield conn
     finally:
-        conn.close()
+        if conn.in_transaction:
+            conn.rollback()
+        try:
+            _idle_connections.put_nowait(conn)
+        except queue.Full:
+            conn.close()
+
+
+def fetch_dicts(cursor: sqlite3.Cursor) -> list:
+    """
+    Fetch the remaining rows of an executed cursor as plain dicts.
+
+    Rows are fetched as tuples and zipped with the column names once, which
+    is about twice as fast as [dict(row) for row in rows] on sqlite3.Row.
+    The cursor's row factory is restored afterwards.
+    """
+    row_factory = cursor.row_factory
+    cursor.row_factory = None
+    try:
+        columns = [col[0] for col in cursor.description]
+        return [dict(zip(columns, row)) for row in cursor.fetchall()]
+    finally:
+        cursor.row_factory = row_factory
+
+
+def fetch_rows(cursor: sqlite3.Cursor) -> tuple:
+    """
+    Fetch the remaining rows of an executed cursor as (columns, tuples).
+
+    For streamed responses: tuples are far smaller than dicts, so callers
+    build each row's dict only as it is encoded. The cursor's row factory is
+    restored afterwards.
+    """
+    row_factory = cursor.row_factory
+    cursor.row_factory = None
+    try:
+        return [col[0] for col in cursor.description], cursor.fetchall()
+    finally:
+        cursor.row_factory = row_factory
+
+
+# Column names per SQL text for fetch_one(); keyed by statement, so only
+# pass fixed SQL (module constants or literals), never per-request strings.
+_columns_by_sql = {}
+
+
+def fetch_one(conn: sqlite3.Connection, sql: str, params=()) -> Optional[dict]:
+    """
+    Run a single-row query and return the row as a plain dict (None if none).
+
+    The column names of each distinct statement are kept, so repeat lookups
+    (e.g. a program by id) only zip the fetched tuple with a prebuilt key
+    tuple instead of converting a sqlite3.Row.
+    """
+    cursor = conn.cursor()
+    cursor.row_factory = None
+    cursor.execute(sql, params)
+    row = cursor.fetchone()
+    if row is None:
+        return None
+    columns = _columns_by_sql.get(sql)
+    if columns is None or len(columns) != len(row):  # new statement or SELECT * after a migration
+        columns = _columns_by_sql[sql] = tuple(col[0] for col in cursor.description)
+    return dict(zip(columns, row))
+
+
+def dataset_version() -> str:
+    """
+    Version of the imported data (PRAGMA user_version), used to build HTTP
+    ETags and to invalidate memoized results.
+
+    Importers bump it with bump_dataset_version(), so it survives restarts;
+    runtime writes such as profile updates leave it alone. Read on every
+    call, so each worker sees an import on its next request.
+    """
+    with get_db() as conn:
+        return str(conn.execute("PRAGMA user_version").fetchone()[0])
+
+
+def bump_dataset_version(conn: sqlite3.Connection) -> int:
+    """Mark the data as changed for dataset_version(); call before committing an import."""
+    version = conn.execute("PRAGMA user_version").fetchone()[0] + 1
+    conn.execute(f"PRAGMA user_version = {version}")
+    return version
+
+
+def _code_version() -> str:
+    """Short hash of the backend sources, so a deploy changes every ETag."""
+    digest = hashlib.blake2b(digest_size=4)
+    for path in sorted(Path(__file__).parent.glob("*.py")):
+        digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+CODE_VERSION = _code_version()
 
 
 def get_db_connection():
@@ -44,9 +222,7 @@ def get_db_connection():
     Prefer get_db() context manager when possible.
     Used by modules that load data at import time.
     """
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
-    return conn
+    return configure_connection(sqlite3.connect(DB_PATH))
 
 
 # ─── Shared Financial Constants ──────────────────────────────────────────────
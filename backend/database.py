@@ -4,7 +4,7 @@ Database setup and models for Career Decision Tree
 
 import sqlite3
 
-from config import DB_PATH, get_logger
+from config import DB_PATH, enable_wal, get_logger
 
 logger = get_logger(__name__)
 
@@ -530,94 +530,8 @@ def create_database():
         INSERT OR IGNORE INTO user_profile (id) VALUES (1)
     """)
 
-    # ─── Indexes ─────────────────────────────────────────────────────────────
-
-    cursor.execute("CREATE INDEX IF NOT EXISTS idx_programs_field ON programs(field)")
-    cursor.execute(
-        "CREATE INDEX IF NOT EXISTS idx_programs_funding_tier ON programs(funding_tier)"
-    )
-    cursor.execute(
-        "CREATE INDEX IF NOT EXISTS idx_programs_country ON programs(university_id)"
-    )
-    cursor.execute(
-        "CREATE INDEX IF NOT EXISTS idx_universities_country ON universities(country)"
-    )
-    cursor.execute(
-        "CREATE INDEX IF NOT EXISTS idx_tax_brackets_country ON tax_brackets(country, scope)"
-    )
-    cursor.execute(
-        "CREATE INDEX IF NOT EXISTS idx_tax_config_country ON tax_config(country)"
-    )
-    cursor.execute(
-        "CREATE INDEX IF NOT EXISTS idx_tax_country_profiles ON tax_country_profiles(country)"
-    )
-    cursor.execute(
-        "CREATE INDEX IF NOT EXISTS idx_market_mappings_market ON market_mappings(primary_market)"
-    )
-    cursor.execute("CREATE INDEX IF NOT EXISTS idx_edges_source ON edges(source_id)")
-    cursor.execute("CREATE INDEX IF NOT EXISTS idx_edges_target ON edges(target_id)")
-    cursor.execute("CREATE INDEX IF NOT EXISTS idx_edges_link_type ON edges(link_type)")
-    cursor.execute(
-        "CREATE INDEX IF NOT EXISTS idx_program_aid_profiles_program ON program_aid_profiles(program_id)"
-    )
-    cursor.execute(
-        "CREATE INDEX IF NOT EXISTS idx_scholarship_links_scholarship ON scholarship_program_links(scholarship_id)"
-    )
-    cursor.execute(
-        "CREATE INDEX IF NOT EXISTS idx_scholarship_links_program ON scholarship_program_links(program_id)"
-    )
-    cursor.execute(
-        "CREATE INDEX IF NOT EXISTS idx_scholarships_country ON scholarships(country)"
-    )
-    cursor.execute(
-        "CREATE INDEX IF NOT EXISTS idx_scholarships_relevance ON scholarships(relevance_score)"
-    )
-    cursor.execute(
-        "CREATE INDEX IF NOT EXISTS idx_qol_metrics_city ON qol_metrics(city)"
-    )
-    cursor.execute(
-        "CREATE INDEX IF NOT EXISTS idx_qol_metrics_country ON qol_metrics(country)"
-    )
-    cursor.execute(
-        "CREATE INDEX IF NOT EXISTS idx_immigration_policy_country ON immigration_policy(country)"
-    )
-    cursor.execute(
-        "CREATE INDEX IF NOT EXISTS idx_industry_hubs_city ON industry_hubs(city)"
-    )
-    cursor.execute(
-        "CREATE INDEX IF NOT EXISTS idx_industry_hubs_industry ON industry_hubs(industry)"
-    )
-    cursor.execute(
-        "CREATE INDEX IF NOT EXISTS idx_visa_approval_country ON visa_approval_by_nationality(country)"
-    )
-    cursor.execute(
-        "CREATE INDEX IF NOT EXISTS idx_visa_approval_nationality ON visa_approval_by_nationality(nationality)"
-    )
-    cursor.execute(
-        "CREATE INDEX IF NOT EXISTS idx_pakistan_job_market_tier ON pakistan_job_market(employer_tier)"
-    )
-    cursor.execute(
-        "CREATE INDEX IF NOT EXISTS idx_pakistan_job_market_field ON pakistan_job_market(field)"
-    )
-    # Post-masters tables indexes
-    cursor.execute(
-        "CREATE INDEX IF NOT EXISTS idx_location_ecosystems_city ON location_ecosystems(city)"
-    )
-    cursor.execute(
-        "CREATE INDEX IF NOT EXISTS idx_location_ecosystems_country ON location_ecosystems(country)"
-    )
-    cursor.execute(
-        "CREATE INDEX IF NOT EXISTS idx_postmasters_nodes_phase ON postmasters_nodes(phase)"
-    )
-    cursor.execute(
-        "CREATE INDEX IF NOT EXISTS idx_postmasters_nodes_type ON postmasters_nodes(node_type)"
-    )
-    cursor.execute(
-        "CREATE INDEX IF NOT EXISTS idx_postmasters_edges_source ON postmasters_edges(source_id)"
-    )
-    cursor.execute(
-        "CREATE INDEX IF NOT EXISTS idx_postmasters_edges_target ON postmasters_edges(target_id)"
-    )
+    create_indexes(cursor)
+    create_search_index(cursor)
 
     conn.commit()
     conn.close()
@@ -625,6 +539,129 @@ def create_database():
     logger.info("Database created at: %s", DB_PATH)
 
 
+# (index, table, columns) created by create_indexes()
+INDEXES = [
+    ("idx_programs_field_tier", "programs", "field, funding_tier"),
+    ("idx_programs_funding_tier", "programs", "funding_tier"),
+    ("idx_programs_country", "programs", "university_id"),
+    ("idx_universities_country", "universities", "country"),
+    ("idx_tax_brackets_country", "tax_brackets", "country, scope"),
+    ("idx_tax_config_country", "tax_config", "country"),
+    ("idx_tax_country_profiles", "tax_country_profiles", "country"),
+    ("idx_market_mappings_market", "market_mappings", "primary_market"),
+    ("idx_edges_target", "edges", "target_id"),
+    ("idx_edges_link_type", "edges", "link_type"),
+    ("idx_program_aid_profiles_program", "program_aid_profiles", "program_id"),
+    ("idx_scholarship_links_scholarship", "scholarship_program_links", "scholarship_id"),
+    ("idx_scholarship_links_program", "scholarship_program_links", "program_id"),
+    ("idx_scholarships_country", "scholarships", "country"),
+    ("idx_scholarships_relevance", "scholarships", "relevance_score"),
+    ("idx_qol_metrics_city", "qol_metrics", "city"),
+    ("idx_qol_metrics_country", "qol_metrics", "country"),
+    ("idx_immigration_policy_country", "immigration_policy", "country"),
+    ("idx_industry_hubs_city", "industry_hubs", "city"),
+    ("idx_industry_hubs_industry", "industry_hubs", "industry"),
+    ("idx_visa_approval_country", "visa_approval_by_nationality", "country"),
+    ("idx_visa_approval_nationality", "visa_approval_by_nationality", "nationality"),
+    ("idx_pakistan_job_market_tier", "pakistan_job_market", "employer_tier"),
+    ("idx_pakistan_job_market_field", "pakistan_job_market", "field"),
+    ("idx_location_ecosystems_city", "location_ecosystems", "city"),
+    ("idx_location_ecosystems_country", "location_ecosystems", "country"),
+    # Post-masters tables indexes
+    ("idx_postmasters_nodes_phase", "postmasters_nodes", "phase"),
+    ("idx_postmasters_nodes_type", "postmasters_nodes", "node_type"),
+    ("idx_postmasters_edges_source", "postmasters_edges", "source_id"),
+    ("idx_postmasters_edges_target", "postmasters_edges", "target_id"),
+    # Hot filter/sort columns for /api/programs, /api/edges, /api/career-nodes
+    ("idx_programs_tuition", "programs", "tuition_usd"),
+    ("idx_programs_y10", "programs", "y10_salary_usd"),
+    ("idx_edges_source_link", "edges", "source_id, link_type"),
+    ("idx_career_nodes_type_phase", "career_nodes", "node_type, phase, id"),
+]
+
+
+def create_indexes(cursor):
+    """
+    Create all secondary indexes (idempotent).
+
+    Shared by create_database() and migrate_database() so existing
+    databases pick up new indexes without a full rebuild. Indexes on tables
+    the database doesn't have (e.g. an older shipped file without the tax
+    profile tables) are skipped rather than failing the migration.
+    """
+    tables = {
+        row[0]
+        for row in cursor.execute("SELECT name FROM sqlite_master WHERE type = 'table'")
+    }
+
+    # Single-column indexes served by a composite's prefix; drop the old ones
+    cursor.execute("DROP INDEX IF EXISTS idx_programs_field")
+    cursor.execute("DROP INDEX IF EXISTS idx_edges_source")
+    for name, table, columns in INDEXES:
+        if table in tables:
+            cursor.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {table}({columns})")
+        else:
+            logger.info("Skipping index %s: no %s table", name, table)
+
+
+def create_search_index(cursor):
+    """
+    Create the programs_fts full-text index used by /api/search (idempotent).
+
+    FTS5 with the trigram tokenizer answers case-insensitive substring
+    queries from an inverted index, so it matches exactly what the old
+    `LIKE '%q%'` scan matched. Triggers keep it in sync with programs and
+    universities; the index is rebuilt from scratch on every call so an
+    existing database is backfilled by migrate_database().
+    """
+    cursor.execute("""
+        CREATE VIRTUAL TABLE IF NOT EXISTS programs_fts USING fts5(
+            program_name, university_name, field, country,
+            tokenize = 'trigram'
+        )
+    """)
+
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS programs_fts_insert AFTER INSERT ON programs
+        BEGIN
+            INSERT INTO programs_fts (rowid, program_name, university_name, field, country)
+            SELECT new.id, new.program_name, u.name, new.field, u.country
+            FROM universities u WHERE u.id = new.university_id;
+        END
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS programs_fts_delete AFTER DELETE ON programs
+        BEGIN
+            DELETE FROM programs_fts WHERE rowid = old.id;
+        END
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS programs_fts_update AFTER UPDATE ON programs
+        BEGIN
+            DELETE FROM programs_fts WHERE rowid = old.id;
+            INSERT INTO programs_fts (rowid, program_name, university_name, field, country)
+            SELECT new.id, new.program_name, u.name, new.field, u.country
+            FROM universities u WHERE u.id = new.university_id;
+        END
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS universities_fts_update AFTER UPDATE ON universities
+        BEGIN
+            UPDATE programs_fts SET university_name = new.name, country = new.country
+            WHERE rowid IN (SELECT id FROM programs WHERE university_id = new.id);
+        END
+    """)
+
+    # Backfill from current data
+    cursor.execute("DELETE FROM programs_fts")
+    cursor.execute("""
+        INSERT INTO programs_fts (rowid, program_name, university_name, field, country)
+        SELECT p.id, p.program_name, u.name, p.field, u.country
+        FROM programs p
+        JOIN universities u ON p.university_id = u.id
+    """)
+
+
 def migrate_database():
     """Run database migrations to add new columns to existing tables."""
     conn = sqlite3.connect(DB_PATH)
@@ -683,8 +720,14 @@ def migrate_database():
             except sqlite3.OperationalError as e:
                 logger.warning("Could not add column %s: %s", col_name, e)
 
+    # Ensure newer indexes exist and refresh planner statistics
+    create_indexes(cursor)
+    create_search_index(cursor)
+    cursor.execute("ANALYZE")
+
     conn.commit()
     conn.close()
+    enable_wal(DB_PATH)
     logger.info("Database migration completed")
 
 
@@ -0,0 +1,15 @@
+"""
+Gunicorn settings for the production server (see README "Production").
+
+Picked up automatically when gunicorn is started from backend/.
+"""
+
+import multiprocessing
+
+bind = "0.0.0.0:5000"
+workers = multiprocessing.cpu_count()
+worker_class = "gthread"
+threads = 4
+
+# Journal mode is not touched here: run `python3 database.py` as a deploy
+# step to migrate the database and switch it to WAL.
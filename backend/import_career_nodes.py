@@ -9,7 +9,7 @@ Usage: python3 import_career_nodes.py
 import sqlite3
 import json
 
-from config import DB_PATH, get_logger
+from config import DB_PATH, bump_dataset_version, get_logger
 
 logger = get_logger(__name__)
 
@@ -2773,16 +2773,16 @@ def import_career_nodes():
     cursor.execute("DELETE FROM career_nodes")
     logger.info("Cleared existing career_nodes table")
 
-    for node in CAREER_NODES:
-        cursor.execute(
-            """
-            INSERT INTO career_nodes (
-                id, phase, label, salary, probability, color, note, children, node_type,
-                income_floor_usd, income_ceiling_usd, initial_capital_usd,
-                ongoing_cost_usd, y1_income_usd, y5_income_usd, y10_income_usd
-            )
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """,
+    cursor.executemany(
+        """
+        INSERT INTO career_nodes (
+            id, phase, label, salary, probability, color, note, children, node_type,
+            income_floor_usd, income_ceiling_usd, initial_capital_usd,
+            ongoing_cost_usd, y1_income_usd, y5_income_usd, y10_income_usd
+        )
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """,
+        (
             (
                 node["id"],
                 node["phase"],
@@ -2800,33 +2800,37 @@ def import_career_nodes():
                 node.get("y1_income_usd"),
                 node.get("y5_income_usd"),
                 node.get("y10_income_usd"),
-            ),
-        )
+            )
+            for node in CAREER_NODES
+        ),
+    )
 
     # ─── Import edges ───
     cursor.execute("DELETE FROM edges")
     logger.info("Cleared existing edges table")
 
-    for edge in EDGES:
-        cursor.execute(
-            """
-            INSERT INTO edges (source_id, target_id, probability, link_type, note)
-            VALUES (?, ?, ?, ?, ?)
-        """,
+    cursor.executemany(
+        """
+        INSERT INTO edges (source_id, target_id, probability, link_type, note)
+        VALUES (?, ?, ?, ?, ?)
+    """,
+        (
             (
                 edge["source_id"],
                 edge["target_id"],
                 edge["probability"],
                 edge["link_type"],
                 edge.get("note"),
-            ),
-        )
+            )
+            for edge in EDGES
+        ),
+    )
 
+    bump_dataset_version(conn)
     conn.commit()
 
     # ─── Verify nodes ───
-    cursor.execute("SELECT COUNT(*) FROM career_nodes")
-    total_nodes = cursor.fetchone()[0]
+    (total_nodes,) = cursor.execute("SELECT COUNT(*) FROM career_nodes").fetchone()
 
     cursor.execute(
         "SELECT node_type, COUNT(*) FROM career_nodes GROUP BY node_type ORDER BY node_type"
@@ -2839,8 +2843,7 @@ def import_career_nodes():
     by_phase = cursor.fetchall()
 
     # ─── Verify edges ───
-    cursor.execute("SELECT COUNT(*) FROM edges")
-    total_edges = cursor.fetchone()[0]
+    (total_edges,) = cursor.execute("SELECT COUNT(*) FROM edges").fetchone()
 
     cursor.execute(
         "SELECT link_type, COUNT(*) FROM edges GROUP BY link_type ORDER BY link_type"
@@ -6,7 +6,7 @@ import sqlite3
 import pandas as pd
 from pathlib import Path
 
-from config import DB_PATH, get_logger
+from config import DB_PATH, bump_dataset_version, get_logger
 
 logger = get_logger(__name__)
 
@@ -120,14 +120,12 @@ def import_masters_programs():
             ),
         )
 
+    bump_dataset_version(conn)
     conn.commit()
 
     # Print summary
-    cursor.execute("SELECT COUNT(*) FROM universities")
-    uni_count = cursor.fetchone()[0]
-
-    cursor.execute("SELECT COUNT(*) FROM programs")
-    prog_count = cursor.fetchone()[0]
+    (uni_count,) = cursor.execute("SELECT COUNT(*) FROM universities").fetchone()
+    (prog_count,) = cursor.execute("SELECT COUNT(*) FROM programs").fetchone()
 
     cursor.execute("SELECT funding_tier, COUNT(*) FROM programs GROUP BY funding_tier")
     tier_counts = cursor.fetchall()
@@ -13,7 +13,7 @@ requirements including:
 """
 
 import sqlite3
-from config import DB_PATH, get_logger
+from config import DB_PATH, bump_dataset_version, get_logger
 
 logger = get_logger(__name__)
 
@@ -401,6 +401,7 @@ def import_initial_capital():
             f"Initial Capital: ${initial_capital:,}"
         )
 
+    bump_dataset_version(conn)
     conn.commit()
     conn.close()
 
@@ -8,7 +8,7 @@ Usage: python3 import_location_ecosystems.py
 
 import sqlite3
 
-from config import DB_PATH, get_logger
+from config import DB_PATH, bump_dataset_version, get_logger
 
 logger = get_logger(__name__)
 
@@ -509,6 +509,7 @@ def import_location_ecosystems():
         else:
             updated += 1
 
+    bump_dataset_version(conn)
     conn.commit()
     conn.close()
 
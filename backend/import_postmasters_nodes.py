@@ -12,7 +12,7 @@ Usage: python3 import_postmasters_nodes.py
 import sqlite3
 import json
 
-from config import DB_PATH, get_logger
+from config import DB_PATH, bump_dataset_version, get_logger
 
 logger = get_logger(__name__)
 
@@ -843,6 +843,7 @@ def import_postmasters_nodes():
         else:
             updated += 1
 
+    bump_dataset_version(conn)
     conn.commit()
     logger.info(
         "Post-masters nodes imported: %d inserted, %d updated", inserted, updated
@@ -884,6 +885,7 @@ def import_postmasters_edges():
         else:
             updated += 1
 
+    bump_dataset_version(conn)
     conn.commit()
     conn.close()
 
@@ -11,7 +11,7 @@ Run once after creating the new tables:
 
 import sqlite3
 
-from config import DB_PATH, get_logger
+from config import DB_PATH, bump_dataset_version, get_logger
 
 logger = get_logger(__name__)
 
@@ -34,6 +34,7 @@ def import_all():
     _import_market_mappings(cursor)
     _import_us_region_states(cursor)
 
+    bump_dataset_version(conn)
     conn.commit()
     conn.close()
     logger.info("All reference data imported successfully.")
@@ -79,11 +80,10 @@ def _import_exchange_rates(cursor):
     }
 
     cursor.execute("DELETE FROM exchange_rates")
-    for currency, (rate, country) in rates.items():
-        cursor.execute(
-            "INSERT INTO exchange_rates (currency, rate_per_usd, country_name) VALUES (?, ?, ?)",
-            (currency, rate, country),
-        )
+    cursor.executemany(
+        "INSERT INTO exchange_rates (currency, rate_per_usd, country_name) VALUES (?, ?, ?)",
+        ((currency, rate, country) for currency, (rate, country) in rates.items()),
+    )
     logger.info("Imported %d exchange rates", len(rates))
 
 
@@ -100,15 +100,18 @@ def _import_tax_brackets(cursor):
     # Helper to insert brackets
     def insert_brackets(country, scope, brackets, currency="USD"):
         nonlocal count
-        for i, (threshold, rate) in enumerate(brackets):
-            # Use a large number instead of infinity for DB storage
-            t = threshold if threshold != float("inf") else 999999999999
-            cursor.execute(
-                "INSERT INTO tax_brackets (country, scope, bracket_order, threshold_lc, rate, currency) "
-                "VALUES (?, ?, ?, ?, ?, ?)",
-                (country, scope, i + 1, t, rate, currency),
-            )
-            count += 1
+        # Use a large number instead of infinity for DB storage
+        cursor.executemany(
+            "INSERT INTO tax_brackets (country, scope, bracket_order, threshold_lc, rate, currency) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (
+                (country, scope, i + 1,
+                 threshold if threshold != float("inf") else 999999999999,
+                 rate, currency)
+                for i, (threshold, rate) in enumerate(brackets)
+            ),
+        )
+        count += len(brackets)
 
     # ── US Federal ───────────────────────────────────────────────────────
     insert_brackets(
@@ -1380,20 +1383,12 @@ def _import_living_costs(cursor):
         "Pakistan": (4.0, 8.7, 15.6, 5.5, 12.0, 22.0),
     }
 
-    for city, (
-        student,
-        single,
-        family,
-        c_student,
-        c_single,
-        c_family,
-    ) in city_costs.items():
-        cursor.execute(
-            "INSERT INTO living_costs (city, student_cost_k, single_cost_k, family_cost_k, "
-            "comfortable_student_cost_k, comfortable_single_cost_k, comfortable_family_cost_k) "
-            "VALUES (?, ?, ?, ?, ?, ?, ?)",
-            (city, student, single, family, c_student, c_single, c_family),
-        )
+    cursor.executemany(
+        "INSERT INTO living_costs (city, student_cost_k, single_cost_k, family_cost_k, "
+        "comfortable_student_cost_k, comfortable_single_cost_k, comfortable_family_cost_k) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?)",
+        ((city, *costs) for city, costs in city_costs.items()),
+    )
     logger.info(
         "Imported %d city living costs (frugal + comfortable tiers)", len(city_costs)
     )
@@ -1451,11 +1446,10 @@ def _import_country_default_cities(cursor):
         "Multi-country": "Paris",
     }
 
-    for country, city in mappings.items():
-        cursor.execute(
-            "INSERT INTO country_default_cities (country, default_city) VALUES (?, ?)",
-            (country, city),
-        )
+    cursor.executemany(
+        "INSERT INTO country_default_cities (country, default_city) VALUES (?, ?)",
+        mappings.items(),
+    )
     logger.info("Imported %d country default city mappings", len(mappings))
 
 
@@ -1649,11 +1643,10 @@ def _import_market_mappings(cursor):
         ("Bogot\u00e1", "Colombia", "Bogota", None),
     ]
 
-    for market, country, city, state in mappings:
-        cursor.execute(
-            "INSERT INTO market_mappings (primary_market, work_country, work_city, us_state) VALUES (?, ?, ?, ?)",
-            (market, country, city, state),
-        )
+    cursor.executemany(
+        "INSERT INTO market_mappings (primary_market, work_country, work_city, us_state) VALUES (?, ?, ?, ?)",
+        mappings,
+    )
     logger.info("Imported %d market mappings", len(mappings))
 
 
@@ -1692,11 +1685,10 @@ def _import_us_region_states(cursor):
         "global": ("CA", "Bay Area"),
     }
 
-    for keyword, (state, city) in mappings.items():
-        cursor.execute(
-            "INSERT INTO us_region_states (region_keyword, state_code, display_city) VALUES (?, ?, ?)",
-            (keyword, state, city),
-        )
+    cursor.executemany(
+        "INSERT INTO us_region_states (region_keyword, state_code, display_city) VALUES (?, ?, ?)",
+        ((keyword, state, city) for keyword, (state, city) in mappings.items()),
+    )
     logger.info("Imported %d US region-state mappings", len(mappings))
 
 
@@ -8,7 +8,7 @@ Run: cd backend && python import_tax_profiles.py
 """
 
 import sqlite3
-from config import DB_PATH
+from config import DB_PATH, bump_dataset_version
 
 # Country profiles: consolidated tax calculation parameters
 # Each country specifies how to calculate total tax from gross income
@@ -381,17 +381,17 @@ def import_profiles():
         )
     """)
 
-    for profile in TAX_PROFILES:
-        cursor.execute(
-            """
-            INSERT OR REPLACE INTO tax_country_profiles (
-                country, currency, social_rate, social_cap_lc,
-                surtax_rate, surtax_threshold_lc,
-                personal_allowance_lc, pa_taper_start_lc, pa_taper_rate,
-                professional_deduction_rate, local_tax_rate, tax_ceiling,
-                cess_rate, standard_rate_cap, calculation_strategy, notes
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
+    cursor.executemany(
+        """
+        INSERT OR REPLACE INTO tax_country_profiles (
+            country, currency, social_rate, social_cap_lc,
+            surtax_rate, surtax_threshold_lc,
+            personal_allowance_lc, pa_taper_start_lc, pa_taper_rate,
+            professional_deduction_rate, local_tax_rate, tax_ceiling,
+            cess_rate, standard_rate_cap, calculation_strategy, notes
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """,
+        (
             (
                 profile.get("country"),
                 profile.get("currency", "USD"),
@@ -409,9 +409,12 @@ def import_profiles():
                 profile.get("standard_rate_cap"),
                 profile.get("calculation_strategy", "standard"),
                 profile.get("notes"),
-            ),
-        )
+            )
+            for profile in TAX_PROFILES
+        ),
+    )
 
+    bump_dataset_version(conn)
     conn.commit()
     print(f"Imported {len(TAX_PROFILES)} tax country profiles")
     conn.close()
@@ -20,10 +20,9 @@ Main entry point:
     get_annual_living_cost(work_city, household_type, country=None, lifestyle="frugal") -> cost_usd_k
 """
 
-import sqlite3
 from typing import Optional
 
-from config import DB_PATH
+from config import get_db
 
 VALID_LIFESTYLES = ("frugal", "comfortable")
 VALID_HOUSEHOLDS = ("student", "single", "family")
@@ -39,15 +38,14 @@ def _load_city_costs() -> dict[str, dict[str, dict[str, float]]]:
         {city: {"frugal": {"student": x, "single": y, "family": z},
                 "comfortable": {"student": x, "single": y, "family": z}}}
     """
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-    cursor.execute(
-        "SELECT city, student_cost_k, single_cost_k, family_cost_k, "
-        "comfortable_student_cost_k, comfortable_single_cost_k, comfortable_family_cost_k "
-        "FROM living_costs"
-    )
+    with get_db() as conn:
+        rows = conn.execute(
+            "SELECT city, student_cost_k, single_cost_k, family_cost_k, "
+            "comfortable_student_cost_k, comfortable_single_cost_k, comfortable_family_cost_k "
+            "FROM living_costs"
+        ).fetchall()
     result = {}
-    for row in cursor.fetchall():
+    for row in rows:
         city = row[0]
         result[city] = {
             "frugal": {"student": row[1], "single": row[2], "family": row[3]},
@@ -57,17 +55,14 @@ def _load_city_costs() -> dict[str, dict[str, dict[str, float]]]:
                 "family": row[6] if row[6] is not None else row[3],
             },
         }
-    conn.close()
     return result
 
 
 def _load_country_default_cities() -> dict[str, str]:
     """Load country -> default city fallback mappings from DB."""
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-    cursor.execute("SELECT country, default_city FROM country_default_cities")
-    result = {row[0]: row[1] for row in cursor.fetchall()}
-    conn.close()
+    with get_db() as conn:
+        rows = conn.execute("SELECT country, default_city FROM country_default_cities").fetchall()
+    result = {row[0]: row[1] for row in rows}
     return result
 
 
@@ -9,6 +9,7 @@ from dataclasses import dataclass
 from typing import Optional
 
 from config import get_db, get_logger
+from query_builder import QueryBuilder
 
 logger = get_logger(__name__)
 
@@ -187,27 +188,18 @@ def list_ecosystems(
     Returns:
         List of LocationEcosystem objects
     """
-    with get_db() as conn:
-        cursor = conn.cursor()
-
-        query = "SELECT * FROM location_ecosystems WHERE 1=1"
-        params = []
-
-        if country:
-            query += " AND LOWER(country) = LOWER(?)"
-            params.append(country)
-
-        if min_startup_strength is not None:
-            query += " AND startup_ecosystem_strength >= ?"
-            params.append(min_startup_strength)
-
-        if has_entrepreneur_visa is not None:
-            query += " AND entrepreneur_visa_available = ?"
-            params.append(1 if has_entrepreneur_visa else 0)
+    qb = QueryBuilder("SELECT * FROM location_ecosystems")
+    qb.add_filter("LOWER(country) = LOWER(?)", country)
+    qb.add_filter("startup_ecosystem_strength >= ?", min_startup_strength)
+    qb.add_filter(
+        "entrepreneur_visa_available = ?",
+        None if has_entrepreneur_visa is None else int(has_entrepreneur_visa),
+    )
+    qb.order_by("startup_ecosystem_strength DESC")
+    query, params = qb.build()
 
-        query += " ORDER BY startup_ecosystem_strength DESC"
-        cursor.execute(query, params)
-        rows = cursor.fetchall()
+    with get_db() as conn:
+        rows = conn.execute(query, params).fetchall()
 
     return [
         LocationEcosystem(
@@ -19,7 +19,6 @@ Data source: market_mappings and us_region_states tables in career_tree.db.
 Loaded once at module import time and cached.
 """
 
-import sqlite3
 from dataclasses import dataclass
 from typing import Optional
 
@@ -35,37 +34,33 @@ class MarketInfo:
 
 # ─── Database Loading ────────────────────────────────────────────────────────
 
-from config import DB_PATH
+from config import get_db
 
 
 def _load_us_region_states() -> dict[str, tuple[str, str]]:
     """Load US region keyword -> (state_code, display_city) from DB."""
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-    cursor.execute(
-        "SELECT region_keyword, state_code, display_city FROM us_region_states"
-    )
-    result = {row[0]: (row[1], row[2]) for row in cursor.fetchall()}
-    conn.close()
+    with get_db() as conn:
+        rows = conn.execute(
+            "SELECT region_keyword, state_code, display_city FROM us_region_states"
+        ).fetchall()
+    result = {row[0]: (row[1], row[2]) for row in rows}
     return result
 
 
 def _load_market_mappings() -> dict[str, MarketInfo]:
     """Load primary_market -> MarketInfo from DB."""
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-    cursor.execute(
-        "SELECT primary_market, work_country, work_city, us_state FROM market_mappings"
-    )
+    with get_db() as conn:
+        rows = conn.execute(
+            "SELECT primary_market, work_country, work_city, us_state FROM market_mappings"
+        ).fetchall()
     result = {
         row[0]: MarketInfo(
             work_country=row[1],
             work_city=row[2],
             us_state=row[3],
         )
-        for row in cursor.fetchall()
+        for row in rows
     }
-    conn.close()
     return result
 
 
@@ -151,13 +146,11 @@ def get_study_country_for_living_cost(university_country: str) -> str:
 
 def validate_all_markets():
     """Check that every primary_market in the DB has a mapping."""
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-    cursor.execute(
-        "SELECT DISTINCT primary_market FROM programs WHERE primary_market IS NOT NULL"
-    )
-    all_markets = [row[0] for row in cursor.fetchall()]
-    conn.close()
+    with get_db() as conn:
+        rows = conn.execute(
+            "SELECT DISTINCT primary_market FROM programs WHERE primary_market IS NOT NULL"
+        ).fetchall()
+    all_markets = [row[0] for row in rows]
 
     unmapped = []
     for market in all_markets:
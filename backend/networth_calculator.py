@@ -30,10 +30,15 @@ All values in $K USD unless otherwise noted.
 """
 
 import sqlite3
+from collections import defaultdict
+from functools import lru_cache
+from itertools import islice
+from operator import itemgetter
 from typing import Optional
 
 from config import (
     DB_PATH,
+    fetch_dicts,
     get_db,
     BASELINE_ANNUAL_SALARY_USD_K,
     BASELINE_ANNUAL_GROWTH,
@@ -65,6 +70,18 @@ DEFAULT_DURATION = MASTERS_DEFAULT_DURATION
 FAMILY_TRANSITION_YEAR = MASTERS_DEFAULT_FAMILY_YEAR
 TOTAL_YEARS = MASTERS_TOTAL_YEARS
 
+# sort_by name -> program field used by calculate_all_programs()
+PROGRAM_SORT_KEYS = {
+    "net_benefit": "net_benefit_k",
+    "cost": "total_study_cost_k",
+    "y1": "y1_salary_k",
+    "y10": "y10_salary_k",
+    "networth": "masters_networth_k",
+    "initial_capital": "initial_capital_usd",
+}
+# Lower is better for these; every other sort is descending
+ASCENDING_SORTS = {"cost", "initial_capital"}
+
 
 # ─── Core Calculation Functions ──────────────────────────────────────────────
 
@@ -98,53 +115,19 @@ def calculate_baseline_networth(
     )
 
 
-def calculate_program_networth(
-    program: dict,
-    baseline_total: Optional[float] = None,
-    baseline_salary: Optional[float] = None,
-    baseline_growth: Optional[float] = None,
-    lifestyle: str = "frugal",
-    family_transition_year: Optional[int] = None,
-    aid_scenario: str = "no_aid",
-) -> dict:
-    """
-    Calculate 12-year net worth for a specific masters program.
-
-    Timeline:
-      Calendar years 1-2: Study (pay tuition + student living, no income)
-      Calendar years 3-12: Work years 1-10
-      Household transitions from single to family at family_transition_year.
+AID_SCENARIOS = ("no_aid", "expected", "best_case")
 
-    Uses:
-      - Market mapping to determine work country/city/state
-      - Progressive tax brackets for the work country
-      - Real living costs for study city (university country) and work city
 
-    Args:
-        lifestyle: "frugal" or "comfortable" living cost tier.
-        family_transition_year: Calendar year when household transitions to family
-            (1-12, or 13 for never). Default: FAMILY_TRANSITION_YEAR (5).
-        aid_scenario: Financial aid scenario to apply:
-            - "no_aid": Full sticker price tuition (conservative/current behavior)
-            - "expected": Apply expected_aid_usd reduction (realistic estimate)
-            - "best_case": Apply best_case_aid_usd reduction (optimistic but achievable)
+def _apply_aid_scenario(program: dict, aid_scenario: str) -> tuple:
     """
-    if family_transition_year is None:
-        family_transition_year = FAMILY_TRANSITION_YEAR
-
-    # Extract program data
-    raw_tuition = program.get("tuition_usd") or 0  # Total tuition in $K
-    y1_salary = program.get("y1_salary_usd") or 0  # $K
-    y5_salary = program.get("y5_salary_usd") or 0  # $K
-    y10_salary = program.get("y10_salary_usd") or 0  # $K
-    duration = program.get("duration_years") or DEFAULT_DURATION
-    primary_market = program.get("primary_market") or ""
-    uni_country = program.get("country") or "USA"
+    Resolve effective tuition, scholarship and initial capital for a scenario.
 
-    # Apply financial aid based on scenario
+    Returns:
+        (tuition_k, scholarship_applied_k, initial_capital_usd)
+    """
+    raw_tuition = program.get("tuition_usd") or 0
     expected_aid = program.get("expected_aid_usd") or 0
     best_case_aid = program.get("best_case_aid_usd") or 0
-    coop_earnings = program.get("coop_earnings_usd") or 0
     aid_type = program.get("aid_type") or "none"
     initial_capital_base = program.get("initial_capital_usd") or 0
 
@@ -176,6 +159,56 @@ def calculate_program_networth(
         non_tuition_component = initial_capital_base * 0.5
         initial_capital = int(non_tuition_component + tuition_component * (1 - tuition_reduction_pct))
 
+    return tuition, scholarship_applied, initial_capital
+
+
+def calculate_program_networth_batch(
+    program: dict,
+    baseline_total: Optional[float] = None,
+    scenarios=AID_SCENARIOS,
+    baseline_salary: Optional[float] = None,
+    baseline_growth: Optional[float] = None,
+    lifestyle: str = "frugal",
+    family_transition_year: Optional[int] = None,
+    include_breakdown: bool = True,
+) -> dict:
+    """
+    Calculate 12-year net worth for a program under several aid scenarios at once.
+
+    Everything except tuition, initial capital and co-op earnings is independent
+    of the aid scenario (market lookup, study living costs, the whole work
+    period with its tax and living cost lookups, effective tax rates, baseline),
+    so it is computed once and only the aid-dependent terms are applied per
+    scenario.
+
+    Args:
+        scenarios: Iterable of aid scenarios ("no_aid", "expected", "best_case").
+        include_breakdown: If False, skip building the per-year entries and
+            omit "yearly_breakdown" from each result (compact responses).
+        Other args: see calculate_program_networth().
+
+    Returns:
+        Dict mapping each scenario to the same result dict that
+        calculate_program_networth() returns for it.
+    """
+    if family_transition_year is None:
+        family_transition_year = FAMILY_TRANSITION_YEAR
+
+    # Extract program data
+    raw_tuition = program.get("tuition_usd") or 0  # Total tuition in $K
+    y1_salary = program.get("y1_salary_usd") or 0  # $K
+    y5_salary = program.get("y5_salary_usd") or 0  # $K
+    y10_salary = program.get("y10_salary_usd") or 0  # $K
+    duration = program.get("duration_years") or DEFAULT_DURATION
+    primary_market = program.get("primary_market") or ""
+    uni_country = program.get("country") or "USA"
+
+    expected_aid = program.get("expected_aid_usd") or 0
+    best_case_aid = program.get("best_case_aid_usd") or 0
+    coop_earnings = program.get("coop_earnings_usd") or 0
+    aid_type = program.get("aid_type") or "none"
+    initial_capital_base = program.get("initial_capital_usd") or 0
+
     # Get work location info
     market = get_market_info(primary_market, uni_country)
     work_country = market.work_country
@@ -185,38 +218,26 @@ def calculate_program_networth(
     # Get study country for living costs during study years
     study_country = get_study_country_for_living_cost(uni_country)
 
-    # ── Study period (calendar years 1-2) ────────────────────────────────
+    # ── Study period living costs (calendar years 1-2) ───────────────────
     study_years = int(duration)
-    tuition_per_year = tuition / study_years if study_years > 0 else 0
-
-    study_yearly = []
-    total_study_cost = 0.0
-
-    for cal_yr in range(1, study_years + 1):
-        student_living = get_study_living_cost(
-            study_country, "student", lifestyle=lifestyle
-        )
-        year_cost = tuition_per_year + student_living
-        total_study_cost += year_cost
-
-        study_yearly.append(
-            {
-                "calendar_year": cal_yr,
-                "phase": "study",
-                "tuition_k": round(tuition_per_year, 2),
-                "living_cost_k": round(student_living, 2),
-                "total_cost_k": round(year_cost, 2),
-                "gross_salary_k": 0,
-                "after_tax_k": 0,
-                "annual_savings_k": round(-year_cost, 2),
-            }
-        )
+    student_living_costs = [
+        get_study_living_cost(study_country, "student", lifestyle=lifestyle)
+        for _ in range(study_years)
+    ]
 
     # ── Work period (calendar years 3-12, work years 1-10) ───────────────
     work_years = TOTAL_YEARS - study_years  # Should be 10
     work_yearly = []
     total_work_savings = 0.0
 
+    # Living cost only varies by household type, so look each up once
+    living_costs = {
+        household: get_annual_living_cost(
+            work_city, household, work_country, lifestyle=lifestyle
+        )
+        for household in ("single", "family")
+    }
+
     for work_yr in range(1, work_years + 1):
         cal_yr = study_years + work_yr
 
@@ -232,41 +253,25 @@ def calculate_program_networth(
         else:
             household = "family"
 
-        living_cost = get_annual_living_cost(
-            work_city, household, work_country, lifestyle=lifestyle
-        )
+        living_cost = living_costs[household]
 
         # Annual savings
         annual_savings = after_tax - living_cost
         total_work_savings += annual_savings
 
-        work_yearly.append(
-            {
-                "calendar_year": cal_yr,
-                "work_year": work_yr,
-                "phase": "work",
-                "household": household,
-                "gross_salary_k": round(gross, 2),
-                "after_tax_k": round(after_tax, 2),
-                "living_cost_k": round(living_cost, 2),
-                "annual_savings_k": round(annual_savings, 2),
-            }
-        )
-
-    # ── Net worth calculation ────────────────────────────────────────────
-    # Add co-op earnings for co-op programs (reduces effective cost)
-    if aid_scenario in ("expected", "best_case") and coop_earnings > 0:
-        total_study_cost -= coop_earnings
-
-    masters_networth = total_work_savings - total_study_cost
-
-    # Cumulative tracking
-    cumulative = 0.0
-    all_yearly = []
-    for entry in study_yearly + work_yearly:
-        cumulative += entry["annual_savings_k"]
-        entry["cumulative_k"] = round(cumulative, 2)
-        all_yearly.append(entry)
+        if include_breakdown:
+            work_yearly.append(
+                {
+                    "calendar_year": cal_yr,
+                    "work_year": work_yr,
+                    "phase": "work",
+                    "household": household,
+                    "gross_salary_k": round(gross, 2),
+                    "after_tax_k": round(after_tax, 2),
+                    "living_cost_k": round(living_cost, 2),
+                    "annual_savings_k": round(annual_savings, 2),
+                }
+            )
 
     # Compare to baseline
     if baseline_total is None:
@@ -279,8 +284,6 @@ def calculate_program_networth(
             )["total_networth_k"]
         )
 
-    net_benefit = masters_networth - baseline_total
-
     # Effective tax rate at Y1 and Y10
     eff_tax_y1 = (
         (
@@ -305,52 +308,146 @@ def calculate_program_networth(
         else 0
     )
 
-    return {
-        "program_id": program.get("id"),
-        "university": program.get("university_name") or program.get("university", ""),
-        "program_name": program.get("program_name", ""),
-        "country": uni_country,
-        "field": program.get("field", ""),
-        "funding_tier": program.get("funding_tier", ""),
-        "duration_years": duration,
-        # Location
-        "work_country": work_country,
-        "work_city": work_city,
-        "us_state": us_state,
-        "primary_market": primary_market,
-        # Initial capital requirement (upfront funds needed before starting)
-        "initial_capital_base_usd": initial_capital_base,  # No aid scenario
-        "initial_capital_usd": initial_capital,  # Adjusted for aid scenario
-        # Costs (raw vs effective)
-        "raw_tuition_k": raw_tuition,
-        "tuition_k": tuition,
-        "study_living_cost_k": round(total_study_cost - tuition + (coop_earnings if aid_scenario in ("expected", "best_case") else 0), 2),
-        "total_study_cost_k": round(total_study_cost, 2),
-        # Financial Aid Info
-        "aid_scenario": aid_scenario,
-        "scholarship_applied_k": scholarship_applied,
-        "coop_earnings_k": coop_earnings if aid_scenario in ("expected", "best_case") else 0,
-        "aid_type": aid_type,
-        "expected_aid_k": expected_aid,
-        "best_case_aid_k": best_case_aid,
-        # Earnings
-        "total_work_savings_k": round(total_work_savings, 2),
-        "masters_networth_k": round(masters_networth, 2),
-        # Comparison
-        "baseline_networth_k": round(baseline_total, 2),
-        "net_benefit_k": round(net_benefit, 2),
-        # Tax info
-        "effective_tax_rate_y1": round(eff_tax_y1, 4),
-        "effective_tax_rate_y10": round(eff_tax_y10, 4),
-        # Salary trajectory
-        "y1_salary_k": y1_salary,
-        "y5_salary_k": y5_salary,
-        "y10_salary_k": y10_salary,
-        # Original DB value for comparison
-        "db_net_10yr_k": program.get("net_10yr_usd"),
-        # Yearly breakdown
-        "yearly_breakdown": all_yearly,
-    }
+    # ── Per-scenario: tuition, co-op, initial capital ────────────────────
+    results = {}
+    for aid_scenario in scenarios:
+        tuition, scholarship_applied, initial_capital = _apply_aid_scenario(
+            program, aid_scenario
+        )
+        tuition_per_year = tuition / study_years if study_years > 0 else 0
+        coop_applied = aid_scenario in ("expected", "best_case")
+
+        study_yearly = []
+        total_study_cost = 0.0
+
+        for cal_yr, student_living in enumerate(student_living_costs, 1):
+            year_cost = tuition_per_year + student_living
+            total_study_cost += year_cost
+
+            if include_breakdown:
+                study_yearly.append(
+                    {
+                        "calendar_year": cal_yr,
+                        "phase": "study",
+                        "tuition_k": round(tuition_per_year, 2),
+                        "living_cost_k": round(student_living, 2),
+                        "total_cost_k": round(year_cost, 2),
+                        "gross_salary_k": 0,
+                        "after_tax_k": 0,
+                        "annual_savings_k": round(-year_cost, 2),
+                    }
+                )
+
+        # ── Net worth calculation ────────────────────────────────────────
+        # Add co-op earnings for co-op programs (reduces effective cost)
+        if coop_applied and coop_earnings > 0:
+            total_study_cost -= coop_earnings
+
+        masters_networth = total_work_savings - total_study_cost
+
+        net_benefit = masters_networth - baseline_total
+
+        result = results[aid_scenario] = {
+            "program_id": program.get("id"),
+            "university": program.get("university_name") or program.get("university", ""),
+            "program_name": program.get("program_name", ""),
+            "country": uni_country,
+            "field": program.get("field", ""),
+            "funding_tier": program.get("funding_tier", ""),
+            "duration_years": duration,
+            # Location
+            "work_country": work_country,
+            "work_city": work_city,
+            "us_state": us_state,
+            "primary_market": primary_market,
+            # Initial capital requirement (upfront funds needed before starting)
+            "initial_capital_base_usd": initial_capital_base,  # No aid scenario
+            "initial_capital_usd": initial_capital,  # Adjusted for aid scenario
+            # Costs (raw vs effective)
+            "raw_tuition_k": raw_tuition,
+            "tuition_k": tuition,
+            "study_living_cost_k": round(total_study_cost - tuition + (coop_earnings if coop_applied else 0), 2),
+            "total_study_cost_k": round(total_study_cost, 2),
+            # Financial Aid Info
+            "aid_scenario": aid_scenario,
+            "scholarship_applied_k": scholarship_applied,
+            "coop_earnings_k": coop_earnings if coop_applied else 0,
+            "aid_type": aid_type,
+            "expected_aid_k": expected_aid,
+            "best_case_aid_k": best_case_aid,
+            # Earnings
+            "total_work_savings_k": round(total_work_savings, 2),
+            "masters_networth_k": round(masters_networth, 2),
+            # Comparison
+            "baseline_networth_k": round(baseline_total, 2),
+            "net_benefit_k": round(net_benefit, 2),
+            # Tax info
+            "effective_tax_rate_y1": round(eff_tax_y1, 4),
+            "effective_tax_rate_y10": round(eff_tax_y10, 4),
+            # Salary trajectory
+            "y1_salary_k": y1_salary,
+            "y5_salary_k": y5_salary,
+            "y10_salary_k": y10_salary,
+            # Original DB value for comparison
+            "db_net_10yr_k": program.get("net_10yr_usd"),
+        }
+
+        if include_breakdown:
+            # Cumulative tracking (work entries are shared, so copy per scenario)
+            cumulative = 0.0
+            all_yearly = []
+            for entry in study_yearly + [dict(e) for e in work_yearly]:
+                cumulative += entry["annual_savings_k"]
+                entry["cumulative_k"] = round(cumulative, 2)
+                all_yearly.append(entry)
+            result["yearly_breakdown"] = all_yearly
+
+    return results
+
+
+def calculate_program_networth(
+    program: dict,
+    baseline_total: Optional[float] = None,
+    baseline_salary: Optional[float] = None,
+    baseline_growth: Optional[float] = None,
+    lifestyle: str = "frugal",
+    family_transition_year: Optional[int] = None,
+    aid_scenario: str = "no_aid",
+    include_breakdown: bool = True,
+) -> dict:
+    """
+    Calculate 12-year net worth for a specific masters program.
+
+    Timeline:
+      Calendar years 1-2: Study (pay tuition + student living, no income)
+      Calendar years 3-12: Work years 1-10
+      Household transitions from single to family at family_transition_year.
+
+    Uses:
+      - Market mapping to determine work country/city/state
+      - Progressive tax brackets for the work country
+      - Real living costs for study city (university country) and work city
+
+    Args:
+        lifestyle: "frugal" or "comfortable" living cost tier.
+        family_transition_year: Calendar year when household transitions to family
+            (1-12, or 13 for never). Default: FAMILY_TRANSITION_YEAR (5).
+        aid_scenario: Financial aid scenario to apply:
+            - "no_aid": Full sticker price tuition (conservative/current behavior)
+            - "expected": Apply expected_aid_usd reduction (realistic estimate)
+            - "best_case": Apply best_case_aid_usd reduction (optimistic but achievable)
+        include_breakdown: If False, omit "yearly_breakdown" and skip building it.
+    """
+    return calculate_program_networth_batch(
+        program,
+        baseline_total,
+        scenarios=(aid_scenario,),
+        baseline_salary=baseline_salary,
+        baseline_growth=baseline_growth,
+        lifestyle=lifestyle,
+        family_transition_year=family_transition_year,
+        include_breakdown=include_breakdown,
+    )[aid_scenario]
 
 
 def calculate_all_programs(
@@ -359,10 +456,24 @@ def calculate_all_programs(
     lifestyle: str = "frugal",
     family_transition_year: Optional[int] = None,
     aid_scenario: str = "no_aid",
+    include_breakdown: bool = True,
+    sort_by: str = "net_benefit",
+    field: Optional[str] = None,
+    funding_tier: Optional[str] = None,
+    work_country: Optional[str] = None,
+    max_initial_capital: Optional[int] = None,
+    limit: Optional[int] = None,
 ):
     """
     Calculate net worth for all programs in the database.
 
+    Results for the default baseline are memoized per lifestyle, family year
+    and breakdown setting (the calculation is deterministic for fixed
+    inputs), as is each sort order; custom baselines are computed per call. Each call returns fresh
+    top-level, summary and per-program dicts, so callers may filter, annotate
+    or pop keys freely; nested lists such as yearly_breakdown are shared and
+    must not be mutated.
+
     Args:
         baseline_salary: Override for baseline annual salary in $K USD.
         baseline_growth: Override for baseline annual growth rate.
@@ -373,14 +484,195 @@ def calculate_all_programs(
             - "no_aid": Full sticker price (default)
             - "expected": Apply expected_aid_usd reduction
             - "best_case": Apply best_case_aid_usd reduction
+        include_breakdown: If False, programs carry no "yearly_breakdown" and
+            the per-year entries are never built (compact responses).
+        sort_by: One of PROGRAM_SORT_KEYS (default: "net_benefit"); unknown
+            names fall back to it. "cost" and "initial_capital" sort
+            ascending, the rest descending.
+        field, funding_tier, work_country: Keep only programs with this value
+            (None or "" = no filter).
+        max_initial_capital: Keep only programs needing at most this much
+            initial capital (USD).
+        limit: Keep only the first `limit` matches; only those are copied.
+            Summary statistics always cover every program.
+    """
+    if sort_by not in PROGRAM_SORT_KEYS:
+        sort_by = "net_benefit"
+
+    entry = _program_results(
+        baseline_salary,
+        baseline_growth,
+        lifestyle,
+        family_transition_year,
+        aid_scenario,
+        include_breakdown,
+    )
+    data = entry["data"]
+
+    # Filtering a precomputed ranking keeps its order, and with a limit the
+    # scan stops at the last match needed
+    programs = (
+        p
+        for p in _ranked(entry, sort_by)
+        if (not field or p["field"] == field)
+        and (not funding_tier or p["funding_tier"] == funding_tier)
+        and (not work_country or p["work_country"] == work_country)
+        and (
+            max_initial_capital is None
+            or p.get("initial_capital_usd", 0) <= max_initial_capital
+        )
+    )
+    if limit is not None:
+        programs = islice(programs, max(limit, 0))
+
+    return {
+        **data,
+        "assumptions": dict(data["assumptions"]),
+        "programs": [dict(p) for p in programs],
+        "summary": dict(data["summary"]),
+    }
+
+
+def ranked_programs(
+    aid_scenario: str = "no_aid",
+    sort_by: str = "net_benefit",
+    lifestyle: str = "frugal",
+    include_breakdown: bool = False,
+) -> tuple:
+    """
+    Memoized per-program results for the default baseline, in sort_by order.
+
+    Unlike calculate_all_programs() nothing is copied: the dicts are shared
+    with every other caller and must not be mutated. Meant for endpoints
+    that read every program but only emit (new dicts for) a few.
+    """
+    if sort_by not in PROGRAM_SORT_KEYS:
+        sort_by = "net_benefit"
+    entry = _program_results(None, None, lifestyle, None, aid_scenario, include_breakdown)
+    return _ranked(entry, sort_by)
+
+
+def ranked_initial_capitals(
+    aid_scenario: str = "no_aid",
+    sort_by: str = "net_benefit",
+    lifestyle: str = "frugal",
+    include_breakdown: bool = False,
+) -> tuple:
+    """
+    Initial capital (USD, 0 if missing) of each program, in the same order
+    as ranked_programs() with the same arguments.
+
+    A memoized column, so threshold scans over capital need no per-program
+    dict lookups.
+    """
+    if sort_by not in PROGRAM_SORT_KEYS:
+        sort_by = "net_benefit"
+    entry = _program_results(None, None, lifestyle, None, aid_scenario, include_breakdown)
+    capitals = entry["capitals"].get(sort_by)
+    if capitals is None:
+        capitals = entry["capitals"][sort_by] = tuple(
+            p.get("initial_capital_usd", 0) for p in _ranked(entry, sort_by)
+        )
+    return capitals
+
+
+def clear_cache():
+    """Drop memoized calculate_all_programs() results (e.g. after a data re-import)."""
+    _program_results_cached.cache_clear()
+
+
+def _program_results(
+    baseline_salary: Optional[float],
+    baseline_growth: Optional[float],
+    lifestyle: str,
+    family_transition_year: Optional[int],
+    aid_scenario: str,
+    include_breakdown: bool,
+) -> dict:
+    """
+    Results for one aid scenario: {"data", "ranked", "capitals"}.
+
+    Only the default baseline with a known aid scenario is memoized; the
+    remaining parameters are discrete, so the cache stays small. Custom
+    baseline salary/growth values are client-supplied floats and are
+    computed per call rather than filling the cache with one full result
+    set per distinct value.
     """
-    if baseline_salary is None:
-        baseline_salary = BASELINE_ANNUAL_SALARY_USD_K
-    if baseline_growth is None:
-        baseline_growth = BASELINE_ANNUAL_GROWTH
     if family_transition_year is None:
         family_transition_year = FAMILY_TRANSITION_YEAR
+    if (
+        baseline_salary in (None, BASELINE_ANNUAL_SALARY_USD_K)
+        and baseline_growth in (None, BASELINE_ANNUAL_GROWTH)
+        and aid_scenario in AID_SCENARIOS
+    ):
+        return _program_results_cached(
+            lifestyle, family_transition_year, include_breakdown
+        )[aid_scenario]
+
+    return _calculate_program_results(
+        BASELINE_ANNUAL_SALARY_USD_K if baseline_salary is None else baseline_salary,
+        BASELINE_ANNUAL_GROWTH if baseline_growth is None else baseline_growth,
+        lifestyle,
+        family_transition_year,
+        (aid_scenario,),
+        include_breakdown,
+    )[aid_scenario]
+
+
+def _ranked(entry: dict, sort_by: str) -> tuple:
+    """entry's programs ordered by sort_by, sorted once per entry and key."""
+    ranked = entry["ranked"].get(sort_by)
+    if ranked is None:
+        ranked = entry["ranked"][sort_by] = tuple(
+            sorted(
+                entry["data"]["programs"],
+                key=itemgetter(PROGRAM_SORT_KEYS[sort_by]),
+                reverse=sort_by not in ASCENDING_SORTS,
+            )
+        )
+    return ranked
+
+
+# Default-baseline result sets kept: lifestyle x family year x breakdown
+PROGRAM_CACHE_SIZE = 16
+
+
+@lru_cache(maxsize=PROGRAM_CACHE_SIZE)
+def _program_results_cached(
+    lifestyle: str,
+    family_transition_year: int,
+    include_breakdown: bool,
+) -> dict:
+    """
+    Default-baseline results for every aid scenario, computed in one pass.
+
+    Switching aid scenarios only changes tuition, co-op and initial capital,
+    so the first request for any scenario computes them all. Each
+    scenario's rankings are built lazily inside its entry, so they are
+    evicted together with the results they order.
+    """
+    return _calculate_program_results(
+        BASELINE_ANNUAL_SALARY_USD_K,
+        BASELINE_ANNUAL_GROWTH,
+        lifestyle,
+        family_transition_year,
+        AID_SCENARIOS,
+        include_breakdown,
+    )
+
 
+def _calculate_program_results(
+    baseline_salary: float,
+    baseline_growth: float,
+    lifestyle: str,
+    family_transition_year: int,
+    aid_scenarios: tuple,
+    include_breakdown: bool,
+) -> dict:
+    """
+    Every program's results for each of aid_scenarios in one pass, as
+    {aid_scenario: {"data": payload, "ranked": {}, "capitals": {}}}.
+    """
     with get_db() as conn:
         cursor = conn.cursor()
 
@@ -400,7 +692,7 @@ def calculate_all_programs(
             ORDER BY p.net_10yr_usd DESC
         """)
 
-        programs = [dict(row) for row in cursor.fetchall()]
+        programs = fetch_dicts(cursor)
 
     baseline = calculate_baseline_networth(
         baseline_salary,
@@ -410,23 +702,50 @@ def calculate_all_programs(
     )
     baseline_total = baseline["total_networth_k"]
 
-    results = []
-    for prog in programs:
-        result = calculate_program_networth(
+    per_program = [
+        calculate_program_networth_batch(
             prog,
             baseline_total,
+            scenarios=aid_scenarios,
             lifestyle=lifestyle,
             family_transition_year=family_transition_year,
-            aid_scenario=aid_scenario,
+            include_breakdown=include_breakdown,
         )
-        results.append(result)
+        for prog in programs
+    ]
 
+    return {
+        aid_scenario: {
+            "data": _summarize_programs(
+                [by_scenario[aid_scenario] for by_scenario in per_program],
+                baseline,
+                baseline_salary,
+                baseline_growth,
+                lifestyle,
+                family_transition_year,
+                aid_scenario,
+            ),
+            "ranked": {},
+            "capitals": {},
+        }
+        for aid_scenario in aid_scenarios
+    }
+
+
+def _summarize_programs(
+    results: list,
+    baseline: dict,
+    baseline_salary: float,
+    baseline_growth: float,
+    lifestyle: str,
+    family_transition_year: int,
+    aid_scenario: str,
+) -> dict:
+    """The calculate_all_programs() payload for one scenario's results."""
     # Sort by net benefit descending
-    results.sort(key=lambda x: x["net_benefit_k"], reverse=True)
+    results.sort(key=itemgetter("net_benefit_k"), reverse=True)
 
     # Compute summary statistics
-    from collections import defaultdict
-
     tier_benefits = defaultdict(list)
     field_benefits = defaultdict(list)
     country_benefits = defaultdict(list)
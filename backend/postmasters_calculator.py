@@ -12,14 +12,18 @@ This calculator extends networth_calculator.py by modeling career branching
 after graduation, with location-dependent probabilities and outcomes.
 """
 
+import heapq
 import json
 import sqlite3
 from collections import defaultdict
 from dataclasses import dataclass
+from functools import lru_cache
+from operator import itemgetter
 from typing import Optional
 
 from config import (
     DB_PATH,
+    fetch_dicts,
     get_db,
     MASTERS_TOTAL_YEARS,
     MASTERS_DEFAULT_FAMILY_YEAR,
@@ -68,6 +72,25 @@ class PostmastersNode:
 
 
 def get_postmasters_nodes() -> dict[str, PostmastersNode]:
+    """
+    All post-masters nodes keyed by id.
+
+    Served from an in-memory index loaded on first use, so the per-path
+    calculations don't re-query the table and re-decode every node's
+    children JSON (postmasters_nodes only changes on re-import;
+    clear_cache() drops it). Returns a fresh dict; the nodes themselves are
+    shared and must not be mutated.
+    """
+    return dict(_postmasters_nodes())
+
+
+def clear_cache():
+    """Drop the memoized node index (e.g. after a data re-import)."""
+    _postmasters_nodes.cache_clear()
+
+
+@lru_cache(maxsize=1)
+def _postmasters_nodes() -> dict[str, PostmastersNode]:
     """Load all post-masters nodes from database."""
     with get_db() as conn:
         cursor = conn.cursor()
@@ -100,8 +123,7 @@ def get_postmasters_edges() -> list[dict]:
     with get_db() as conn:
         cursor = conn.cursor()
         cursor.execute("SELECT * FROM postmasters_edges")
-        rows = cursor.fetchall()
-    return [dict(row) for row in rows]
+        return fetch_dicts(cursor)
 
 
 def get_edges_by_source() -> dict[str, list[dict]]:
@@ -577,7 +599,7 @@ def calculate_expected_networth(
         })
 
     # Sort by net worth for percentile calculations
-    path_results.sort(key=lambda x: x["net_worth_k"])
+    path_results.sort(key=itemgetter("net_worth_k"))
 
     # Calculate expected value (probability-weighted sum)
     expected_nw = sum(p["weighted_nw_k"] for p in path_results)
@@ -610,8 +632,9 @@ def calculate_expected_networth(
         if p90 is None and cumulative_prob >= 0.90:
             p90 = nw
 
-    # Sort results by weighted contribution for display
-    path_results.sort(key=lambda x: x["weighted_nw_k"], reverse=True)
+    # Top paths by weighted contribution for display; a bounded heap avoids
+    # sorting every path just to keep ten (same order as sort + slice)
+    top_paths = heapq.nlargest(10, path_results, key=itemgetter("weighted_nw_k"))
 
     return {
         "program_id": program.get("id"),
@@ -629,7 +652,7 @@ def calculate_expected_networth(
             "bigtech_presence": ecosystem.bigtech_presence if ecosystem else "none",
         },
         "num_paths": len(path_results),
-        "top_paths": path_results[:10],  # Top 10 by weighted contribution
+        "top_paths": top_paths,
     }
 
 
@@ -680,5 +703,5 @@ def compare_program_ecosystems(
         })
 
     # Sort by expected net worth
-    results.sort(key=lambda x: x["expected_networth_k"], reverse=True)
+    results.sort(key=itemgetter("expected_networth_k"), reverse=True)
     return results
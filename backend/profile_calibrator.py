@@ -14,8 +14,8 @@ keep their independent base probabilities since they don't participate
 in the sum-to-1.0 constraint).
 """
 
-import sqlite3
 from collections import defaultdict
+from functools import lru_cache
 from pathlib import Path
 
 try:
@@ -23,7 +23,8 @@ try:
 except ImportError:
     import tomli as tomllib  # fallback for Python 3.10
 
-from config import DB_PATH
+from config import fetch_dicts, fetch_one, get_db
+from query_builder import QueryBuilder
 
 # ─── Load calibration weights from TOML ─────────────────────────────────────
 _WEIGHTS_PATH = Path(__file__).parent / "calibration_weights.toml"
@@ -56,21 +57,13 @@ VALID_QUANT = ("strong", "moderate", "weak")
 
 def get_profile(conn=None):
     """Load user profile from database, returns dict."""
-    close_conn = False
     if conn is None:
-        conn = sqlite3.connect(DB_PATH)
-        conn.row_factory = sqlite3.Row
-        close_conn = True
+        with get_db() as conn:
+            return get_profile(conn)
 
-    cursor = conn.cursor()
-    cursor.execute("SELECT * FROM user_profile WHERE id = 1")
-    row = cursor.fetchone()
-
-    if close_conn:
-        conn.close()
+    profile = fetch_one(conn, "SELECT * FROM user_profile WHERE id = 1")
 
-    if row:
-        profile = dict(row)
+    if profile:
         profile.pop("id", None)
         return profile
 
@@ -83,11 +76,9 @@ def save_profile(profile_data, conn=None):
     Validates fields and merges with defaults for missing fields.
     Returns the saved profile dict.
     """
-    close_conn = False
     if conn is None:
-        conn = sqlite3.connect(DB_PATH)
-        conn.row_factory = sqlite3.Row
-        close_conn = True
+        with get_db() as conn:
+            return save_profile(profile_data, conn)
 
     # Merge with defaults
     merged = dict(DEFAULT_PROFILE)
@@ -157,9 +148,6 @@ def save_profile(profile_data, conn=None):
     )
     conn.commit()
 
-    if close_conn:
-        conn.close()
-
     return merged
 
 
@@ -612,39 +600,59 @@ MULTIPLIER_RULES = [
 ]
 
 
-def calibrate_edges(profile=None, conn=None):
+def calibrate_edges(
+    profile=None,
+    conn=None,
+    source_id=None,
+    target_id=None,
+    link_type=None,
+    node_type=None,
+):
     """
-    Load all edges from database, apply profile-based multipliers,
+    Load edges from database, apply profile-based multipliers,
     re-normalize child groups to sum to 1.0, and return calibrated edges.
 
     Args:
         profile: dict of profile values, or None to load from DB.
         conn: optional SQLite connection.
+        source_id: only calibrate edges leaving this node.
+        target_id: only return edges entering this node. Whole child groups
+            of the matching sources are still loaded so normalization is
+            unchanged.
+        link_type: only calibrate edges of this link type.
+        node_type: only calibrate edges whose source node has this node_type.
 
     Returns:
         list of edge dicts with 'calibrated_probability' added.
         Each edge dict has: id, source_id, target_id, probability (base),
         calibrated_probability, link_type, note, multiplier.
     """
-    close_conn = False
     if conn is None:
-        conn = sqlite3.connect(DB_PATH)
-        conn.row_factory = sqlite3.Row
-        close_conn = True
+        with get_db() as conn:
+            return calibrate_edges(profile, conn, source_id, target_id, link_type, node_type)
 
     if profile is None:
         profile = get_profile(conn)
 
-    # Load all edges
-    cursor = conn.cursor()
-    cursor.execute(
+    # Filters on source node or link type keep child groups intact, so they can
+    # be pushed into SQL directly
+    qb = QueryBuilder(
         "SELECT id, source_id, target_id, probability, link_type, note FROM edges"
     )
-    rows = cursor.fetchall()
-    edges = [dict(row) for row in rows]
+    qb.add_filter("source_id = ?", source_id)
+    qb.add_filter("link_type = ?", link_type)
+    qb.add_filter(
+        "source_id IN (SELECT id FROM career_nodes WHERE node_type = ?)", node_type
+    )
+    qb.add_filter(
+        "source_id IN (SELECT source_id FROM edges WHERE target_id = ?)", target_id
+    )
+    qb.order_by("id")
+    query, params = qb.build()
 
-    if close_conn:
-        conn.close()
+    cursor = conn.cursor()
+    cursor.execute(query, params)
+    edges = fetch_dicts(cursor)
 
     # Apply multipliers to each edge
     for edge in edges:
@@ -684,9 +692,50 @@ def calibrate_edges(profile=None, conn=None):
     for edge in edges:
         edge.pop("raw_adjusted", None)
 
+    if target_id:
+        edges = [e for e in edges if e["target_id"] == target_id]
+
     return edges
 
 
+def get_cached_calibrated_edges(
+    profile, source_id=None, target_id=None, link_type=None, node_type=None
+):
+    """
+    Memoized calibrate_edges() for the API.
+
+    Calibration depends only on the profile values and the edges table, so
+    results are keyed by the profile's contents: a profile update with new
+    values misses the cache, reloading with an unchanged profile hits it.
+    Call clear_cache() after re-importing edges.
+
+    Returns fresh edge dicts; callers may modify them freely.
+    """
+    edges = _calibrate_edges_cached(
+        tuple(sorted(profile.items())), source_id, target_id, link_type, node_type
+    )
+    return [dict(e) for e in edges]
+
+
+def clear_cache():
+    """Drop memoized calibrated edges (e.g. after an edges re-import)."""
+    _calibrate_edges_cached.cache_clear()
+
+
+@lru_cache(maxsize=128)
+def _calibrate_edges_cached(profile_items, source_id, target_id, link_type, node_type):
+    """Memoized body of get_cached_calibrated_edges(); profile as sorted items."""
+    with get_db() as conn:
+        return calibrate_edges(
+            profile=dict(profile_items),
+            conn=conn,
+            source_id=source_id,
+            target_id=target_id,
+            link_type=link_type,
+            node_type=node_type,
+        )
+
+
 def get_calibrated_edge_map(profile=None, conn=None):
     """
     Convenience function: returns calibrated edges as a nested dict
@@ -944,40 +993,39 @@ PM_MULTIPLIER_RULES = [
 ]
 
 
-def calibrate_postmasters_edges(profile=None, ecosystem=None, conn=None):
+def calibrate_postmasters_edges(profile=None, ecosystem=None, conn=None, source_id=None):
     """
-    Load all post-masters edges, apply profile + location multipliers,
+    Load post-masters edges, apply profile + location multipliers,
     re-normalize child groups to sum to 1.0, and return calibrated edges.
 
     Args:
         profile: dict of profile values, or None to load from DB.
         ecosystem: LocationEcosystem for location-based adjustments.
         conn: optional SQLite connection.
+        source_id: only calibrate edges leaving this node. Child groups are
+            per source, so normalization is unchanged.
 
     Returns:
         list of edge dicts with 'calibrated_probability' added.
     """
-    close_conn = False
     if conn is None:
-        conn = sqlite3.connect(DB_PATH)
-        conn.row_factory = sqlite3.Row
-        close_conn = True
+        with get_db() as conn:
+            return calibrate_postmasters_edges(profile, ecosystem, conn, source_id)
 
     if profile is None:
         profile = get_profile(conn)
 
-    # Load all post-masters edges
+    qb = QueryBuilder(
+        "SELECT id, source_id, target_id, base_probability, "
+        "startup_ecosystem_weight, bigtech_presence_weight, link_type, note "
+        "FROM postmasters_edges"
+    )
+    qb.add_filter("source_id = ?", source_id)
+    query, params = qb.build()
+
     cursor = conn.cursor()
-    cursor.execute("""
-        SELECT id, source_id, target_id, base_probability,
-               startup_ecosystem_weight, bigtech_presence_weight, link_type, note
-        FROM postmasters_edges
-    """)
-    rows = cursor.fetchall()
-    edges = [dict(row) for row in rows]
-
-    if close_conn:
-        conn.close()
+    cursor.execute(query, params)
+    edges = fetch_dicts(cursor)
 
     # Get location weights from config
     loc_weights = _W.get("pm_location", {})
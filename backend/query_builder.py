@@ -24,6 +24,11 @@ class QueryBuilder:
     - Skipping None/empty filter values
     - Proper WHERE 1=1 pattern for conditional appending
     - Parameter collection for safe SQL execution
+
+    Values are always bound as parameters, never inlined, so a given set of
+    active filters yields the same SQL text and reuses the connection's
+    prepared-statement cache. Each combination keeps its own index-friendly
+    plan, unlike a catch-all "(? IS NULL OR col = ?)" statement.
     """
 
     def __init__(self, base_query: str):
@@ -138,6 +143,7 @@ class QueryBuilder:
             parts.append(f"ORDER BY {self._order_clause}")
 
         if self._limit is not None:
-            parts.append(f"LIMIT {self._limit}")
+            parts.append("LIMIT ?")
+            params.append(self._limit)
 
         return " ".join(parts), params
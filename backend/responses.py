@@ -0,0 +1,399 @@
+"""
+JSON Response Helpers
+=====================
+Fast JSON responses for the heavy endpoints.
+
+Uses orjson when it is installed and falls back to the stdlib encoder
+otherwise. Output follows jsonify's conventions: sorted keys, compact
+separators and a trailing newline.
+
+Usage:
+    app.json = OrjsonProvider(app)  # route jsonify() through orjson as well
+    return json_response({"count": len(rows), "programs": rows})
+    return stream_json_object({"count": n}, {"programs": programs})
+    if wants_ndjson():  # client sent Accept: application/x-ndjson
+        return stream_ndjson({"count": n}, {"programs": programs})
+    if wants_msgpack():  # client sent Accept: application/msgpack
+        return msgpack_response(data)
+
+    @etag_cached(dataset_version)  # 304 for repeat requests on unchanged data
+    @response_cached  # reuse encoded bodies of read-only GET endpoints (+ content ETag)
+
+    app.after_request(compress_response)  # gzip bodies for clients that accept it
+"""
+
+import gzip
+import hashlib
+import json
+import threading
+import zlib
+from collections import OrderedDict
+from functools import wraps
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable
+
+from flask import Response, current_app, make_response, request, stream_with_context
+from flask.json.provider import DefaultJSONProvider
+
+from config import CODE_VERSION
+
+try:
+    import orjson
+except ImportError:  # optional speedup
+    orjson = None
+
+try:
+    import ormsgpack
+except ImportError:  # optional binary encoding
+    ormsgpack = None
+
+MIMETYPE = "application/json"
+MSGPACK_MIMETYPE = "application/msgpack"
+NDJSON_MIMETYPE = "application/x-ndjson"
+
+
+ORJSON_OPTIONS = orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS if orjson is not None else 0
+
+
+def dumps(obj: Any) -> bytes:
+    """Serialize obj to compact, key-sorted JSON bytes."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=ORJSON_OPTIONS)
+    return json.dumps(obj, separators=(",", ":"), sort_keys=True).encode()
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """
+    app.json provider backed by orjson, so plain jsonify() calls and
+    request.get_json() skip the stdlib encoder too.
+
+    Falls back to DefaultJSONProvider when orjson is not installed or when
+    a caller passes json.dumps-specific keyword arguments. Types orjson
+    cannot encode natively go through DefaultJSONProvider.default.
+
+    Output is compact even when app.debug is on: Flask 3 ignores the old
+    JSONIFY_PRETTYPRINT_REGULAR key and indents debug responses unless
+    compact is set, which only the stdlib fallback would otherwise honour.
+    """
+
+    compact = True
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        if orjson is None or kwargs:
+            return super().dumps(obj, **kwargs)
+        return orjson.dumps(obj, default=self.default, option=ORJSON_OPTIONS).decode()
+
+    def loads(self, s, **kwargs: Any) -> Any:
+        if orjson is None or kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args: Any, **kwargs: Any) -> Response:
+        if orjson is None:
+            return super().response(*args, **kwargs)
+        obj = self._prepare_response_obj(args, kwargs)
+        body = orjson.dumps(obj, default=self.default, option=ORJSON_OPTIONS)
+        return self._app.response_class(body + b"\n", mimetype=self.mimetype)
+
+
+# Stands in for a raw value during dumps_spliced(); NUL never occurs in keys
+_RAW_MARKER = "\0raw:"
+
+
+def dumps_spliced(obj: Dict[str, Any], raw: Dict[str, bytes]) -> bytes:
+    """
+    dumps(obj) with already-encoded JSON values spliced in.
+
+    raw maps top-level keys to JSON bytes (e.g. text assembled by SQLite);
+    each takes its sorted position among obj's keys without a decode pass.
+    """
+    body = dumps({**obj, **{key: _RAW_MARKER + key for key in raw}})
+    for key, value in raw.items():
+        body = body.replace(dumps(_RAW_MARKER + key), value, 1)
+    return body
+
+
+def raw_json_response(body, status: int = 200) -> Response:
+    """Wrap an already-serialized JSON document (str or bytes)."""
+    if isinstance(body, str):
+        body = body.encode()
+    return Response(body + b"\n", status=status, mimetype=MIMETYPE)
+
+
+def json_response(obj: Any, status: int = 200) -> Response:
+    """Drop-in replacement for jsonify(obj) on large payloads."""
+    return raw_json_response(dumps(obj), status)
+
+
+# Array items encoded per streamed chunk: one dumps() call and one WSGI
+# chunk per batch instead of per item, while the first bytes still go out
+# after the first batch
+STREAM_BATCH_SIZE = 64
+
+
+def _batches(items: Iterable[Any]):
+    """Split items into lists of up to STREAM_BATCH_SIZE."""
+    iterator = iter(items)
+    while batch := list(islice(iterator, STREAM_BATCH_SIZE)):
+        yield batch
+
+
+def _iter_json_object(head: Dict[str, Any], arrays: Dict[str, Iterable[Any]]):
+    """Yield a JSON object: the scalar head fields, then each array batch by batch."""
+    prefix = dumps(head)[:-1]
+    yield prefix
+    separator = b"," if len(prefix) > 1 else b""
+    for key, items in arrays.items():
+        yield separator + dumps(key) + b":["
+        separator = b","
+        first = True
+        for batch in _batches(items):
+            body = dumps(batch)[1:-1]  # the items without the list brackets
+            yield body if first else b"," + body
+            first = False
+        yield b"]"
+    yield b"}\n"
+
+
+def stream_json_object(
+    head: Dict[str, Any], arrays: Dict[str, Iterable[Any]], status: int = 200
+) -> Response:
+    """
+    Stream a JSON object whose bulk is in a few large arrays.
+
+    Args:
+        head: small fields serialized up front (keys sorted).
+        arrays: name -> iterable of items, emitted after head in the given
+            order, STREAM_BATCH_SIZE items per chunk.
+
+    Returns:
+        Response that encodes items lazily instead of building the whole body.
+        Gzipped incrementally when the client accepts it (see compress_response).
+    """
+    return _stream_response(_iter_json_object(head, arrays), MIMETYPE, status)
+
+
+def _iter_ndjson(head: Dict[str, Any], arrays: Dict[str, Iterable[Any]]):
+    """Yield one JSON line for head (as {"meta": head}), then one per array item."""
+    yield dumps({"meta": head}) + b"\n"
+    for items in arrays.values():
+        for batch in _batches(items):
+            yield b"".join(dumps(item) + b"\n" for item in batch)
+
+
+def stream_ndjson(
+    head: Dict[str, Any], arrays: Dict[str, Iterable[Any]], status: int = 200
+) -> Response:
+    """
+    Newline-delimited JSON counterpart of stream_json_object.
+
+    The first line is {"meta": head}; every array item follows on its own
+    line, in order, so clients can act on records as they arrive. Array
+    names are not emitted, so items should identify their group themselves.
+    """
+    return _stream_response(_iter_ndjson(head, arrays), NDJSON_MIMETYPE, status)
+
+
+def _stream_response(chunks: Iterable[bytes], mimetype: str, status: int) -> Response:
+    """Wrap encoded chunks in a streamed response, gzipped if the client accepts it."""
+    gzipped = accepts_gzip()
+    if gzipped:
+        chunks = _gzip_stream(chunks, _compress_setting("COMPRESS_LEVEL"))
+
+    response = Response(stream_with_context(chunks), status=status, mimetype=mimetype)
+    response.vary.add("Accept-Encoding")
+    if gzipped:
+        response.headers["Content-Encoding"] = "gzip"
+    return response
+
+
+def wants_msgpack() -> bool:
+    """
+    True if the client explicitly prefers MessagePack over JSON.
+
+    Wildcard Accept headers (browsers, curl) keep getting JSON, as does
+    everyone when ormsgpack is not installed.
+    """
+    if ormsgpack is None:
+        return False
+    best = request.accept_mimetypes.best_match([MIMETYPE, MSGPACK_MIMETYPE])
+    return best == MSGPACK_MIMETYPE
+
+
+def wants_ndjson() -> bool:
+    """True if the client explicitly prefers newline-delimited JSON."""
+    best = request.accept_mimetypes.best_match([MIMETYPE, NDJSON_MIMETYPE])
+    return best == NDJSON_MIMETYPE
+
+
+def msgpack_response(obj: Any, status: int = 200) -> Response:
+    """MessagePack counterpart of json_response; floats stay binary."""
+    body = ormsgpack.packb(obj, option=ormsgpack.OPT_NON_STR_KEYS)
+    response = Response(body, status=status, mimetype=MSGPACK_MIMETYPE)
+    response.vary.add("Accept")
+    return response
+
+
+# ─── Conditional requests ────────────────────────────────────────────────────
+
+
+def request_etag(version: str) -> str:
+    """
+    ETag for the current request against a given data version.
+
+    Covers the path, the query args (order-insensitive) and the negotiated
+    representation, so JSON/MessagePack and gzip/identity bodies never
+    share a tag, plus the code version so a deploy invalidates old tags.
+    blake2b rather than hash() keeps tags stable across processes.
+    """
+    key = repr((CODE_VERSION, request.path, sorted(request.args.items(multi=True)), wants_msgpack(), accepts_gzip()))
+    return f"{version}-{hashlib.blake2b(key.encode(), digest_size=8).hexdigest()}"
+
+
+def etag_cached(version: Callable[[], str]):
+    """
+    Decorator for GET views whose output depends only on the URL and data.
+
+    Answers 304 Not Modified without calling the view when If-None-Match
+    carries the current tag; otherwise tags successful responses.
+    """
+
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            etag = request_etag(version())
+            if etag in request.if_none_match:
+                response = Response(status=304)
+            else:
+                response = make_response(view(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+            response.set_etag(etag)
+            response.vary.update(("Accept", "Accept-Encoding"))
+            return response
+
+        return wrapper
+
+    return decorator
+
+
+# ─── Response cache ──────────────────────────────────────────────────────────
+
+RESPONSE_CACHE_SIZE = 256  # distinct (path, query args) combinations kept
+
+_response_cache = OrderedDict()
+_response_cache_lock = threading.Lock()
+
+
+def _body_etag(body: bytes) -> str:
+    """Content hash used as the ETag of a cached body."""
+    return hashlib.blake2b(body, digest_size=8).hexdigest()
+
+
+def response_cached(view):
+    """
+    Decorator for GET views over data that only changes on re-import.
+
+    Keeps the encoded body of successful, non-streamed responses keyed by
+    path and query args (LRU, RESPONSE_CACHE_SIZE entries), so repeat hits
+    skip SQLite, dict building and serialization. Call
+    clear_response_cache() when the underlying data changes.
+
+    Each body is stored with a hash of its bytes, sent as a weak ETag (weak
+    because compress_response may gzip the same content), and a matching
+    If-None-Match gets an empty 304 instead of the body.
+    """
+
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        key = (request.path, tuple(sorted(request.args.items(multi=True))))
+        with _response_cache_lock:
+            cached = _response_cache.get(key)
+            if cached is not None:
+                _response_cache.move_to_end(key)
+
+        if cached is None:
+            response = make_response(view(*args, **kwargs))
+            if response.status_code != 200 or response.is_streamed:
+                return response
+            body = response.get_data()
+            cached = (body, response.mimetype, _body_etag(body))
+            with _response_cache_lock:
+                _response_cache[key] = cached
+                if len(_response_cache) > RESPONSE_CACHE_SIZE:
+                    _response_cache.popitem(last=False)
+
+        body, mimetype, etag = cached
+        if request.if_none_match.contains_weak(etag):
+            response = Response(status=304)
+            response.vary.add("Accept-Encoding")
+        else:
+            response = Response(body, mimetype=mimetype)
+        response.set_etag(etag, weak=True)
+        return response
+
+    return wrapper
+
+
+def clear_response_cache():
+    """Drop every cached response body."""
+    with _response_cache_lock:
+        _response_cache.clear()
+
+
+# ─── Compression ─────────────────────────────────────────────────────────────
+
+COMPRESS_DEFAULTS = {
+    "COMPRESS_MIMETYPES": ("application/json", "application/msgpack"),
+    "COMPRESS_MIN_SIZE": 1024,  # bytes; smaller bodies are not worth the header
+    "COMPRESS_LEVEL": 5,
+}
+
+
+def _compress_setting(name: str):
+    return current_app.config.get(name, COMPRESS_DEFAULTS[name])
+
+
+def accepts_gzip() -> bool:
+    """True if Accept-Encoding allows gzip (q > 0, directly or via *)."""
+    return request.accept_encodings["gzip"] > 0
+
+
+def _gzip_stream(chunks: Iterable[bytes], level: int):
+    """Gzip an iterable of byte chunks incrementally."""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)  # 31 = gzip container
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def compress_response(response: Response) -> Response:
+    """
+    after_request hook: gzip buffered JSON responses when the client accepts it.
+
+    Bodies below COMPRESS_MIN_SIZE are left alone. Streamed responses are
+    skipped here; stream_json_object compresses those itself.
+    """
+    if (
+        response.status_code < 200
+        or response.status_code >= 300
+        or response.is_streamed
+        or response.mimetype not in _compress_setting("COMPRESS_MIMETYPES")
+        or "Content-Encoding" in response.headers
+    ):
+        return response
+
+    # The body depends on Accept-Encoding even when we end up not compressing
+    response.vary.add("Accept-Encoding")
+    if not accepts_gzip():
+        return response
+
+    body = response.get_data()
+    if len(body) < _compress_setting("COMPRESS_MIN_SIZE"):
+        return response
+
+    response.set_data(gzip.compress(body, compresslevel=_compress_setting("COMPRESS_LEVEL")))
+    response.headers["Content-Encoding"] = "gzip"
+    return response
@@ -20,11 +20,11 @@ Architecture:
     - USA handled specially due to federal + state + city complexity
 """
 
-import sqlite3
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import Optional, Callable
 
-from config import DB_PATH
+from config import get_db
 
 
 # ─── Database Loading ─────────────────────────────────────────────────────────
@@ -32,11 +32,9 @@ from config import DB_PATH
 
 def _load_exchange_rates() -> dict[str, float]:
     """Load exchange rates (local currency per 1 USD) from DB."""
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-    cursor.execute("SELECT currency, rate_per_usd FROM exchange_rates")
-    result = {row[0]: row[1] for row in cursor.fetchall()}
-    conn.close()
+    with get_db() as conn:
+        rows = conn.execute("SELECT currency, rate_per_usd FROM exchange_rates").fetchall()
+    result = {row[0]: row[1] for row in rows}
     return result
 
 
@@ -50,14 +48,13 @@ def _load_all_brackets(
     DB stores 999999999999 for infinity; we convert back to float('inf').
     DB stores thresholds in local currency; we convert to USD using FX rates.
     """
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-    cursor.execute(
-        "SELECT country, scope, threshold_lc, rate, currency "
-        "FROM tax_brackets ORDER BY country, scope, bracket_order"
-    )
+    with get_db() as conn:
+        rows = conn.execute(
+            "SELECT country, scope, threshold_lc, rate, currency "
+            "FROM tax_brackets ORDER BY country, scope, bracket_order"
+        ).fetchall()
     brackets: dict[tuple[str, str], list[tuple[float, float]]] = {}
-    for country, scope, threshold_lc, rate, currency in cursor.fetchall():
+    for country, scope, threshold_lc, rate, currency in rows:
         key = (country, scope)
         if key not in brackets:
             brackets[key] = []
@@ -72,7 +69,6 @@ def _load_all_brackets(
             threshold_usd = threshold_lc / fx[currency]
 
         brackets[key].append((threshold_usd, rate))
-    conn.close()
     return brackets
 
 
@@ -82,11 +78,11 @@ def _load_all_config() -> dict[tuple[str, str, str], float]:
 
     Returns dict keyed by (country, scope, config_key) -> config_value.
     """
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-    cursor.execute("SELECT country, scope, config_key, config_value FROM tax_config")
-    result = {(row[0], row[1], row[2]): row[3] for row in cursor.fetchall()}
-    conn.close()
+    with get_db() as conn:
+        rows = conn.execute(
+            "SELECT country, scope, config_key, config_value FROM tax_config"
+        ).fetchall()
+    result = {(row[0], row[1], row[2]): row[3] for row in rows}
     return result
 
 
@@ -864,6 +860,7 @@ _COUNTRY_TAX_FN: dict[str, Callable[[float], float]] = {
 _GENERIC_EFFECTIVE_RATE = _cfg(_ALL_CONFIG, "_generic", "income", "effective_rate")
 
 
+@lru_cache(maxsize=8192)
 def calculate_annual_tax(
     gross_usd_k: float,
     country: str,
@@ -881,6 +878,10 @@ def calculate_annual_tax(
 
     Returns:
         After-tax annual income in $K USD
+
+    Pure function of its arguments over data loaded at import, so results
+    are memoized: the same salary schedules recur across programs, aid
+    scenarios and lifestyle variants.
     """
     gross = gross_usd_k * 1000  # Convert to full dollars
 
@@ -39,6 +39,13 @@ class TestTaxCalculation:
             f"WA (no state tax) should keep more than CA: WA={after_tax_wa}, CA={after_tax_ca}"
         )
 
+    def test_memoized_matches_uncached(self):
+        """Memoized results should equal a fresh computation."""
+        for args in [(150, "USA", "NY", "NYC"), (90, "Germany"), (0, "UK")]:
+            cached = calculate_annual_tax(*args)
+            assert calculate_annual_tax(*args) == cached
+            assert calculate_annual_tax.__wrapped__(*args) == cached
+
     def test_usa_effective_rate_sanity(self):
         """USA effective rate should be between 15-50% for typical incomes."""
         for salary in [50, 100, 150, 200, 300]:
@@ -391,6 +398,16 @@ class TestBaselineNetworth:
         high_growth = calculate_baseline_networth(baseline_growth=0.15)
         assert high_growth["total_networth_k"] > low_growth["total_networth_k"]
 
+    def test_memoized_baseline_returns_copies(self):
+        """Mutating a returned baseline must not leak into later calls."""
+        first = calculate_baseline_networth(lifestyle="comfortable")
+        first["yearly_breakdown"][0]["after_tax_k"] = -1
+        first["yearly_breakdown"].clear()
+
+        second = calculate_baseline_networth(lifestyle="comfortable")
+        assert len(second["yearly_breakdown"]) == TOTAL_YEARS
+        assert second["yearly_breakdown"][0]["after_tax_k"] != -1
+
 
 class TestProgramNetworth:
     """Test program-level net worth calculation."""
@@ -515,6 +532,47 @@ class TestProgramNetworth:
                 f"Year {yr.get('calendar_year')}: cumulative mismatch"
             )
 
+    def test_batch_matches_single_scenario(self, sample_program):
+        """Batch results should match values pinned from the per-scenario implementation."""
+        from networth_calculator import calculate_program_networth_batch
+
+        aided = dict(
+            sample_program,
+            expected_aid_usd=10,
+            best_case_aid_usd=25,
+            coop_earnings_usd=5,
+            initial_capital_usd=20000,
+        )
+        # Computed with the single-scenario calculate_program_networth() that
+        # predates calculate_program_networth_batch()
+        pinned = {
+            "no_aid": {
+                "tuition_k": 50, "coop_earnings_k": 0, "initial_capital_usd": 20000,
+                "total_study_cost_k": 114.0, "total_work_savings_k": 1051.83,
+                "masters_networth_k": 937.83, "baseline_networth_k": -11.81,
+                "net_benefit_k": 949.64,
+            },
+            "expected": {
+                "tuition_k": 40, "coop_earnings_k": 5, "initial_capital_usd": 18000,
+                "total_study_cost_k": 99.0, "total_work_savings_k": 1051.83,
+                "masters_networth_k": 952.83, "baseline_networth_k": -11.81,
+                "net_benefit_k": 964.64,
+            },
+            "best_case": {
+                "tuition_k": 25, "coop_earnings_k": 5, "initial_capital_usd": 15000,
+                "total_study_cost_k": 84.0, "total_work_savings_k": 1051.83,
+                "masters_networth_k": 967.83, "baseline_networth_k": -11.81,
+                "net_benefit_k": 979.64,
+            },
+        }
+        batch = calculate_program_networth_batch(aided)
+        for scenario, expected in pinned.items():
+            result = batch[scenario]
+            assert result["aid_scenario"] == scenario
+            for key, value in expected.items():
+                assert result[key] == pytest.approx(value, abs=0.01), f"{scenario}: {key}"
+            assert calculate_program_networth(aided, aid_scenario=scenario) == result
+
 
 class TestCalculateAllPrograms:
     """Test the full calculation across all 265 programs."""
@@ -588,6 +646,132 @@ class TestCalculateAllPrograms:
             < default["programs"][0]["net_benefit_k"]
         )
 
+    def test_cached_results_not_mutated_by_callers(self):
+        """Mutating a returned result must not leak into later calls."""
+        first = calculate_all_programs(aid_scenario="expected")
+        first["programs"][0].pop("yearly_breakdown")
+        first["programs"][0]["affordability_tier"] = "affordable"
+        first["summary"]["total_filtered"] = 1
+        first["programs"] = first["programs"][:1]
+
+        second = calculate_all_programs(aid_scenario="expected")
+        assert len(second["programs"]) == 265
+        assert "yearly_breakdown" in second["programs"][0]
+        assert "affordability_tier" not in second["programs"][0]
+        assert "total_filtered" not in second["summary"]
+
+    def test_ranked_programs_match_calculate_all(self):
+        """ranked_programs() should be the uncopied calculate_all_programs() ranking."""
+        from networth_calculator import ranked_programs
+
+        ranked = ranked_programs(aid_scenario="expected", sort_by="cost")
+        copied = calculate_all_programs(
+            aid_scenario="expected", include_breakdown=False, sort_by="cost"
+        )["programs"]
+        assert list(ranked) == copied
+        assert ranked_programs(aid_scenario="expected", sort_by="cost")[0] is ranked[0]
+
+    def test_ranked_initial_capitals_parallel(self):
+        """ranked_initial_capitals() should line up with ranked_programs()."""
+        from networth_calculator import ranked_initial_capitals, ranked_programs
+
+        for sort_by in ("net_benefit", "initial_capital"):
+            programs = ranked_programs(aid_scenario="best_case", sort_by=sort_by)
+            capitals = ranked_initial_capitals(aid_scenario="best_case", sort_by=sort_by)
+            assert capitals == tuple(p["initial_capital_usd"] for p in programs)
+
+    def test_without_breakdown_matches_full(self):
+        """include_breakdown=False should only drop yearly_breakdown."""
+        full = calculate_all_programs(aid_scenario="best_case")
+        compact = calculate_all_programs(aid_scenario="best_case", include_breakdown=False)
+        assert all("yearly_breakdown" not in p for p in compact["programs"])
+        stripped = [
+            {k: v for k, v in p.items() if k != "yearly_breakdown"}
+            for p in full["programs"]
+        ]
+        assert compact["programs"] == stripped
+        assert compact["summary"] == full["summary"]
+
+    def test_sort_filter_limit_match_python(self, all_data):
+        """Filtering and limiting a memoized ranking should match a plain sort."""
+        programs = all_data["programs"]
+        field = programs[0]["field"]
+
+        cheapest = calculate_all_programs(sort_by="cost", limit=5)["programs"]
+        assert cheapest == sorted(programs, key=lambda p: p["total_study_cost_k"])[:5]
+
+        in_field = calculate_all_programs(sort_by="y10", field=field)["programs"]
+        expected = sorted(
+            (p for p in programs if p["field"] == field),
+            key=lambda p: p["y10_salary_k"],
+            reverse=True,
+        )
+        assert in_field == expected
+        assert calculate_all_programs(sort_by="bogus", limit=3)["programs"] == programs[:3]
+        assert calculate_all_programs(limit=-1)["programs"] == []
+
+    def test_custom_baseline_not_memoized(self):
+        """Client-supplied baseline floats should not add cache entries."""
+        from networth_calculator import _program_results_cached, clear_cache
+
+        clear_cache()
+        default = calculate_all_programs(include_breakdown=False)
+        for salary in (12.0, 12.5, 13.0):
+            custom = calculate_all_programs(baseline_salary=salary, include_breakdown=False)
+            assert custom["assumptions"]["baseline_annual_salary_usd_k"] == salary
+        assert _program_results_cached.cache_info().currsize == 1
+        assert calculate_all_programs(baseline_salary=9.5, include_breakdown=False) == default
+        clear_cache()
+
+    def test_aid_scenarios_share_one_pass(self):
+        """All aid scenarios come from one batched pass and match single-scenario runs."""
+        from networth_calculator import (
+            AID_SCENARIOS,
+            _program_results_cached,
+            calculate_program_networth,
+            clear_cache,
+        )
+
+        clear_cache()
+        results = {
+            scenario: calculate_all_programs(
+                lifestyle="comfortable", aid_scenario=scenario, include_breakdown=False
+            )
+            for scenario in AID_SCENARIOS
+        }
+        info = _program_results_cached.cache_info()
+        assert (info.hits, info.misses) == (2, 1)
+
+        for scenario, data in results.items():
+            assert data["assumptions"]["aid_scenario"] == scenario
+            program = data["programs"][0]
+            assert program["aid_scenario"] == scenario
+            single = calculate_program_networth(
+                self._program_row(program["program_id"]),
+                data["baseline"]["total_networth_k"],
+                lifestyle="comfortable",
+                aid_scenario=scenario,
+                include_breakdown=False,
+            )
+            assert single == program
+        clear_cache()
+
+    @staticmethod
+    def _program_row(program_id):
+        from config import fetch_dicts, get_db
+
+        with get_db() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                """
+                SELECT p.*, u.name AS university_name, u.country, u.region
+                FROM programs p JOIN universities u ON p.university_id = u.id
+                WHERE p.id = ?
+                """,
+                (program_id,),
+            )
+            return fetch_dicts(cursor)[0]
+
 
 # ═══════════════════════════════════════════════════════════════════════════════
 # COMFORTABLE LIFESTYLE TIER TESTS
@@ -1561,6 +1745,47 @@ class TestPostmastersCalculator:
         for path in paths:
             assert path[0] == "pm_root", f"Path should start with pm_root: {path}"
 
+    def test_postmasters_nodes_loaded_once(self, monkeypatch):
+        """Node lookups after the first should not touch the database."""
+        import sqlite3
+        from contextlib import contextmanager
+        import postmasters_calculator
+        from config import configure_connection
+        from postmasters_calculator import clear_cache, get_postmasters_nodes
+
+        conn = configure_connection(sqlite3.connect(":memory:"))
+        conn.execute(
+            """CREATE TABLE postmasters_nodes (
+                id TEXT, phase INTEGER, node_type TEXT, label TEXT,
+                salary_multiplier REAL, equity_expected_value_usd INTEGER,
+                base_probability REAL, requires_location_type TEXT,
+                living_cost_location TEXT, tax_country TEXT, color TEXT,
+                note TEXT, children TEXT)"""
+        )
+        conn.execute(
+            "INSERT INTO postmasters_nodes (id, phase, node_type, label, children) "
+            "VALUES ('pm_root', 0, 'root', 'Graduate', '[\"pm_a\"]')"
+        )
+        opened = []
+
+        @contextmanager
+        def fake_get_db():
+            opened.append(conn)
+            yield conn
+
+        monkeypatch.setattr(postmasters_calculator, "get_db", fake_get_db)
+        clear_cache()
+        try:
+            nodes = get_postmasters_nodes()
+            again = get_postmasters_nodes()
+        finally:
+            clear_cache()
+            conn.close()
+
+        assert len(opened) == 1
+        assert again == nodes and again is not nodes
+        assert nodes["pm_root"].children == ["pm_a"]
+
     def test_calculate_path_networth(self, sample_program, sf_ecosystem):
         """Should calculate net worth for a specific path."""
         from postmasters_calculator import calculate_postmasters_path_networth
@@ -1765,6 +1990,37 @@ class TestPostmastersCalibration:
                     f"Node {source} children sum to {total:.2f}, expected ~1.0"
                 )
 
+    def test_source_filter_matches_python_filter(self, high_risk_profile):
+        """source_id in SQL should equal filtering the full calibrated list."""
+        import sqlite3
+        from types import SimpleNamespace
+        from config import configure_connection
+        from profile_calibrator import calibrate_postmasters_edges
+
+        conn = configure_connection(sqlite3.connect(":memory:"))
+        conn.execute(
+            "CREATE TABLE postmasters_edges (id INTEGER PRIMARY KEY, source_id TEXT, "
+            "target_id TEXT, base_probability REAL, startup_ecosystem_weight REAL, "
+            "bigtech_presence_weight REAL, link_type TEXT, note TEXT)"
+        )
+        conn.executemany(
+            "INSERT INTO postmasters_edges VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            [
+                (i, f"pm_{i % 3}", f"pm_t{i}", 0.1 + i * 0.05, (i % 2) * 0.5,
+                 (i % 3) * 0.3, "child" if i % 4 else "transition", None)
+                for i in range(12)
+            ],
+        )
+        ecosystem = SimpleNamespace(startup_ecosystem_strength=1.4, bigtech_presence="strong")
+
+        full = calibrate_postmasters_edges(high_risk_profile, ecosystem, conn)
+        for source in ("pm_0", "pm_1", "pm_2"):
+            filtered = calibrate_postmasters_edges(
+                high_risk_profile, ecosystem, conn, source_id=source
+            )
+            assert filtered == [e for e in full if e["source_id"] == source]
+        conn.close()
+
 
 # ═══════════════════════════════════════════════════════════════════════════════
 # POST-MASTERS API ENDPOINTS (Basic Tests)
@@ -1838,3 +2094,1131 @@ class TestPostmastersAPI:
             pass
         else:
             assert False, f"Unexpected status: {response.status_code}"
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# PROGRAM SEARCH TESTS
+# ═══════════════════════════════════════════════════════════════════════════════
+
+
+class TestProgramSearch:
+    """Test /api/search and the programs_fts full-text index."""
+
+    @pytest.fixture
+    def client(self):
+        """Create test client."""
+        from app import app
+        app.config["TESTING"] = True
+        with app.test_client() as client:
+            yield client
+
+    @pytest.fixture
+    def fts_conn(self):
+        """In-memory DB with minimal programs/universities and the FTS index."""
+        import sqlite3
+        from database import create_search_index
+
+        conn = sqlite3.connect(":memory:")
+        cursor = conn.cursor()
+        cursor.execute(
+            "CREATE TABLE universities (id INTEGER PRIMARY KEY, name TEXT, country TEXT)"
+        )
+        cursor.execute(
+            "CREATE TABLE programs (id INTEGER PRIMARY KEY, university_id INTEGER, "
+            "program_name TEXT, field TEXT)"
+        )
+        create_search_index(cursor)
+        cursor.execute("INSERT INTO universities VALUES (1, 'Stanford University', 'USA')")
+        cursor.execute("INSERT INTO universities VALUES (2, 'TU Munich', 'Germany')")
+        cursor.execute("INSERT INTO programs VALUES (1, 1, 'MS Computer Science', 'CS/SWE')")
+        cursor.execute("INSERT INTO programs VALUES (2, 2, 'MSc Data Engineering', 'AI/ML')")
+        yield conn
+        conn.close()
+
+    def _match(self, conn, text):
+        rows = conn.execute(
+            "SELECT rowid FROM programs_fts WHERE programs_fts MATCH ? ORDER BY rowid",
+            ('"' + text + '"',),
+        ).fetchall()
+        return [r[0] for r in rows]
+
+    def test_fts_substring_match(self, fts_conn):
+        """Trigram index should match substrings case-insensitively, like LIKE."""
+        assert self._match(fts_conn, "stanf") == [1]
+        assert self._match(fts_conn, "germ") == [2]
+        assert self._match(fts_conn, "AI/ML") == [2]
+
+    def test_fts_triggers_track_updates(self, fts_conn):
+        """Index should follow inserts, updates and deletes on the base tables."""
+        fts_conn.execute("UPDATE universities SET name = 'ETH Zurich' WHERE id = 2")
+        assert self._match(fts_conn, "zurich") == [2]
+        fts_conn.execute("DELETE FROM programs WHERE id = 1")
+        assert self._match(fts_conn, "stanf") == []
+
+    def test_search_requires_query(self, client):
+        """GET /api/search without q should return 400."""
+        response = client.get("/api/search")
+        assert response.status_code == 400
+
+    def test_search_returns_matches(self, client):
+        """GET /api/search should return matching programs sorted by Y10 salary."""
+        response = client.get("/api/search?q=Stanford")
+        assert response.status_code == 200
+        data = response.get_json()
+        assert data["count"] >= 1
+        assert all("Stanford" in r["university_name"] for r in data["results"])
+        salaries = [r["y10_salary_usd"] or 0 for r in data["results"]]
+        assert salaries == sorted(salaries, reverse=True)
+
+    def test_short_query_substring_match(self, client):
+        """Short queries match anywhere by default; mode=prefix opts into prefixes."""
+        def contains(r, text, prefix_only=False):
+            columns = ("field", "country", "program_name", "university_name")
+            values = [(r[c] or "").lower() for c in columns]
+            if prefix_only:
+                return any(v.startswith(text) for v in values)
+            return any(text in v for v in values)
+
+        default = client.get("/api/search?q=ml&limit=100000").get_json()
+        assert default["count"] > 0
+        assert all(contains(r, "ml") for r in default["results"])
+        assert any(not contains(r, "ml", prefix_only=True) for r in default["results"])
+        assert client.get("/api/search?q=ml&mode=substring&limit=100000").get_json() == default
+
+        prefix = client.get("/api/search?q=ml&mode=prefix&limit=100000").get_json()
+        assert prefix["count"] < default["count"]
+        assert all(contains(r, "ml", prefix_only=True) for r in prefix["results"])
+
+    def test_like_wildcards_are_literal(self, client):
+        """A bare '%' should not match every program."""
+        data = client.get("/api/search?q=%25").get_json()
+        assert data["count"] == 0
+
+    def test_limit_keeps_top_salaries(self, client):
+        """limit should return the first rows of the full Y10-sorted result."""
+        full = client.get("/api/search?q=U&limit=100000").get_json()
+        assert full["count"] > 50
+        default = client.get("/api/search?q=U").get_json()
+        assert default["results"] == full["results"][:50]
+        top = client.get("/api/search?q=U&limit=3").get_json()
+        assert top["count"] == 3
+        assert top["results"] == full["results"][:3]
+        assert client.get("/api/search?q=U&limit=0").status_code == 400
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# DATABASE CONNECTION TESTS
+# ═══════════════════════════════════════════════════════════════════════════════
+
+
+class TestDatabaseConnection:
+    """Test connection pooling, pragmas and journal mode setup in config."""
+
+    def test_connection_pragmas_applied(self):
+        """get_db() connections should carry the tuned pragmas and Row factory."""
+        import sqlite3
+        from config import get_db
+
+        with get_db() as conn:
+            assert conn.row_factory is sqlite3.Row
+            assert conn.execute("PRAGMA cache_size").fetchone()[0] == -65536
+            assert conn.execute("PRAGMA temp_store").fetchone()[0] == 2  # MEMORY
+            assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+
+    def test_get_db_reuses_pooled_connection(self):
+        """get_db() hands out idle pooled connections, most recently returned first."""
+        from config import get_db
+
+        with get_db() as first:
+            pass
+        with get_db() as second:
+            assert second is first  # returned to the pool, then reused
+            with get_db() as nested:
+                assert nested is not second  # a connection is never shared while checked out
+        # nested went back first, then second; LIFO hands out second again
+        with get_db() as third, get_db() as fourth:
+            assert third is second and fourth is nested
+            assert fourth.execute("SELECT 1").fetchone()[0] == 1
+
+    def test_get_db_rolls_back_on_error(self):
+        """An exception inside get_db() should not leave a transaction open."""
+        from config import get_db
+
+        with pytest.raises(RuntimeError):
+            with get_db() as conn:
+                conn.execute("CREATE TEMP TABLE pool_probe (x INTEGER)")
+                conn.execute("INSERT INTO pool_probe VALUES (1)")
+                raise RuntimeError("boom")
+        with get_db() as conn:
+            assert not conn.in_transaction
+            assert conn.execute("SELECT COUNT(*) FROM pool_probe").fetchone()[0] == 0
+            conn.execute("DROP TABLE pool_probe")
+
+    def test_dataset_version_from_user_version(self):
+        """dataset_version() follows the user_version importers bump."""
+        import sqlite3
+        from config import bump_dataset_version, dataset_version, get_db
+
+        with get_db() as conn:
+            expected = str(conn.execute("PRAGMA user_version").fetchone()[0])
+        assert dataset_version() == expected
+
+        conn = sqlite3.connect(":memory:")
+        assert bump_dataset_version(conn) == 1
+        assert bump_dataset_version(conn) == 2
+        assert conn.execute("PRAGMA user_version").fetchone()[0] == 2
+        conn.close()
+
+    def test_dataset_version_change_clears_caches(self, monkeypatch):
+        """A new dataset version drops each worker's memoized responses."""
+        import app as app_module
+        import responses
+
+        versions = iter(["1", "1", "2"])
+        monkeypatch.setattr(app_module, "dataset_version", lambda: next(versions))
+        monkeypatch.setattr(app_module, "_seen_dataset_version", None)
+        responses.clear_response_cache()
+        with app_module.app.test_client() as client:
+            client.get("/api/universities")
+            client.get("/api/universities")
+            assert len(responses._response_cache) == 1
+            client.get("/api/health")
+            assert len(responses._response_cache) == 0
+        responses.clear_response_cache()
+
+    def test_request_etag_includes_code_version(self, monkeypatch):
+        """A deploy (new code version) should change every ETag."""
+        from flask import Flask
+        import responses
+
+        app = Flask(__name__)
+        with app.test_request_context("/api/networth/career-paths?limit=5"):
+            before = responses.request_etag("3")
+            monkeypatch.setattr(responses, "CODE_VERSION", "other")
+            after = responses.request_etag("3")
+        assert before != after
+        assert before.startswith("3-") and after.startswith("3-")
+
+    def test_enable_wal(self, tmp_path):
+        """enable_wal() should persistently switch a database to WAL."""
+        import sqlite3
+        from config import enable_wal
+
+        db_path = tmp_path / "wal.db"
+        sqlite3.connect(db_path).close()
+        assert enable_wal(db_path) == "wal"
+
+        conn = sqlite3.connect(db_path)
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        conn.close()
+
+    def test_enable_wal_uses_current_db_path(self, tmp_path, monkeypatch):
+        """Without an argument enable_wal() should follow a patched DB_PATH."""
+        import sqlite3
+        import config
+
+        db_path = tmp_path / "scratch.db"
+        sqlite3.connect(db_path).close()
+        monkeypatch.setattr(config, "DB_PATH", db_path)
+        assert config.enable_wal() == "wal"
+
+    def test_fetch_dicts_matches_row_dicts(self):
+        """fetch_dicts() should equal [dict(row) ...] and restore the row factory."""
+        import sqlite3
+        from config import configure_connection, fetch_dicts
+
+        conn = configure_connection(sqlite3.connect(":memory:"))
+        conn.execute("CREATE TABLE t (id INTEGER, name TEXT, score REAL)")
+        conn.executemany("INSERT INTO t VALUES (?, ?, ?)", [(1, "a", 0.5), (2, None, 1.5)])
+
+        expected = [dict(row) for row in conn.execute("SELECT * FROM t ORDER BY id")]
+        cursor = conn.execute("SELECT * FROM t ORDER BY id")
+        assert fetch_dicts(cursor) == expected
+        assert cursor.row_factory is sqlite3.Row
+        assert fetch_dicts(conn.execute("SELECT * FROM t WHERE id > 5")) == []
+        conn.close()
+
+    def test_fetch_rows_returns_columns_and_tuples(self):
+        """fetch_rows() should return column names and plain tuples."""
+        import sqlite3
+        from config import configure_connection, fetch_rows
+
+        conn = configure_connection(sqlite3.connect(":memory:"))
+        conn.execute("CREATE TABLE t (id INTEGER, name TEXT)")
+        conn.executemany("INSERT INTO t VALUES (?, ?)", [(1, "a"), (2, "b")])
+
+        cursor = conn.execute("SELECT * FROM t ORDER BY id")
+        assert fetch_rows(cursor) == (["id", "name"], [(1, "a"), (2, "b")])
+        assert cursor.row_factory is sqlite3.Row
+        conn.close()
+
+    def test_fetch_one_matches_row_dict(self):
+        """fetch_one() should return dict(row), or None, and follow schema changes."""
+        import sqlite3
+        from config import configure_connection, fetch_one
+
+        conn = configure_connection(sqlite3.connect(":memory:"))
+        conn.execute("CREATE TABLE t (id INTEGER, name TEXT)")
+        conn.execute("INSERT INTO t VALUES (1, 'a')")
+        sql = "SELECT * FROM t WHERE id = ?"
+
+        assert fetch_one(conn, sql, (1,)) == dict(conn.execute(sql, (1,)).fetchone())
+        assert fetch_one(conn, sql, (2,)) is None
+        conn.execute("ALTER TABLE t ADD COLUMN score REAL")
+        assert fetch_one(conn, sql, (1,)) == {"id": 1, "name": "a", "score": None}
+        assert conn.row_factory is sqlite3.Row
+        conn.close()
+
+    def test_calibrator_defaults_to_pooled_connection(self, monkeypatch):
+        """Calibrator helpers called without conn should not open new connections."""
+        import sqlite3
+        from config import get_db
+        from profile_calibrator import calibrate_edges, get_profile
+
+        with get_db() as conn:
+            expected_profile = get_profile(conn)
+            expected_edges = calibrate_edges(conn=conn, source_id="root")
+
+        def fail_connect(*args, **kwargs):
+            raise AssertionError("unexpected sqlite3.connect")
+
+        monkeypatch.setattr(sqlite3, "connect", fail_connect)
+        assert get_profile() == expected_profile
+        assert calibrate_edges(source_id="root") == expected_edges
+
+    def test_pool_reuses_connections_across_threads(self):
+        """A thread per request should not open a connection per thread."""
+        import threading
+        from config import POOL_SIZE, _idle_connections, get_db
+
+        seen = set()
+
+        def request():
+            with get_db() as conn:
+                conn.execute("SELECT 1").fetchone()
+                seen.add(id(conn))
+
+        for _ in range(20):
+            thread = threading.Thread(target=request)
+            thread.start()
+            thread.join()
+
+        assert len(seen) == 1
+        assert _idle_connections.qsize() <= POOL_SIZE
+
+    def test_pool_rolls_back_open_transaction(self):
+        """A connection returned mid-transaction is rolled back first."""
+        from config import get_db
+
+        with get_db() as conn:
+            conn.execute("CREATE TEMP TABLE IF NOT EXISTS pool_probe (id INTEGER)")
+            conn.commit()
+            conn.execute("INSERT INTO pool_probe VALUES (1)")
+            assert conn.in_transaction
+        assert not conn.in_transaction
+        assert conn.execute("SELECT COUNT(*) FROM pool_probe").fetchone()[0] == 0
+        conn.execute("DROP TABLE pool_probe")
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# CAREER NODE API TESTS
+# ═══════════════════════════════════════════════════════════════════════════════
+
+
+class TestCareerNodesAPI:
+    """Test /api/career-nodes serialization of stored children JSON."""
+
+    @pytest.fixture
+    def client(self):
+        """Create test client."""
+        from app import app
+        app.config["TESTING"] = True
+        with app.test_client() as client:
+            yield client
+
+    def test_list_children_are_arrays(self, client):
+        """Node children should be emitted as JSON arrays, with prob renamed."""
+        data = client.get("/api/career-nodes").get_json()
+        assert data["count"] == len(data["nodes"]) > 0
+        for node in data["nodes"]:
+            assert isinstance(node["children"], list)
+            assert "prob" in node and "probability" not in node
+            assert "children_json" not in node
+
+    def test_single_node_matches_list(self, client):
+        """GET /api/career-nodes/<id> should return the same node as the list."""
+        first = client.get("/api/career-nodes").get_json()["nodes"][0]
+        response = client.get(f"/api/career-nodes/{first['id']}")
+        assert response.status_code == 200
+        assert response.get_json() == first
+
+    def test_invalid_children_fall_back_to_empty(self):
+        """Malformed stored children should serialize as an empty array."""
+        import json
+        import sqlite3
+        from app import NODE_CHILDREN_SQL, _node_to_json
+
+        conn = sqlite3.connect(":memory:")
+        conn.row_factory = sqlite3.Row
+        conn.execute("CREATE TABLE n (id TEXT, children TEXT)")
+        conn.execute("INSERT INTO n VALUES ('a', 'not json'), ('b', NULL)")
+        rows = conn.execute(f"SELECT *, {NODE_CHILDREN_SQL} FROM n").fetchall()
+        assert [json.loads(_node_to_json(r)) for r in rows] == [
+            {"id": "a", "children": []},
+            {"id": "b", "children": []},
+        ]
+        conn.close()
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# CAREER EDGE CALIBRATION TESTS
+# ═══════════════════════════════════════════════════════════════════════════════
+
+
+class TestCalibrateEdgesFilters:
+    """Test SQL-pushed filters in profile_calibrator.calibrate_edges."""
+
+    @pytest.fixture
+    def all_edges(self):
+        from profile_calibrator import calibrate_edges
+        return calibrate_edges()
+
+    def test_source_filter_matches_full_calibration(self, all_edges):
+        """Filtering by source_id should not change calibrated probabilities."""
+        from profile_calibrator import calibrate_edges
+
+        source_id = next(e["source_id"] for e in all_edges if e["link_type"] == "child")
+        expected = [e for e in all_edges if e["source_id"] == source_id]
+        assert calibrate_edges(source_id=source_id) == expected
+
+    def test_target_filter_keeps_group_normalization(self, all_edges):
+        """Filtering by target_id should still normalize over the whole child group."""
+        from profile_calibrator import calibrate_edges
+
+        target_id = next(e["target_id"] for e in all_edges if e["link_type"] == "child")
+        expected = [e for e in all_edges if e["target_id"] == target_id]
+        assert calibrate_edges(target_id=target_id) == expected
+
+    def test_node_type_and_link_type_filters(self, all_edges):
+        """node_type filters on the source node; link_type on the edge."""
+        from config import get_db
+        from profile_calibrator import calibrate_edges
+
+        with get_db() as conn:
+            career_ids = {
+                row["id"]
+                for row in conn.execute(
+                    "SELECT id FROM career_nodes WHERE node_type = 'career'"
+                )
+            }
+        expected = [
+            e for e in all_edges
+            if e["source_id"] in career_ids and e["link_type"] == "child"
+        ]
+        assert calibrate_edges(node_type="career", link_type="child") == expected
+
+    def test_cached_edges_keyed_by_profile(self, all_edges):
+        """Cached calibration should match a fresh pass and track profile changes."""
+        from profile_calibrator import (
+            _calibrate_edges_cached,
+            calibrate_edges,
+            clear_cache,
+            get_cached_calibrated_edges,
+            get_profile,
+        )
+
+        clear_cache()
+        profile = get_profile()
+        first = get_cached_calibrated_edges(profile)
+        assert first == all_edges
+        first[0]["calibrated_probability"] = -1  # callers get copies
+        assert get_cached_calibrated_edges(dict(profile)) == all_edges
+        assert _calibrate_edges_cached.cache_info().hits == 1
+
+        changed = dict(profile, risk_tolerance="high", years_experience=8.0)
+        assert get_cached_calibrated_edges(changed) == calibrate_edges(profile=changed)
+        assert _calibrate_edges_cached.cache_info().misses == 2
+        clear_cache()
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# JSON RESPONSE HELPER TESTS
+# ═══════════════════════════════════════════════════════════════════════════════
+
+
+class TestJsonResponses:
+    """Test responses.py serialization and streaming helpers."""
+
+    def test_dumps_sorted_compact(self):
+        """dumps() should emit sorted keys with compact separators."""
+        from responses import dumps
+        assert dumps({"b": [1, 2.5, None], "a": "x"}) == b'{"a":"x","b":[1,2.5,null]}'
+
+    def test_dumps_stdlib_fallback(self, monkeypatch):
+        """Without orjson, dumps() should produce equivalent JSON."""
+        import json
+        import responses
+
+        payload = {"b": {"y": 1, "x": [True, None]}, "a": "é"}
+        fast = responses.dumps(payload)
+        monkeypatch.setattr(responses, "orjson", None)
+        assert json.loads(responses.dumps(payload)) == json.loads(fast)
+
+    def test_stream_json_object(self):
+        """Streamed objects should be valid JSON with head fields and arrays."""
+        import json
+        from flask import Flask
+        from responses import stream_json_object
+
+        app = Flask(__name__)
+        with app.test_request_context():
+            response = stream_json_object(
+                {"count": 2}, {"items": [{"id": 1}, {"id": 2}], "empty": []}
+            )
+            body = b"".join(response.response)
+        assert response.mimetype == "application/json"
+        assert json.loads(body) == {"count": 2, "items": [{"id": 1}, {"id": 2}], "empty": []}
+
+    def test_stream_ndjson(self):
+        """NDJSON streams should carry a meta line, then one line per item."""
+        import json
+        from flask import Flask
+        from responses import stream_ndjson
+
+        app = Flask(__name__)
+        with app.test_request_context():
+            response = stream_ndjson({"count": 3}, {"a": [{"id": 1}, {"id": 2}], "b": [{"id": 3}]})
+            body = b"".join(response.response)
+        assert response.mimetype == "application/x-ndjson"
+        assert body.endswith(b"\n")
+        lines = [json.loads(line) for line in body.splitlines()]
+        assert lines == [{"meta": {"count": 3}}, {"id": 1}, {"id": 2}, {"id": 3}]
+
+    def test_stream_batches_items(self):
+        """Large arrays should be encoded in STREAM_BATCH_SIZE chunks, not per item."""
+        import json
+        from flask import Flask
+        from responses import STREAM_BATCH_SIZE, stream_json_object, stream_ndjson
+
+        items = [{"id": i} for i in range(STREAM_BATCH_SIZE * 2 + 1)]
+        app = Flask(__name__)
+        with app.test_request_context():
+            chunks = list(stream_json_object({"n": 1}, {"items": iter(items)}).response)
+            lines = b"".join(stream_ndjson({}, {"items": items}).response).splitlines()
+        assert len(chunks) == 7  # head, "items":[, 3 batches, ], }
+        assert json.loads(b"".join(chunks)) == {"n": 1, "items": items}
+        assert [json.loads(line) for line in lines[1:]] == items
+
+    def test_orjson_provider_jsonify(self, monkeypatch):
+        """jsonify() through OrjsonProvider should match the default provider's JSON."""
+        import json
+        import responses
+        from flask import Flask, jsonify
+        from responses import OrjsonProvider
+
+        app = Flask(__name__)
+        app.json = OrjsonProvider(app)
+        payload = {"b": {"y": 1.5, "x": None}, "a": "é → ü"}
+        with app.app_context():
+            fast = jsonify(payload)
+            monkeypatch.setattr(responses, "orjson", None)
+            slow = jsonify(payload)
+        assert fast.mimetype == "application/json"
+        assert fast.get_data().endswith(b"\n")
+        assert json.loads(fast.get_data()) == json.loads(slow.get_data())
+        assert app.json.loads(b'{"a": [1, 2]}') == {"a": [1, 2]}
+
+    def test_orjson_provider_compact_in_debug(self, monkeypatch):
+        """Debug mode should not switch jsonify() to indented output."""
+        import responses
+        from flask import Flask, jsonify
+        from responses import OrjsonProvider
+
+        app = Flask(__name__)
+        app.debug = True
+        app.json = OrjsonProvider(app)
+        payload = {"rows": [{"id": 1, "name": "a"}, {"id": 2, "name": "b"}]}
+        with app.app_context():
+            fast = jsonify(payload).get_data()
+            monkeypatch.setattr(responses, "orjson", None)
+            slow = jsonify(payload).get_data()
+        assert fast == slow == b'{"rows":[{"id":1,"name":"a"},{"id":2,"name":"b"}]}\n'
+
+    def test_response_cached(self):
+        """response_cached should reuse bodies per query until cleared."""
+        from flask import Flask, request
+        from responses import clear_response_cache, json_response, response_cached
+
+        app = Flask(__name__)
+        calls = []
+
+        @app.route("/items")
+        @response_cached
+        def items():
+            calls.append(request.args.get("n"))
+            if request.args.get("n") == "bad":
+                return json_response({"error": "bad"}, 400)
+            return json_response({"n": request.args.get("n"), "call": len(calls)})
+
+        clear_response_cache()
+        with app.test_client() as client:
+            first = client.get("/items?n=1").get_json()
+            assert client.get("/items?n=1").get_json() == first
+            assert client.get("/items?n=2").get_json()["call"] == 2
+            client.get("/items?n=bad")
+            client.get("/items?n=bad")
+            assert calls == ["1", "2", "bad", "bad"]  # errors are not cached
+            clear_response_cache()
+            assert client.get("/items?n=1").get_json()["call"] == 5
+        clear_response_cache()
+
+    def test_response_cached_etag(self):
+        """Cached bodies carry a content ETag and matching requests get a 304."""
+        import hashlib
+        from app import app
+        from responses import clear_response_cache
+
+        clear_response_cache()
+        with app.test_client() as client:
+            first = client.get("/api/universities")
+            body = first.get_data()
+            etag = first.headers["ETag"]
+            assert etag == 'W/"%s"' % hashlib.blake2b(body, digest_size=8).hexdigest()
+
+            repeat = client.get("/api/universities", headers={"If-None-Match": etag})
+            assert repeat.status_code == 304
+            assert repeat.get_data() == b""
+            assert repeat.headers["ETag"] == etag
+
+            # The tag survives gzip and a cleared cache, since it hashes the content
+            gzipped = client.get("/api/universities", headers={"Accept-Encoding": "gzip"})
+            assert gzipped.headers["ETag"] == etag
+            clear_response_cache()
+            assert client.get("/api/universities", headers={"If-None-Match": etag}).status_code == 304
+            assert client.get("/api/universities", headers={"If-None-Match": 'W/"x"'}).get_data() == body
+        clear_response_cache()
+
+    def test_dumps_spliced(self):
+        """dumps_spliced() should equal dumps() of the decoded raw values."""
+        import json
+        from responses import dumps, dumps_spliced
+
+        raw = {"nodes": b'[{"children":["b","c"],"id":"a"}]', "by_field": b"[]"}
+        obj = {"count": 1, "program_name": "MSc \\u00e9", "edges": [{"id": 1}]}
+        expected = dumps({**obj, **{key: json.loads(value) for key, value in raw.items()}})
+        assert dumps_spliced(obj, raw) == expected
+
+    def test_node_json_matches_decoded_children(self):
+        """Spliced children JSON should equal the old json.loads + re-encode path."""
+        import json
+        import sqlite3
+        from app import NODE_CHILDREN_SQL, _node_to_json
+        from config import configure_connection
+        from responses import dumps
+
+        conn = configure_connection(sqlite3.connect(":memory:"))
+        conn.execute(
+            "CREATE TABLE postmasters_nodes (id TEXT, phase INTEGER, label TEXT, children TEXT)"
+        )
+        conn.executemany(
+            "INSERT INTO postmasters_nodes VALUES (?, ?, ?, ?)",
+            [("pm_a", 0, "Start", '[ "pm_b", "pm_c" ]'), ("pm_b", 1, "Bigtech", None)],
+        )
+        for row in conn.execute(f"SELECT *, {NODE_CHILDREN_SQL} FROM postmasters_nodes"):
+            node = {k: row[k] for k in ("id", "phase", "label")}
+            node["children"] = json.loads(row["children"] or "[]")
+            assert _node_to_json(row) == dumps(node)
+        conn.close()
+
+    def test_stats_body_is_canonical_json(self):
+        """/api/stats splices SQLite JSON; the body should still be sorted and compact."""
+        import json
+        from app import app
+        from responses import dumps
+
+        with app.test_client() as client:
+            body = client.get("/api/stats").get_data()
+        stats = json.loads(body)
+        assert body == dumps(stats) + b"\n"
+        assert set(stats) == {
+            "by_country", "by_field", "by_tier", "salary_stats",
+            "total_programs", "total_universities",
+        }
+        assert sum(f["count"] for f in stats["by_field"]) == stats["total_programs"]
+
+    def test_stats_get_does_not_write(self):
+        """GET /api/stats should only read the database."""
+        from app import app, clear_response_cache
+        from config import get_db
+
+        clear_response_cache()
+        with get_db() as conn, app.test_client() as client:
+            # data_version changes when another connection commits a write
+            before = conn.execute("PRAGMA data_version").fetchone()[0]
+            assert client.get("/api/stats").status_code == 200
+            assert conn.execute("PRAGMA data_version").fetchone()[0] == before
+
+    def test_create_indexes_skips_missing_tables(self):
+        """Indexes on tables a database lacks should be skipped, not fail."""
+        import sqlite3
+        from database import INDEXES, create_indexes
+
+        conn = sqlite3.connect(":memory:")
+        cursor = conn.cursor()
+        cursor.execute(
+            "CREATE TABLE programs (id INTEGER PRIMARY KEY, university_id INTEGER, "
+            "field TEXT, funding_tier TEXT, tuition_usd INTEGER, y10_salary_usd INTEGER)"
+        )
+        create_indexes(cursor)
+        created = {
+            row[0]
+            for row in cursor.execute("SELECT name FROM sqlite_master WHERE type = 'index'")
+        }
+        assert created == {name for name, table, _ in INDEXES if table == "programs"}
+        conn.close()
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# PROFILE CACHE TESTS
+# ═══════════════════════════════════════════════════════════════════════════════
+
+
+class TestProfileRequestCache:
+    """Test the per-request profile memoization in app._cached_profile."""
+
+    def test_profile_loaded_once_per_request(self, monkeypatch):
+        """Repeated lookups in one request should hit the database once."""
+        import app as app_module
+        from app import app, _cached_profile
+
+        calls = []
+        real_get_profile = app_module._get_profile
+
+        def counting_get_profile(conn=None):
+            calls.append(conn)
+            return real_get_profile(conn)
+
+        monkeypatch.setattr(app_module, "_get_profile", counting_get_profile)
+        with app.test_request_context():
+            first = _cached_profile(None)
+            first["gpa"] = -1  # callers get a copy
+            second = _cached_profile(None)
+        assert len(calls) == 1
+        assert second["gpa"] != -1
+
+        with app.test_request_context():
+            _cached_profile(None)
+        assert len(calls) == 2
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# QUERY BUILDER TESTS
+# ═══════════════════════════════════════════════════════════════════════════════
+
+
+class TestQueryBuilder:
+    """Test query_builder.QueryBuilder SQL generation."""
+
+    def _build(self, field, limit=None):
+        from query_builder import QueryBuilder
+
+        qb = QueryBuilder("SELECT * FROM programs p")
+        qb.add_filter("p.field = ?", field)
+        qb.add_filter("p.tuition_usd <= ?", None)
+        qb.order_by("p.id")
+        qb.limit(limit)
+        return qb.build()
+
+    def test_same_filters_same_sql(self):
+        """Different values for the same filters should produce identical SQL."""
+        sql_a, params_a = self._build("AI/ML", limit=5)
+        sql_b, params_b = self._build("CS/SWE", limit=50)
+        assert sql_a == sql_b
+        assert params_a == ["AI/ML", 5]
+        assert params_b == ["CS/SWE", 50]
+
+    def test_skipped_filters(self):
+        """None/empty values should not add WHERE clauses."""
+        sql, params = self._build("")
+        assert "WHERE" not in sql
+        assert params == []
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# RESPONSE COMPRESSION TESTS
+# ═══════════════════════════════════════════════════════════════════════════════
+
+
+class TestResponseCompression:
+    """Test gzip compression of JSON responses (responses.compress_response)."""
+
+    @pytest.fixture
+    def client(self):
+        """Create test client."""
+        from app import app
+        app.config["TESTING"] = True
+        with app.test_client() as client:
+            yield client
+
+    def test_large_json_is_gzipped(self, client):
+        """Large responses should be gzipped when the client accepts it."""
+        import gzip
+        import json
+
+        plain = client.get("/api/career-nodes")
+        zipped = client.get("/api/career-nodes", headers={"Accept-Encoding": "gzip"})
+        assert "Content-Encoding" not in plain.headers
+        assert zipped.headers["Content-Encoding"] == "gzip"
+        assert "Accept-Encoding" in zipped.headers["Vary"]
+        assert len(zipped.data) < len(plain.data)
+        assert json.loads(gzip.decompress(zipped.data)) == plain.get_json()
+
+    def test_gzip_refused_with_zero_quality(self, client):
+        """gzip;q=0 means the client refuses gzip, so the body stays plain."""
+        for header in ("gzip;q=0", "identity, gzip;q=0", "*;q=0"):
+            response = client.get("/api/career-nodes", headers={"Accept-Encoding": header})
+            assert "Content-Encoding" not in response.headers
+        wildcard = client.get("/api/career-nodes", headers={"Accept-Encoding": "*"})
+        assert wildcard.headers["Content-Encoding"] == "gzip"
+
+    def test_streamed_response_is_gzipped(self, client):
+        """Streamed responses should be compressed incrementally."""
+        import gzip
+        import json
+
+        # Consume each streamed body before issuing the next request
+        expected = client.get("/api/affordability").get_json()
+        zipped = client.get("/api/affordability", headers={"Accept-Encoding": "gzip"})
+        assert zipped.headers["Content-Encoding"] == "gzip"
+        assert json.loads(gzip.decompress(zipped.data)) == expected
+
+    def test_affordability_ndjson(self, client):
+        """Accept: application/x-ndjson should stream the same programs line by line."""
+        import json
+
+        expected = client.get("/api/affordability").get_json()
+        response = client.get("/api/affordability", headers={"Accept": "application/x-ndjson"})
+        assert response.mimetype == "application/x-ndjson"
+        assert "Accept" in response.headers["Vary"]
+        meta, *programs = [json.loads(line) for line in response.data.splitlines()]
+        assert meta["meta"]["summary"] == expected["summary"]
+        assert programs == expected["affordable"] + expected["stretch"] + expected["needs_funding"]
+
+    def test_affordability_summary_only(self, client):
+        """summary_only should return the full response's head without program lists."""
+        for query in ("", "available_savings=20000", "available_savings=9000&monthly_side_income=-800"):
+            full = client.get(f"/api/affordability?{query}").get_json()
+            summary = client.get(f"/api/affordability?{query}&summary_only=true").get_json()
+            for key in ("affordable", "stretch", "needs_funding"):
+                del full[key]
+            assert summary == full
+
+    def test_affordability_leaves_rankings_untouched(self, client):
+        """Affordability annotations must not leak into the shared program results."""
+        from networth_calculator import ranked_programs
+
+        client.get("/api/affordability?aid_scenario=no_aid&available_savings=1000").get_data()
+        assert all("affordability_tier" not in p for p in ranked_programs(aid_scenario="no_aid"))
+
+    def test_small_response_not_compressed(self, client):
+        """Bodies under COMPRESS_MIN_SIZE should be sent as-is."""
+        response = client.get("/api/health", headers={"Accept-Encoding": "gzip"})
+        assert "Content-Encoding" not in response.headers
+        assert response.get_json()["status"] == "ok"
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# CAREER PATH NETWORTH TESTS
+# ═══════════════════════════════════════════════════════════════════════════════
+
+
+class TestCalculateAllCareerPaths:
+    """Test memoization and ranking in career_networth_calculator."""
+
+    def test_repeat_calls_hit_cache(self):
+        """Identical parameters should be computed once."""
+        from career_networth_calculator import (
+            _calculate_all_career_paths_cached,
+            calculate_all_career_paths,
+            clear_cache,
+        )
+
+        clear_cache()
+        first = calculate_all_career_paths(lifestyle="comfortable")
+        second = calculate_all_career_paths(lifestyle="comfortable")
+        assert first == second
+        info = _calculate_all_career_paths_cached.cache_info()
+        assert (info.hits, info.misses) == (1, 1)
+
+    def test_cached_results_not_mutated_by_callers(self):
+        """Sorting, slicing and annotating a result must not leak into later calls."""
+        from career_networth_calculator import calculate_all_career_paths
+
+        first = calculate_all_career_paths(node_type="trading")
+        count = len(first["results"])
+        first["results"].sort(key=lambda r: r["y10_income_k"])
+        first["results"][0]["net_benefit_k"] = None
+        first["summary"]["total_filtered"] = 1
+        first["results"] = first["results"][:1]
+
+        second = calculate_all_career_paths(node_type="trading")
+        assert len(second["results"]) == count
+        assert all(r["net_benefit_k"] is not None for r in second["results"])
+        assert "total_filtered" not in second["summary"]
+        benefits = [r["net_benefit_k"] for r in second["results"]]
+        assert benefits == sorted(benefits, reverse=True)
+
+    def test_sort_and_limit_match_full_sort(self):
+        """sort_by/limit should equal sorting and slicing the full result list."""
+        from career_networth_calculator import calculate_all_career_paths
+
+        full = calculate_all_career_paths()["results"]
+        expected = sorted(full, key=lambda r: r["y10_income_k"], reverse=True)[:5]
+        top = calculate_all_career_paths(sort_by="y10", limit=5)
+        assert top["results"] == expected
+        assert top["summary"]["total_nodes"] == len(full)
+
+    def test_endpoint_matches_calculator(self):
+        """/api/networth/career should serialize the calculator result as-is."""
+        import json
+        from app import app
+        from career_networth_calculator import calculate_all_career_paths
+        from responses import dumps
+
+        expected = calculate_all_career_paths(sort_by="y1", limit=3)
+        expected["summary"]["total_filtered"] = 3
+        with app.test_client() as client:
+            response = client.get("/api/networth/career?sort_by=y1&limit=3")
+        assert response.status_code == 200
+        assert response.is_streamed
+        assert response.get_json() == json.loads(dumps(expected))  # int phase keys -> str
+
+    def test_msgpack_negotiation(self):
+        """Explicit Accept: application/msgpack gets MessagePack; wildcards get JSON."""
+        import json
+        ormsgpack = pytest.importorskip("ormsgpack")
+        from app import app
+        from responses import dumps
+
+        url = "/api/networth/career?compact=true&limit=5"
+        with app.test_client() as client:
+            as_json = client.get(url, headers={"Accept": "*/*"})
+            as_msgpack = client.get(url, headers={"Accept": "application/msgpack"})
+        assert as_json.mimetype == "application/json"
+        assert as_msgpack.mimetype == "application/msgpack"
+        assert "Accept" in as_msgpack.headers["Vary"]
+        unpacked = ormsgpack.unpackb(as_msgpack.get_data(), option=ormsgpack.OPT_NON_STR_KEYS)
+        assert json.loads(dumps(unpacked)) == as_json.get_json()  # int phase keys -> str
+
+    def test_etag_not_modified(self):
+        """Repeat requests with a matching If-None-Match should get an empty 304."""
+        from app import app
+
+        with app.test_client() as client:
+            first = client.get("/api/networth/career?compact=true&limit=5")
+            first.get_data()
+            etag = first.headers["ETag"]
+            repeat = client.get(
+                "/api/networth/career?limit=5&compact=true", headers={"If-None-Match": etag}
+            )
+            other = client.get("/api/networth/career?limit=6", headers={"If-None-Match": etag})
+            other.get_data()
+        assert repeat.status_code == 304
+        assert repeat.get_data() == b""
+        assert repeat.headers["ETag"] == etag
+        assert other.status_code == 200
+        assert other.headers["ETag"] != etag
+
+    def test_program_compare_etag(self):
+        """The aid-scenario comparison is tagged and revalidates with a 304."""
+        from app import app
+
+        with app.test_client() as client:
+            first = client.get("/api/networth/1/compare?lifestyle=comfortable")
+            etag = first.headers["ETag"]
+            repeat = client.get(
+                "/api/networth/1/compare?lifestyle=comfortable",
+                headers={"If-None-Match": etag},
+            )
+            missing = client.get("/api/networth/999999/compare")
+        assert first.status_code == 200
+        assert repeat.status_code == 304
+        assert missing.status_code == 404
+        assert "ETag" not in missing.headers
+
+    def test_node_report_matches_direct_calculation(self):
+        """calculate_career_node_report should equal node networth plus baseline."""
+        from career_networth_calculator import (
+            _career_node_report_cached,
+            calculate_career_baseline,
+            calculate_career_node_networth,
+            calculate_career_node_report,
+            clear_cache,
+        )
+        from config import get_db
+
+        with get_db() as conn:
+            node = dict(
+                conn.execute(
+                    "SELECT * FROM career_nodes WHERE y10_income_usd > 0 LIMIT 1"
+                ).fetchone()
+            )
+        baseline = calculate_career_baseline(lifestyle="comfortable", family_transition_year=5)
+        expected = calculate_career_node_networth(
+            node,
+            baseline["total_networth_k"],
+            lifestyle="comfortable",
+            family_transition_year=5,
+        )
+        expected["baseline"] = baseline
+
+        clear_cache()
+        for _ in range(2):
+            report = calculate_career_node_report(
+                node, lifestyle="comfortable", family_transition_year=5
+            )
+            assert report == expected
+            report["baseline"] = None  # top-level dict is a copy
+        assert _career_node_report_cached.cache_info().hits == 1
+
+    def test_get_career_node_index(self):
+        """get_career_node should return copies from the in-memory index."""
+        from career_networth_calculator import NODE_NETWORTH_COLUMNS, get_career_node
+        from config import get_db
+
+        with get_db() as conn:
+            row = conn.execute(
+                f"SELECT {NODE_NETWORTH_COLUMNS} FROM career_nodes LIMIT 1"
+            ).fetchone()
+        node = get_career_node(row["id"])
+        assert node == dict(row)
+        node["label"] = "changed"
+        assert get_career_node(row["id"])["label"] == row["label"]
+        assert get_career_node("no_such_node") is None
+
+    def test_node_endpoint_uses_index(self):
+        """/api/networth/career/<id> should serve indexed nodes and 404 unknown ids."""
+        from app import app
+        from config import get_db
+
+        with get_db() as conn:
+            node_id = conn.execute(
+                "SELECT id FROM career_nodes WHERE y10_income_usd > 0 LIMIT 1"
+            ).fetchone()["id"]
+        with app.test_client() as client:
+            response = client.get(f"/api/networth/career/{node_id}?lifestyle=comfortable")
+            assert response.status_code == 200
+            assert response.get_json()["node_id"] == node_id
+            assert client.get("/api/networth/career/no_such_node").status_code == 404
+
+    def test_node_batch_matches_single(self):
+        """POST /api/networth/career/batch should match per-node GETs, baseline sent once."""
+        from app import app
+        from config import get_db
+
+        with get_db() as conn:
+            node_ids = [
+                row["id"]
+                for row in conn.execute(
+                    "SELECT id FROM career_nodes WHERE y10_income_usd > 0 LIMIT 3"
+                )
+            ]
+        url = "/api/networth/career/batch?lifestyle=comfortable&family_year=4"
+        with app.test_client() as client:
+            response = client.post(url, json={"ids": node_ids + ["no_such_node"]})
+            singles = [
+                client.get(f"/api/networth/career/{node_id}?lifestyle=comfortable&family_year=4")
+                .get_json()
+                for node_id in node_ids
+            ]
+            assert client.post(url, json={"ids": "p1"}).status_code == 400
+            assert client.post(url, data="not json").status_code == 400
+
+        data = response.get_json()
+        assert response.status_code == 200
+        assert data["count"] == len(node_ids)
+        assert data["not_found"] == ["no_such_node"]
+        assert data["baseline"] == singles[0]["baseline"]
+        assert data["results"] == [
+            {k: v for k, v in single.items() if k != "baseline"} for single in singles
+        ]
+
+    def test_without_breakdown_matches_full(self):
+        """include_breakdown=False should only drop yearly_breakdown from results."""
+        from career_networth_calculator import calculate_all_career_paths
+
+        full = calculate_all_career_paths(family_transition_year=6)
+        compact = calculate_all_career_paths(family_transition_year=6, include_breakdown=False)
+        assert all("yearly_breakdown" not in r for r in compact["results"])
+        stripped = [
+            {k: v for k, v in r.items() if k != "yearly_breakdown"}
+            for r in full["results"]
+        ]
+        assert compact["results"] == stripped
+        assert compact["summary"] == full["summary"]
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# VALIDATOR TESTS
+# ═══════════════════════════════════════════════════════════════════════════════
+
+
+class TestParamValidators:
+    """Test validators.ParamValidator type coercion."""
+
+    def test_bool_flags(self):
+        """Bool params accept common spellings; missing or empty use the default."""
+        from validators import COMPACT, LEAF_ONLY, validate_params
+
+        def parse(args):
+            params, error = validate_params(args, [COMPACT, LEAF_ONLY])
+            assert error is None
+            return params["compact"], params["leaf_only"]
+
+        assert parse({}) == (False, True)
+        assert parse({"compact": "TRUE", "leaf_only": "false"}) == (True, False)
+        assert parse({"compact": "1", "leaf_only": "off"}) == (True, False)
+        assert parse({"compact": "", "leaf_only": ""}) == (False, True)
+
+    def test_bool_flag_rejects_unknown_token(self):
+        """An unrecognized bool value should be a 400, like other typed params."""
+        from app import app
+
+        with app.test_client() as client:
+            response = client.get("/api/networth?compact=maybe")
+        assert response.status_code == 400
+        assert "compact" in response.get_json()["error"]
+
+    def test_ecosystem_filters_validated(self):
+        """/api/ecosystems should reject malformed filters with a 400."""
+        from app import app
+
+        with app.test_client() as client:
+            visa = client.get("/api/ecosystems?has_entrepreneur_visa=maybe")
+            strength = client.get("/api/ecosystems?min_startup_strength=high")
+        assert visa.status_code == 400
+        assert "has_entrepreneur_visa" in visa.get_json()["error"]
+        assert strength.status_code == 400
+        assert strength.get_json()["error"] == "min_startup_strength must be a number"
+
+    def test_negative_limit_rejected(self):
+        """A negative limit should be a 400 rather than an empty result."""
+        from app import app
+
+        with app.test_client() as client:
+            for url in ("/api/networth?limit=-1", "/api/networth/career?limit=-5"):
+                response = client.get(url)
+                assert response.status_code == 400
+                assert response.get_json()["error"] == "limit must be a non-negative integer"
+
+    def test_optional_params_are_shared(self):
+        """optional_param() reuses one validator per name and type."""
+        from validators import LIFESTYLE, optional_param, validate_params
+
+        assert optional_param("limit", int) is optional_param("limit", int)
+        assert isinstance(LIFESTYLE.valid_values, frozenset)
+
+        schema = [LIFESTYLE, optional_param("limit", int), optional_param("field", str)]
+        params, error = validate_params({"limit": "5"}, schema)
+        assert error is None
+        assert params == {"lifestyle": "frugal", "limit": 5, "field": None}
@@ -12,12 +12,23 @@ Usage:
         return error
     lifestyle = params["lifestyle"]
     family_year = params["family_year"]
+
+    # Endpoints with many params keep their validator list at module level,
+    # so a request is one pass over it:
+    _PARAMS = [LIFESTYLE, optional_param("limit", int)]
 """
 
 from dataclasses import dataclass
-from typing import Optional, Union, Set, Tuple, Any
+from functools import lru_cache
+from typing import Optional, Union, Set, FrozenSet, Tuple, Any
 from flask import jsonify
 
+# Accepted spellings for bool parameters
+_BOOL_TOKENS = {
+    "true": True, "1": True, "yes": True, "on": True,
+    "false": False, "0": False, "no": False, "off": False,
+}
+
 
 @dataclass
 class ParamValidator:
@@ -26,7 +37,7 @@ class ParamValidator:
 
     Attributes:
         name: Parameter name in request.args
-        param_type: Expected type (str, int, float)
+        param_type: Expected type (str, int, float, bool)
         default: Default value if not provided (None means required)
         valid_values: Set of valid string values (for str type only)
         min_val: Minimum value (for int/float)
@@ -36,11 +47,16 @@ class ParamValidator:
     name: str
     param_type: type
     default: Any = None
-    valid_values: Optional[Set[str]] = None
+    valid_values: Optional[Union[Set[str], FrozenSet[str]]] = None
     min_val: Optional[Union[int, float]] = None
     max_val: Optional[Union[int, float]] = None
     error_msg: Optional[str] = None
 
+    def __post_init__(self):
+        # Validators are module-level singletons; freeze the choices once
+        if self.valid_values is not None:
+            self.valid_values = frozenset(self.valid_values)
+
     def validate(self, args: dict) -> Tuple[Optional[Any], Optional[Tuple]]:
         """
         Validate a parameter from request args.
@@ -69,9 +85,11 @@ class ParamValidator:
                 value = int(raw)
             elif self.param_type == float:
                 value = float(raw)
+            elif self.param_type == bool:
+                value = _BOOL_TOKENS[raw.lower()]
             else:
                 value = raw
-        except (ValueError, TypeError):
+        except (ValueError, TypeError, KeyError):
             msg = self.error_msg or f"'{self.name}' must be a valid {self.param_type.__name__}"
             return None, (jsonify({"error": msg}), 400)
 
@@ -138,6 +156,15 @@ AID_SCENARIO = ParamValidator(
     error_msg="aid_scenario must be 'no_aid', 'expected', or 'best_case'",
 )
 
+# Same choices, but affordability defaults to the expected-aid scenario
+AID_SCENARIO_EXPECTED = ParamValidator(
+    name="aid_scenario",
+    param_type=str,
+    default="expected",
+    valid_values={"no_aid", "expected", "best_case"},
+    error_msg="aid_scenario must be 'no_aid', 'expected', or 'best_case'",
+)
+
 # Factory function for family_year with configurable max
 def family_year_validator(max_year: int = 13) -> ParamValidator:
     """Create a family_year validator with configurable max year."""
@@ -163,12 +190,18 @@ NODE_TYPE = ParamValidator(
     error_msg="node_type must be 'career', 'trading', 'startup', or 'freelance'",
 )
 
-# Compact mode flag
-COMPACT = ParamValidator(
-    name="compact",
-    param_type=str,
-    default="false",
-    valid_values={"true", "false"},
+# Boolean flags
+COMPACT = ParamValidator(name="compact", param_type=bool, default=False)
+LEAF_ONLY = ParamValidator(name="leaf_only", param_type=bool, default=True)
+SUMMARY_ONLY = ParamValidator(name="summary_only", param_type=bool, default=False)
+# Tri-state: absent means "don't filter"
+HAS_ENTREPRENEUR_VISA = ParamValidator(name="has_entrepreneur_visa", param_type=bool)
+
+# Ecosystem filter
+MIN_STARTUP_STRENGTH = ParamValidator(
+    name="min_startup_strength",
+    param_type=float,
+    error_msg="min_startup_strength must be a number",
 )
 
 # Sort options
@@ -186,18 +219,50 @@ CAREER_SORT = ParamValidator(
     valid_values={"net_benefit", "y1", "y10", "networth"},
 )
 
+# Result cap for /api/search; the sort walks an index and stops here
+SEARCH_LIMIT = ParamValidator(
+    name="limit",
+    param_type=int,
+    default=50,
+    min_val=1,
+    error_msg="limit must be a positive integer",
+)
+
+# Optional result cap for the net worth listings (default: all results)
+RESULT_LIMIT = ParamValidator(
+    name="limit",
+    param_type=int,
+    min_val=0,
+    error_msg="limit must be a non-negative integer",
+)
+
+# Pakistan return employer tier
+EMPLOYER_TIER = ParamValidator(
+    name="employer_tier",
+    param_type=str,
+    default="tier2_tech_company",
+    valid_values={
+        "tier1_multinational", "tier2_tech_company", "tier3_startup_scale",
+        "tier4_local_sme", "consulting_finance", "remote_foreign"
+    },
+)
+
 
 # ═══════════════════════════════════════════════════════════════════════════════
 # HELPER FUNCTIONS FOR OPTIONAL PARAMS
 # ═══════════════════════════════════════════════════════════════════════════════
 
+@lru_cache(maxsize=None)
+def optional_param(name: str, param_type: type) -> ParamValidator:
+    """Shared validator for an optional parameter with no default or constraints."""
+    return ParamValidator(name=name, param_type=param_type, default=None)
+
+
 def validate_optional_int(args: dict, name: str) -> Tuple[Optional[int], Optional[Tuple]]:
     """Validate an optional integer parameter."""
-    validator = ParamValidator(name=name, param_type=int, default=None)
-    return validator.validate(args)
+    return optional_param(name, int).validate(args)
 
 
 def validate_optional_float(args: dict, name: str) -> Tuple[Optional[float], Optional[Tuple]]:
     """Validate an optional float parameter."""
-    validator = ParamValidator(name=name, param_type=float, default=None)
-    return validator.validate(args)
+    return optional_param(name, float).validate(args)